@@ -12,7 +12,6 @@ import os
 import sys
 import time
 from pathlib import Path
-import glob
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -33,17 +32,20 @@ def find_latest_stitched_image():
     Returns:
         Path to the most recent stitched image or None if none found
     """
-    # Get all PNG files in the stitched directory
-    all_stitched = sorted(glob.glob(str(STITCHED_DIR / "profile_stitched_*.png")), 
-                         key=os.path.getmtime, 
-                         reverse=True)
+    # Single directory pass; DirEntry.stat() reuses the data scandir already fetched
+    all_stitched = []
+    if STITCHED_DIR.is_dir():
+        with os.scandir(STITCHED_DIR) as it:
+            all_stitched = [(entry.stat().st_mtime, entry.path) for entry in it
+                            if entry.name.startswith("profile_stitched_") and entry.name.endswith(".png")]
     
     if not all_stitched:
         print("No stitched images found in", STITCHED_DIR)
         return None
     
-    print(f"Found stitched image: {os.path.basename(all_stitched[0])}")
-    return all_stitched[0]
+    _, latest_path = max(all_stitched)
+    print(f"Found stitched image: {os.path.basename(latest_path)}")
+    return latest_path
 
 def main():
     print("Testing GPT-4o integration with stitched screenshots...")
@@ -15,20 +15,32 @@ import pyautogui
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# Set debug mode and environment
-os.environ["DEBUG_SCROLL"] = "True"
+# Set debug mode (unless overridden, e.g. DEBUG_SCROLL=False for a fast run) and environment
+os.environ.setdefault("DEBUG_SCROLL", "True")
 os.environ["ENVIRONMENT"] = "MONITOR"  # Set to use hardcoded MONITOR values
 
 from src.tinder_bot.window import find_iphone_window
 from src.tinder_bot.scroll import scroll_profile, get_hardcoded_window
 
+# Query the display once; pyautogui.size() round-trips to the window server
+SCREEN_SIZE = pyautogui.size()
+
+# Animated cursor moves and pauses only help a human watching; skip them otherwise
+VISUALIZE = os.getenv("DEBUG_SCROLL") == "True"
+MOVE_DURATION = 0.5 if VISUALIZE else 0
+
+# Every delay this script needs is an explicit sleep; drop pyautogui's implicit
+# 0.1 s pause after each call and its minimum animated-move duration
+pyautogui.PAUSE = 0
+pyautogui.MINIMUM_DURATION = 0
+
 def main():
     print("Starting iPhone window detection and scrolling test with hardcoded values...")
     print("This script demonstrates the full scrolling pattern for a Tinder profile.")
     
     # Print environment info
     print(f"Environment: {os.getenv('ENVIRONMENT', 'MONITOR')}")
-    screen_width, screen_height = pyautogui.size()
+    screen_width, screen_height = SCREEN_SIZE
     print(f"Actual screen resolution: {screen_width}x{screen_height}")
     
     # Get hardcoded window dimensions
@@ -46,7 +58,7 @@ def main():
         input("Press Enter to move cursor to the iPhone center...")
         
         # Move cursor to iPhone center
-        pyautogui.moveTo(center_x, center_y, duration=0.5)
+        pyautogui.moveTo(center_x, center_y, duration=MOVE_DURATION)
         pyautogui.click()
         
         # Show all four corners of the iPhone for better visualization
@@ -60,11 +72,12 @@ def main():
         print("\nShowing iPhone boundaries...")
         for corner_x, corner_y, corner_name in corners:
             print(f"Moving to {corner_name} corner: ({corner_x}, {corner_y})")
-            pyautogui.moveTo(corner_x, corner_y, duration=0.5)
-            time.sleep(0.3)
+            pyautogui.moveTo(corner_x, corner_y, duration=MOVE_DURATION)
+            if VISUALIZE:
+                time.sleep(0.3)
         
         # Return to center
-        pyautogui.moveTo(center_x, center_y, duration=0.5)
+        pyautogui.moveTo(center_x, center_y, duration=MOVE_DURATION)
         
         input("\nPress Enter to begin full profile scrolling test...")
         
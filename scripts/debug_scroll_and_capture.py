@@ -10,14 +10,14 @@ This script will:
 """
 
 import os
+import re
 import sys
 import time
 import pyautogui
 from pathlib import Path
 from PIL import Image
-import numpy as np
-import glob
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -28,20 +28,30 @@ parser.add_argument('--env', choices=['MONITOR', 'MAC'], default='MONITOR',
                     help='Specify environment (MONITOR or MAC)')
 args = parser.parse_args()
 
-# Set debug mode and environment
-os.environ["DEBUG_SCROLL"] = "True"
+# Set debug mode (unless overridden, e.g. DEBUG_SCROLL=False for a fast run) and environment
+os.environ.setdefault("DEBUG_SCROLL", "True")
 os.environ["ENVIRONMENT"] = args.env
 print(f"Using environment: {args.env}")
 
-from src.tinder_bot.window import find_iphone_window
-from src.tinder_bot.scroll import scroll_profile, get_hardcoded_window, perform_stepped_scroll
-from src.tinder_bot.image_utils import stitch_images
-from src.tinder_bot.capture import take_region_screenshot, save_screenshot
+from src.tinder_bot.scroll import get_hardcoded_window, perform_stepped_scroll, wait_until_stable, scroll_back_to_top
+from src.tinder_bot.capture import grab_region
 
 # Create screenshots directory if it doesn't exist
 SCREENSHOTS_DIR = Path("./screenshots")
 SCREENSHOTS_DIR.mkdir(exist_ok=True)
 
+# Query the display once; pyautogui.size() round-trips to the window server
+SCREEN_SIZE = pyautogui.size()
+
+# Animated cursor moves and pauses only help a human watching; skip them otherwise
+VISUALIZE = os.getenv("DEBUG_SCROLL") == "True"
+MOVE_DURATION = 0.5 if VISUALIZE else 0
+
+# Every delay this script needs is an explicit sleep; drop pyautogui's implicit
+# 0.1 s pause after each call and its minimum animated-move duration
+pyautogui.PAUSE = 0
+pyautogui.MINIMUM_DURATION = 0
+
 # Create stitched directory if it doesn't exist
 STITCHED_DIR = SCREENSHOTS_DIR / "stitched"
 STITCHED_DIR.mkdir(exist_ok=True)
@@ -50,40 +60,31 @@ STITCHED_DIR.mkdir(exist_ok=True)
 SCREENSHOT_FORMAT = "png"  # Use lossless PNG format
 SCREENSHOT_DPI = 600  # High DPI for better quality
 
-def take_high_quality_screenshot(bbox, index):
+# Matches screenshot filenames and captures their position (1-6)
+_NAME_RE = re.compile(r'^profile_screenshot_([1-6])_.*\.png$')
+
+def save_screenshot(frame, index):
     """
-    Take a high-quality screenshot of the iPhone window area.
+    Encode and save a captured frame as a high-quality screenshot.
     
     Args:
-        bbox: (x, y, width, height) of the iPhone window
+        frame: RGB pixel array from grab_region
         index: Screenshot index number for filename (1-6)
     
     Returns:
         Path to the saved screenshot
     """
-    x, y, width, height = bbox
-    
     # Create the filename
     timestamp = time.strftime("%Y%m%d_%H%M%S")
     filename = SCREENSHOTS_DIR / f"profile_screenshot_{index}_{timestamp}.{SCREENSHOT_FORMAT}"
     
-    print(f"Taking high-quality screenshot #{index}/6...")
-    
-    # Use PyAutoGUI for initial capture
-    screenshot = pyautogui.screenshot(region=(x, y, width, height))
-    
-    # Convert to numpy array for processing
-    img_array = np.array(screenshot)
+    screenshot = Image.fromarray(frame)
     
-    # Convert back to PIL Image with higher quality settings
-    high_quality_img = Image.fromarray(img_array)
-    
-    # Save with high DPI and quality settings
-    high_quality_img.save(
+    # Save with high DPI settings
+    screenshot.save(
         filename, 
         format=SCREENSHOT_FORMAT,
-        dpi=(SCREENSHOT_DPI, SCREENSHOT_DPI),
-        quality=100  # Maximum quality (only applies to JPEG)
+        dpi=(SCREENSHOT_DPI, SCREENSHOT_DPI)
     )
     
     print(f"High-quality screenshot saved to: {filename}")
@@ -100,12 +101,10 @@ def scroll_and_capture(bbox):
         List of paths to the 6 screenshots taken
     """
     from src.tinder_bot.scroll import (
-        FIRST_SCROLL_AMOUNT, SUBSEQUENT_SCROLL_AMOUNT, SCROLL_DELAY, 
-        NUM_SCROLLS, UP_SCROLL_AMOUNT, STEPS_PER_SCROLL, STEP_DELAY
+        FIRST_SCROLL_AMOUNT, SUBSEQUENT_SCROLL_AMOUNT, SETTLE_TIMEOUT, 
+        NUM_SCROLLS, STEPS_PER_SCROLL
     )
     
-    screenshot_paths = []
-    
     # Move to center and get coordinates
     x, y, width, height = bbox
     center_x = x + width // 2
@@ -116,7 +115,7 @@ def scroll_and_capture(bbox):
     print(f"Window dimensions: {width}x{height} pixels")
     
     # Move to center and click to ensure focus
-    pyautogui.moveTo(center_x, center_y, duration=0.5)
+    pyautogui.moveTo(center_x, center_y, duration=MOVE_DURATION)
     pyautogui.click()
     time.sleep(1.0)
     
@@ -124,50 +123,50 @@ def scroll_and_capture(bbox):
     print(f"First scroll: {FIRST_SCROLL_AMOUNT} pixels in {STEPS_PER_SCROLL} steps")
     print(f"Subsequent scrolls: {SUBSEQUENT_SCROLL_AMOUNT} pixels in {STEPS_PER_SCROLL} steps")
     print(f"Total screenshots: 6 (initial + 5 scrolls)")
-    print(f"Delay between scrolls: {SCROLL_DELAY} seconds")
+    print(f"Delay between scrolls: adaptive (up to {SETTLE_TIMEOUT} seconds)")
     print(f"Screenshot format: {SCREENSHOT_FORMAT.upper()} with {SCREENSHOT_DPI} DPI")
     
-    # Take initial high-quality screenshot (before any scrolling)
-    screenshot_path = take_high_quality_screenshot(bbox, 1)
-    screenshot_paths.append(screenshot_path)
-    
-    # Perform scrolls and take screenshots
-    for i in range(5):  # Total of 5 scrolls
-        # Determine the scroll amount (first scroll is different)
-        scroll_amount = FIRST_SCROLL_AMOUNT if i == 0 else SUBSEQUENT_SCROLL_AMOUNT
-        screenshot_number = i + 2  # Screenshots 2-6
+    # Only the grab has to happen before the next scroll; PNG encoding and the
+    # disk write run on worker threads while the following scroll proceeds
+    futures = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # Take initial high-quality screenshot (before any scrolling)
+        print("Taking high-quality screenshot #1/6...")
+        futures.append(executor.submit(save_screenshot, grab_region(bbox), 1))
         
-        print(f"\nPerforming scroll {i+1}/5 ({scroll_amount} pixels)...")
-        
-        # Click before each scroll to ensure window focus is maintained
-        pyautogui.click(center_x, center_y)
-        time.sleep(0.1)
-        
-        # Use stepped scrolling
-        perform_stepped_scroll(scroll_amount)
-        
-        # Wait for content to load
-        time.sleep(SCROLL_DELAY)
+        # Perform scrolls and take screenshots
+        for i in range(5):  # Total of 5 scrolls
+            # Determine the scroll amount (first scroll is different)
+            scroll_amount = FIRST_SCROLL_AMOUNT if i == 0 else SUBSEQUENT_SCROLL_AMOUNT
+            screenshot_number = i + 2  # Screenshots 2-6
+            
+            print(f"\nPerforming scroll {i+1}/5 ({scroll_amount} pixels)...")
+            
+            # Click before each scroll to ensure window focus is maintained
+            pyautogui.click(center_x, center_y)
+            time.sleep(0.1)
+            
+            # Use stepped scrolling
+            perform_stepped_scroll(scroll_amount)
+            
+            # Wait for content to settle instead of a fixed delay
+            wait_until_stable(bbox)
+            
+            # Grab now, save in the background
+            print(f"Taking high-quality screenshot #{screenshot_number}/6...")
+            futures.append(executor.submit(save_screenshot, grab_region(bbox), screenshot_number))
         
-        # Take the high-quality screenshot
-        screenshot_path = take_high_quality_screenshot(bbox, screenshot_number)
-        screenshot_paths.append(screenshot_path)
+        screenshot_paths = [future.result() for future in futures]
     
-    print("\nFinished scrolling and capturing, pausing to ensure content is loaded...")
-    time.sleep(2.0)
+    print("\nFinished scrolling and capturing, waiting for content to settle...")
+    wait_until_stable(bbox)
     
     # Scroll back to top for next profile
     print("\nScrolling back to top of profile...")
     # Calculate how many up-scrolls needed based on total distance scrolled
     total_scroll_distance = abs(FIRST_SCROLL_AMOUNT) + abs(SUBSEQUENT_SCROLL_AMOUNT) * (NUM_SCROLLS - 1)
-    scrolls_needed = total_scroll_distance // abs(UP_SCROLL_AMOUNT) + 1
-    
-    for i in range(scrolls_needed):
-        pyautogui.click(center_x, center_y)
-        time.sleep(0.1)
-        print(f"Scroll up {i+1}/{scrolls_needed}: {UP_SCROLL_AMOUNT} pixels in {STEPS_PER_SCROLL} steps")
-        perform_stepped_scroll(UP_SCROLL_AMOUNT)
-        time.sleep(0.5)
+    print(f"Scrolling up {total_scroll_distance} pixels in one stepped scroll")
+    scroll_back_to_top(center_x, center_y, total_scroll_distance)
     
     print("\nProfile scrolling and high-quality screenshot capture complete!")
     print(f"All screenshots saved to: {SCREENSHOTS_DIR}")
@@ -181,38 +180,24 @@ def find_latest_screenshots():
     Returns:
         List of paths to the 6 screenshots in order
     """
-    # Get all PNG files in the screenshots directory
-    all_screenshots = sorted(glob.glob(str(SCREENSHOTS_DIR / "profile_screenshot_*.png")), 
-                            key=os.path.getmtime, 
-                            reverse=True)
-    
-    # Organize by screenshot number (1-6)
-    organized_screenshots = {}
-    for path in all_screenshots:
-        filename = os.path.basename(path)
-        parts = filename.split('_')
-        if len(parts) >= 2 and parts[1].isdigit():
-            num = int(parts[1])
-            if 1 <= num <= 6:
-                # Get or create list for this number
-                if num not in organized_screenshots:
-                    organized_screenshots[num] = []
-                organized_screenshots[num].append(path)
-    
-    # Get the most recent screenshot for each position
-    result = []
-    for num in range(1, 7):
-        if num in organized_screenshots and organized_screenshots[num]:
-            result.append(organized_screenshots[num][0])
+    # Keep the newest screenshot for each position (1-6) in a single directory pass
+    latest = {}
+    with os.scandir(SCREENSHOTS_DIR) as it:
+        for entry in it:
+            match = _NAME_RE.match(entry.name)
+            if match:
+                num = int(match.group(1))
+                candidate = (entry.stat().st_mtime, entry.path)
+                latest[num] = max(latest.get(num, candidate), candidate)
     
-    return sorted(result, key=lambda x: int(os.path.basename(x).split('_')[1]))
+    return [latest[num][1] for num in sorted(latest)]
 
 def main():
     print(f"Starting iPhone window detection, scrolling, screenshot capture, and stitching test in {args.env} environment...")
     
     # Print environment info
     print(f"Environment: {os.getenv('ENVIRONMENT')}")
-    screen_width, screen_height = pyautogui.size()
+    screen_width, screen_height = SCREEN_SIZE
     print(f"Actual screen resolution: {screen_width}x{screen_height}")
     
     # Get hardcoded window dimensions
@@ -229,8 +214,9 @@ def main():
         print(f"iPhone center: ({center_x}, {center_y})")
         
         input("\nPress Enter to move cursor to the iPhone center for verification...")
-        pyautogui.moveTo(center_x, center_y, duration=1.0)
-        time.sleep(1.0)
+        pyautogui.moveTo(center_x, center_y, duration=1.0 if VISUALIZE else 0)
+        if VISUALIZE:
+            time.sleep(1.0)
         
         input("\nPress Enter to begin scrolling and capturing high-quality screenshots...")
         
@@ -1,15 +1,106 @@
 """Pytest fixtures for Tinder Bot tests."""
 
 import pytest
+from unittest.mock import MagicMock
+import numpy as np
 from PIL import Image
 import io
 import os
 from typing import Tuple
 
 
+def pytest_configure(config):
+    """
+    Strip pyautogui's built-in delays for the whole session.
+    
+    If a real pyautogui call ever slips past the mocks, it should not add
+    the 0.1 s post-call pause or the minimum move duration, and it should
+    not trip the corner fail-safe. Without a display (no DISPLAY on Linux)
+    pyautogui cannot be imported, so there is nothing to configure.
+    """
+    try:
+        import pyautogui
+    except (ImportError, KeyError):
+        return
+    pyautogui.PAUSE = 0
+    pyautogui.MINIMUM_DURATION = 0
+    pyautogui.MINIMUM_SLEEP = 0
+    pyautogui.FAILSAFE = False
+
+
+def pytest_xdist_auto_num_workers(config):
+    """Use all but two cores for `-n auto`, leaving headroom for the rest of the machine."""
+    return max(1, (os.cpu_count() or 1) - 2)
+
+
+@pytest.fixture(autouse=True)
+def _no_io(monkeypatch):
+    """
+    Never sleep or drive the real mouse during tests.
+    
+    Tests that assert on these calls still patch them locally, which takes
+    precedence over the no-op defaults installed here. Without a display
+    pyautogui cannot be imported, and only the sleep is stubbed.
+    """
+    monkeypatch.setattr('time.sleep', lambda *_: None)
+    try:
+        import pyautogui
+    except (ImportError, KeyError):
+        return
+    monkeypatch.setattr(pyautogui, 'moveTo', MagicMock())
+    monkeypatch.setattr(pyautogui, 'click', MagicMock())
+    monkeypatch.setattr(pyautogui, 'scroll', MagicMock())
+
+
 @pytest.fixture
+def set_environment(monkeypatch):
+    """
+    Return a setter that switches the bot's ENVIRONMENT for one test.
+    
+    The scroll module reads ENVIRONMENT once at import, so the setter updates
+    both the environment variable and the module constant, and drops the
+    cached hardcoded window. Patching the test's own state this way is safe
+    to run alongside other tests, unlike patching os.getenv globally.
+    """
+    from tinder_bot import scroll
+    
+    def _set(env: str) -> None:
+        monkeypatch.setenv('ENVIRONMENT', env)
+        monkeypatch.setattr(scroll, 'ENVIRONMENT', env)
+        scroll.get_hardcoded_window.cache_clear()
+    
+    yield _set
+    scroll.get_hardcoded_window.cache_clear()
+
+
+@pytest.fixture
+def small_num_scrolls(monkeypatch) -> int:
+    """
+    Cut scroll_profile down to two scrolls.
+    
+    For tests that check scrolling behaviour rather than the exact NUM_SCROLLS
+    count, so each run records a fraction of the mocked scroll calls.
+    """
+    monkeypatch.setattr('tinder_bot.scroll.NUM_SCROLLS', 2)
+    return 2
+
+
+def _read_only_zeros(shape: Tuple[int, ...]) -> np.ndarray:
+    """Allocate a zeroed uint8 array that tests can share but not modify."""
+    array = np.zeros(shape, dtype=np.uint8)
+    array.setflags(write=False)
+    return array
+
+
+@pytest.fixture(scope='session')
+def zero_gray() -> np.ndarray:
+    """Return a blank 1920x1080 single-channel frame (grayscale or threshold), allocated once per session."""
+    return _read_only_zeros((1080, 1920))
+
+
+@pytest.fixture(scope='session')
 def mock_window_bbox() -> Tuple[int, int, int, int]:
-    """Return a mock window bounding box."""
+    """Return a mock window bounding box (an immutable tuple, so shared across the session)."""
     return (100, 100, 400, 800)
 
 
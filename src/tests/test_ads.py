@@ -0,0 +1,71 @@
+"""Tests for the ad check module."""
+
+import pytest
+from PIL import Image
+
+import tinder_bot.ads
+from tinder_bot.ads import check_for_ads, _phash
+
+
+@pytest.fixture
+def ad_hash_cache(tmp_path, monkeypatch):
+    """Point the known-ad cache at an empty file under tmp_path."""
+    cache_path = tmp_path / "ad_hashes.json"
+    monkeypatch.setattr(tinder_bot.ads, "AD_HASH_CACHE_PATH", cache_path)
+    monkeypatch.setattr(tinder_bot.ads, "_ad_hash_cache", None)
+    return cache_path
+
+
+def _card(color):
+    """A fake window frame: a coloured block on a white card."""
+    frame = Image.new('RGB', (400, 800), color='white')
+    frame.paste(Image.new('RGB', (200, 300), color=color), (100, 100))
+    return frame
+
+
+def test_phash_is_stable_and_distinguishes_frames():
+    """Test that the perceptual hash matches re-encoded copies but not different frames."""
+    frame = _card('black')
+    assert _phash(frame) == _phash(frame.copy().resize((380, 760)))
+    assert (_phash(frame) ^ _phash(_card('black').rotate(90, expand=True))).bit_count() > 2
+
+
+def test_check_for_ads_reuses_cached_ad(mocker, ad_hash_cache):
+    """Test that a repeated ad frame is answered from the hash cache without calling GPT."""
+    mocker.patch('tinder_bot.ads.get_hardcoded_window', return_value=(0, 0, 400, 800))
+    mocker.patch('tinder_bot.ads.capture_frame', return_value=_card('black'))
+    mock_gpt = mocker.patch('tinder_bot.ads.gpt_check_ads', return_value="YES")
+
+    assert check_for_ads(1, False) == "YES"
+    assert check_for_ads(2, False) == "YES"
+    assert mock_gpt.call_count == 1
+    assert ad_hash_cache.exists()
+
+    # A fresh process reads the known ad back from disk
+    tinder_bot.ads._ad_hash_cache = None
+    assert check_for_ads(3, False) == "YES"
+    assert mock_gpt.call_count == 1
+
+
+def test_check_for_ads_does_not_cache_errors(mocker, ad_hash_cache):
+    """Test that failed GPT checks are retried rather than cached."""
+    mocker.patch('tinder_bot.ads.get_hardcoded_window', return_value=(0, 0, 400, 800))
+    mocker.patch('tinder_bot.ads.capture_frame', return_value=_card('black'))
+    mock_gpt = mocker.patch('tinder_bot.ads.gpt_check_ads', side_effect=["ERROR", "NO"])
+
+    assert check_for_ads(1, False) == "ERROR"
+    assert check_for_ads(2, False) == "NO"
+    assert mock_gpt.call_count == 2
+
+
+def test_check_for_ads_does_not_cache_non_ads(mocker, ad_hash_cache):
+    """Test that "NO" verdicts are not cached, so look-alike profiles are still checked."""
+    mocker.patch('tinder_bot.ads.get_hardcoded_window', return_value=(0, 0, 400, 800))
+    mocker.patch('tinder_bot.ads.capture_frame', return_value=_card('black'))
+    mock_gpt = mocker.patch('tinder_bot.ads.gpt_check_ads', side_effect=["NO", "YES"])
+
+    assert check_for_ads(1, False) == "NO"
+    assert check_for_ads(2, False) == "YES"
+    assert mock_gpt.call_count == 2
+    # Only the ad verdict was stored
+    assert len(tinder_bot.ads._ad_hash_cache) == 1
@@ -4,7 +4,7 @@ import pytest
 from PIL import Image
 import math
 import os
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 from tinder_bot.capture import (
     crop_phone_screen, 
     split_profile_blocks, 
@@ -43,39 +43,39 @@ def test_split_profile_blocks(mock_phone_screenshot):
         assert isinstance(img, Image.Image)
 
 
-def test_save_screenshots(mock_phone_screenshot, tmpdir):
+def test_save_screenshots(mock_phone_screenshot, tmpdir, mocker):
     """Test that save_screenshots correctly saves images to disk."""
     # Setup: Create 6 mock images
     blocks = [mock_phone_screenshot] * 6
     
     # Patch the SCREENSHOT_DIR to use a temp directory
-    with patch('tinder_bot.capture.SCREENSHOT_DIR', str(tmpdir)):
-        # Call the function
-        result_paths = save_screenshots(blocks, prefix="test")
-        
-        # Check that we get 6 file paths
-        assert len(result_paths) == 6
+    mocker.patch('tinder_bot.capture.SCREENSHOT_DIR', str(tmpdir))
+    # Call the function
+    result_paths = save_screenshots(blocks, prefix="test")
+    
+    # Check that we get 6 file paths
+    assert len(result_paths) == 6
+    
+    # Check that the files exist
+    for path in result_paths:
+        assert os.path.exists(path)
         
-        # Check that the files exist
-        for path in result_paths:
-            assert os.path.exists(path)
-            
-            # Check that the file is a valid image
-            img = Image.open(path)
-            assert isinstance(img, Image.Image)
+        # Check that the file is a valid image
+        img = Image.open(path)
+        assert isinstance(img, Image.Image)
 
 
-def test_take_screenshot():
+def test_take_screenshot(mocker):
     """Test that take_screenshot returns a PIL Image."""
     # Mock pyautogui.screenshot to return a mock image
     mock_img = Image.new('RGB', (1920, 1080), color='white')
     
-    with patch('pyautogui.screenshot', return_value=mock_img):
-        # Call the function
-        result = take_screenshot()
-        
-        # Check that the result is a PIL Image
-        assert isinstance(result, Image.Image)
-        
-        # Check that the dimensions match
-        assert result.size == (1920, 1080)
\ No newline at end of file
+    mocker.patch('pyautogui.screenshot', return_value=mock_img)
+    # Call the function
+    result = take_screenshot()
+    
+    # Check that the result is a PIL Image
+    assert isinstance(result, Image.Image)
+    
+    # Check that the dimensions match
+    assert result.size == (1920, 1080)
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""Tests for the command-line interface helpers."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from PIL import Image
+
+from tinder_bot.cli import _pick_opener
+
+
+def test_pick_opener_redo_with_stitched_file(tmp_path, mocker):
+    """Test that every redo still reads the stitched file, which is only moved at the end."""
+    stitched = tmp_path / "stitched.png"
+    Image.new('RGB', (4, 4), color='red').save(stitched)
+    base_dir = tmp_path / "profile_20240101"
+    base_dir.mkdir()
+
+    seen = []
+    def fake_generate_opener(path):
+        seen.append(Path(path).exists())
+        return "Jane Doe", f"Opener {len(seen)}"
+
+    mocker.patch('tinder_bot.gpt.generate_opener', side_effect=fake_generate_opener)
+    mocker.patch('typer.prompt', side_effect=["redo", "redo", ""])
+
+    full_response, opener, picked, image_path, responses_path = _pick_opener(
+        str(stitched), base_dir, MagicMock(), max_redos=5
+    )
+
+    assert seen == [True, True, True]
+    assert (full_response, opener, picked) == ("Opener 3", "Opener 3", "")
+    assert image_path == base_dir / "profile_Jane_Doe.png"
+    assert responses_path == base_dir / "profile_Jane_Doe_responses.txt"
+    assert image_path.exists() and not stitched.exists()
+
+
+def test_pick_opener_saves_in_memory_image(tmp_path, mocker):
+    """Test that an in-memory stitched image is written to the profile path."""
+    mocker.patch('tinder_bot.gpt.generate_opener', return_value=("Jane", "Hi there"))
+    mocker.patch('typer.prompt', return_value="Hello!")
+
+    _, opener, picked, image_path, _ = _pick_opener(
+        Image.new('RGB', (4, 4), color='blue'), tmp_path, MagicMock(), max_redos=5
+    )
+
+    assert (opener, picked) == ("Hi there", "Hello!")
+    assert Image.open(image_path).size == (4, 4)
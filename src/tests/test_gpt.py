@@ -1,18 +1,37 @@
 """Tests for the GPT integration module."""
 
 import pytest
+import asyncio
 import os
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock, AsyncMock
 from PIL import Image
+import base64
 import io
 import tempfile
 
+import tinder_bot.gpt
 from tinder_bot.gpt import (
-    generate_opener, encode_image, optimize_image,
-    FALLBACK_MESSAGE
+    generate_opener, generate_openers_async, generate_openers_batch, encode_image, optimize_image,
+    gpt_check_ads, FALLBACK_MESSAGE, MAX_CONCURRENT_REQUESTS
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_client_cache():
+    """Drop cached OpenAI clients so each test sees its own patched client."""
+    tinder_bot.gpt._client.cache_clear()
+    yield
+    tinder_bot.gpt._client.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_data_url_cache():
+    """Drop memoized data URLs so each test optimizes its own images."""
+    tinder_bot.gpt._cached_data_url.cache_clear()
+    yield
+    tinder_bot.gpt._cached_data_url.cache_clear()
+
+
 @pytest.fixture
 def mock_image_file():
     """Create a temporary image file for testing."""
@@ -29,13 +48,10 @@ def mock_image_file():
 def mock_large_image_file():
     """Create a temporary large image file for testing."""
     with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp:
-        # Create a larger test image
-        img = Image.new('RGB', (1000, 1000), color='white')
+        # Create an image larger than the optimization cap
+        img = Image.new('RGB', (1500, 3000), color='white')
         img.save(temp.name, format='PNG')
-        
-        # Mock the file size to make it appear larger
-        with patch('os.path.getsize', return_value=6 * 1024 * 1024):  # 6MB
-            yield temp.name
+        yield temp.name
     # Clean up
     os.unlink(temp.name)
 
@@ -58,81 +74,377 @@ def test_encode_image(mock_image_file):
         pytest.fail("Generated string is not valid base64")
 
 
+def test_encode_image_in_memory():
+    """Test that PIL images and arrays are JPEG-encoded without a file."""
+    import base64
+    import numpy as np
+    
+    for image in (Image.new('RGB', (50, 50), color='red'), np.zeros((50, 50, 3), dtype=np.uint8)):
+        decoded = base64.b64decode(encode_image(image))
+        assert Image.open(io.BytesIO(decoded)).format == 'JPEG'
+
+
 def test_optimize_image(mock_large_image_file):
-    """Test that optimize_image reduces the size of large images."""
+    """Test that optimize_image downscales large images to in-memory JPEG bytes."""
     # Optimize the test image
-    optimized_path = optimize_image(mock_large_image_file, max_size_mb=3.0)
+    optimized = optimize_image(mock_large_image_file, max_size=(512, 1024))
     
-    # Check that a new file was created
-    assert optimized_path != mock_large_image_file
-    assert os.path.exists(optimized_path)
+    # Check that JPEG bytes smaller than the source file were returned
+    assert isinstance(optimized, bytes)
+    assert len(optimized) < os.path.getsize(mock_large_image_file)
     
-    # Clean up
-    os.unlink(optimized_path)
+    # Check that the dimensions fit within the cap
+    img = Image.open(io.BytesIO(optimized))
+    assert img.format == 'JPEG'
+    assert img.width <= 512
+    assert img.height <= 1024
+
+
+def test_optimize_image_photographic_payload_under_3mb(tmp_path):
+    """Test that a full-size photographic screenshot is re-encoded to a small JPEG."""
+    import numpy as np
+    
+    # Noisy gradients approximate photo content, which PNG compresses poorly
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 255, 2000, dtype=np.float32)[:, None, None]
+    noise = rng.normal(0, 20, size=(2000, 1200, 3))
+    pixels = np.clip(gradient + noise, 0, 255).astype(np.uint8)
+    path = tmp_path / "photo.png"
+    Image.fromarray(pixels).save(path, format='PNG')
+    
+    optimized = optimize_image(str(path))
+    
+    assert len(optimized) <= 3 * 1024 * 1024
+    assert len(optimized) < os.path.getsize(path)
+    assert Image.open(io.BytesIO(optimized)).format == 'JPEG'
+
+
+def test_optimize_image_large_jpeg_source(tmp_path):
+    """Test that large JPEG sources are reduced to fit within max_size."""
+    path = tmp_path / "large.jpg"
+    Image.new('RGB', (4000, 8000), color='blue').save(path, format='JPEG')
+    
+    optimized = optimize_image(str(path), max_size=(512, 1024))
+    
+    img = Image.open(io.BytesIO(optimized))
+    assert img.format == 'JPEG'
+    assert img.size == (512, 1024)
+
+
+def test_optimize_image_keeps_png_for_alpha(tmp_path):
+    """Test that images with an alpha channel stay PNG."""
+    path = tmp_path / "alpha.png"
+    Image.new('RGBA', (100, 100), color=(255, 0, 0, 128)).save(path, format='PNG')
+    
+    optimized = optimize_image(str(path))
+    
+    img = Image.open(io.BytesIO(optimized))
+    assert img.format == 'PNG'
+    assert img.mode == 'RGBA'
 
 
-def test_generate_opener_with_api_key():
+def test_image_data_url_uses_cache(mock_image_file, mocker):
+    """Test that repeat requests for the same image skip decoding."""
+    mock_open = mocker.patch('tinder_bot.image_utils.Image.open', wraps=Image.open)
+    first = tinder_bot.gpt._image_data_url(mock_image_file)
+    second = tinder_bot.gpt._image_data_url(mock_image_file)
+    
+    # Second call is served from memory
+    assert first == second
+    mock_open.assert_called_once()
+    
+    # Rewriting the file invalidates its entry
+    Image.new('RGB', (50, 50), color='black').save(mock_image_file, format='PNG')
+    assert tinder_bot.gpt._image_data_url(mock_image_file) != first
+    assert mock_open.call_count == 2
+
+
+def test_generate_opener_with_api_key(mocker):
     """Test that generate_opener calls the OpenAI API with correct parameters."""
     # Mock environment and OpenAI client
-    with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}), \
-         patch('openai.OpenAI') as mock_openai:
-        
-        # Setup mock response
-        mock_client = MagicMock()
-        mock_openai.return_value = mock_client
-        
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "This is a test opener"
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        # Mock image processing
-        with patch('tinder_bot.gpt.encode_image', return_value="test-base64"), \
-             patch('tinder_bot.gpt.optimize_image', side_effect=lambda x: x):
-            
-            # Call the function with mock image paths
-            result = generate_opener(["test1.png", "test2.png"])
-            
-            # Check that the result matches the mock response
-            assert result == "This is a test opener"
-            
-            # Verify that the OpenAI client was created with the API key
-            mock_openai.assert_called_once_with(api_key="test-key")
-            
-            # Verify that the chat completion was called with the right parameters
-            mock_client.chat.completions.create.assert_called_once()
-            call_args = mock_client.chat.completions.create.call_args[1]
-            assert "model" in call_args
-            assert "messages" in call_args
-            assert "max_tokens" in call_args
-            assert "temperature" in call_args
-
-
-def test_generate_opener_without_api_key():
+    mocker.patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    mock_openai = mocker.patch('openai.OpenAI')
+    
+    # Setup mock response
+    mock_client = MagicMock()
+    mock_openai.return_value = mock_client
+    
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = "This is a test opener"
+    mock_client.chat.completions.create.return_value = mock_response
+    
+    # Mock image processing
+    mocker.patch('tinder_bot.gpt.encode_image', return_value="test-base64")
+    mocker.patch('tinder_bot.gpt.optimize_image', return_value=b"jpeg-bytes")
+    mock_load = mocker.patch(
+        'tinder_bot.gpt.load_screenshots',
+        return_value=[Image.new('RGB', (40, 80), color=c) for c in ('red', 'green')]
+    )
+    
+    # Call the function with mock image paths
+    result = generate_opener(["test1.png", "test2.png"])
+    
+    # Check that the result matches the mock response
+    assert result == ("unknown", "This is a test opener")
+    
+    # Verify that the panels were loaded for in-memory stitching
+    mock_load.assert_called_once_with(["test1.png", "test2.png"])
+    
+    # Verify that the OpenAI client was created with the API key
+    mock_openai.assert_called_once_with(api_key="test-key")
+    
+    # A second call reuses the cached client
+    generate_opener(["test1.png", "test2.png"])
+    mock_openai.assert_called_once_with(api_key="test-key")
+    
+    # Verify that the chat completion was called with the right parameters
+    assert mock_client.chat.completions.create.call_count == 2
+    call_args = mock_client.chat.completions.create.call_args[1]
+    assert "model" in call_args
+    assert "messages" in call_args
+    assert "max_tokens" in call_args
+    assert "temperature" in call_args
+    
+    # Only one image part is sent for the whole profile
+    user_content = call_args["messages"][-1]["content"]
+    image_parts = [part for part in user_content if part["type"] == "image_url"]
+    assert len(image_parts) == 1
+
+
+def test_generate_opener_with_in_memory_images(mocker):
+    """Test that in-memory screenshots are stitched and encoded without touching disk."""
+    frames = [Image.new('RGB', (40, 80), color=c) for c in ('red', 'green', 'blue', 'white')]
+    
+    mocker.patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    mock_openai = mocker.patch('openai.OpenAI')
+    
+    mock_client = MagicMock()
+    mock_openai.return_value = mock_client
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = "Name: Test\nThis is a test opener"
+    mock_client.chat.completions.create.return_value = mock_response
+    
+    mock_load = mocker.patch('tinder_bot.gpt.load_screenshots')
+    result = generate_opener(frames)
+    
+    # Nothing is read from disk, and the composite is sent as one JPEG image
+    mock_load.assert_not_called()
+    assert result == ("Test", "Name: Test\nThis is a test opener")
+    user_content = mock_client.chat.completions.create.call_args[1]["messages"][-1]["content"]
+    assert len(user_content) == 1
+    assert user_content[0]["image_url"]["url"].startswith("data:image/jpeg;base64,")
+
+
+def test_gpt_check_ads_with_in_memory_frame(mocker):
+    """Test that the ad check sends a captured frame as an in-memory JPEG."""
+    frame = Image.new('RGB', (40, 80), color='red')
+    
+    mocker.patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    mock_openai = mocker.patch('openai.OpenAI')
+    
+    mock_client = MagicMock()
+    mock_openai.return_value = mock_client
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = " yes "
+    mock_client.chat.completions.create.return_value = mock_response
+    
+    assert gpt_check_ads(frame) == "YES"
+    user_content = mock_client.chat.completions.create.call_args[1]["messages"][-1]["content"]
+    assert user_content[0]["image_url"]["url"].startswith("data:image/jpeg;base64,")
+
+
+def test_generate_opener_without_api_key(mocker):
     """Test that generate_opener returns a fallback message when API key is missing."""
     # Ensure OPENAI_API_KEY is not set
-    with patch.dict(os.environ, {}, clear=True):
-        result = generate_opener(["test.png"])
-        assert result == FALLBACK_MESSAGE
+    mocker.patch.dict(os.environ, {}, clear=True)
+    result = generate_opener(["test.png"])
+    assert result == FALLBACK_MESSAGE
 
 
-def test_generate_opener_handles_api_error():
+def test_generate_opener_handles_api_error(mocker):
     """Test that generate_opener handles API errors gracefully."""
     # Mock environment and OpenAI client
-    with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}), \
-         patch('openai.OpenAI') as mock_openai:
-        
-        # Setup mock client to raise an exception
-        mock_client = MagicMock()
-        mock_openai.return_value = mock_client
-        mock_client.chat.completions.create.side_effect = Exception("API error")
-        
-        # Mock image processing
-        with patch('tinder_bot.gpt.encode_image', return_value="test-base64"), \
-             patch('tinder_bot.gpt.optimize_image', side_effect=lambda x: x):
-            
-            # Call the function
-            result = generate_opener(["test.png"])
-            
-            # Check that the fallback message is returned
-            assert result == FALLBACK_MESSAGE 
\ No newline at end of file
+    mocker.patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    mock_openai = mocker.patch('openai.OpenAI')
+    
+    # Setup mock client to raise an exception
+    mock_client = MagicMock()
+    mock_openai.return_value = mock_client
+    mock_client.chat.completions.create.side_effect = Exception("API error")
+    
+    # Mock image processing
+    mocker.patch('tinder_bot.gpt.encode_image', return_value="test-base64")
+    mocker.patch('tinder_bot.gpt.optimize_image', return_value=b"jpeg-bytes")
+    
+    # Call the function
+    result = generate_opener(["test.png"])
+    
+    # Check that the fallback message is returned
+    assert result == FALLBACK_MESSAGE 
+
+def test_generate_openers_async_runs_requests_concurrently(mocker):
+    """Test that generate_openers_async issues one request per profile."""
+    profiles = ["profile1.png", "profile2.png", "profile3.png"]
+    
+    mocker.patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    mock_async_openai = mocker.patch('openai.AsyncOpenAI')
+    
+    # Setup mock async client; `async with` hands back the same client
+    mock_client = MagicMock()
+    mock_client.__aenter__.return_value = mock_client
+    mock_async_openai.return_value = mock_client
+    
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = "Name: Test\nThis is a test opener"
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+    
+    # Mock image processing
+    mocker.patch('tinder_bot.gpt.encode_image', return_value="test-base64")
+    mocker.patch('tinder_bot.gpt.optimize_image', return_value=b"jpeg-bytes")
+    
+    results = asyncio.run(generate_openers_async(profiles, max_concurrency=2))
+    
+    # One request per profile, results in input order
+    assert mock_client.chat.completions.create.await_count == len(profiles)
+    assert results == [("Test", "Name: Test\nThis is a test opener")] * len(profiles)
+    # The client (and its connection pool) is closed afterwards
+    mock_client.__aexit__.assert_awaited_once()
+
+
+def test_generate_openers_async_keeps_concurrent_profiles_apart(tmp_path, monkeypatch, mocker):
+    """Test that list profiles stitched at the same time each send their own photos."""
+    monkeypatch.chdir(tmp_path)
+    colors = {"red": (255, 0, 0), "blue": (0, 0, 255)}
+    profiles = []
+    for name in colors:
+        paths = []
+        for i in range(2):
+            path = tmp_path / f"{name}_{i}.png"
+            Image.new('RGB', (40, 80), color=name).save(path)
+            paths.append(str(path))
+        profiles.append(paths)
+    
+    mocker.patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    mock_client = MagicMock()
+    mock_client.__aenter__.return_value = mock_client
+    mocker.patch('openai.AsyncOpenAI', return_value=mock_client)
+    
+    sent = []
+    
+    async def create(**kwargs):
+        url = kwargs["messages"][-1]["content"][0]["image_url"]["url"]
+        image = Image.open(io.BytesIO(base64.b64decode(url.split(",", 1)[1])))
+        sent.append(image.convert('RGB').getpixel((0, 0)))
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = "Name: Test\nHi"
+        return response
+    
+    mock_client.chat.completions.create = create
+    
+    asyncio.run(generate_openers_async(profiles))
+    
+    # Each request carries its own profile's colour, and nothing is written to disk
+    assert len(sent) == 2
+    for pixel, expected in zip(sorted(sent), sorted(colors.values()), strict=True):
+        assert all(abs(a - b) < 8 for a, b in zip(pixel, expected, strict=True))
+    assert not (tmp_path / "screenshots").exists()
+
+
+def test_generate_openers_async_respects_concurrency_limit(mocker):
+    """Test that no more than MAX_CONCURRENT_REQUESTS requests are in flight at once."""
+    profiles = [f"profile{i}.png" for i in range(MAX_CONCURRENT_REQUESTS * 3)]
+    
+    mocker.patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    mock_client = MagicMock()
+    mock_client.__aenter__.return_value = mock_client
+    mocker.patch('openai.AsyncOpenAI', return_value=mock_client)
+    mocker.patch('tinder_bot.gpt._build_opener_content', return_value=[{"type": "text", "text": "x"}])
+    
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = "Name: Test\nThis is a test opener"
+    in_flight = 0
+    peak = 0
+    
+    async def slow_create(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return mock_response
+    
+    mock_client.chat.completions.create = slow_create
+    
+    results = asyncio.run(generate_openers_async(profiles))
+    
+    assert len(results) == len(profiles)
+    assert peak == MAX_CONCURRENT_REQUESTS
+
+
+def test_generate_openers_batch_single_request(mocker):
+    """Test that generate_openers_batch sends up to n profiles per request and keys results by profile_id."""
+    profiles = ["profile0.png", "profile1.png", "profile2.png"]
+    
+    mocker.patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    mock_openai = mocker.patch('openai.OpenAI')
+    
+    # Model answers for profiles 0 and 1 only; profile 2 falls back
+    mock_client = MagicMock()
+    mock_openai.return_value = mock_client
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = (
+        '{"openers": [{"profile_id": 0, "name": "Ann", "opener": "Hi Ann"},'
+        ' {"profile_id": 1, "name": "Bea", "opener": "Hi Bea"}]}'
+    )
+    mock_client.chat.completions.create.return_value = mock_response
+    
+    mocker.patch('tinder_bot.gpt.encode_image', return_value="test-base64")
+    mocker.patch('tinder_bot.gpt.optimize_image', return_value=b"jpeg-bytes")
+    
+    results = generate_openers_batch(profiles, n=3)
+    
+    # All three profiles go out in one request, each labelled before its image
+    assert mock_client.chat.completions.create.call_count == 1
+    content = mock_client.chat.completions.create.call_args[1]['messages'][1]['content']
+    assert [part['text'] for part in content if part['type'] == 'text'] == ["Profile 0", "Profile 1", "Profile 2"]
+    assert results == {
+        0: ("Ann", "Hi Ann"),
+        1: ("Bea", "Hi Bea"),
+        2: ("unknown", FALLBACK_MESSAGE),
+    }
+
+
+def test_generate_openers_batch_counts_only_sent_profiles(mocker):
+    """Test that the batch prompt asks for as many openers as profiles actually sent."""
+    profiles = ["profile0.png", "missing.png", "profile2.png"]
+    
+    mocker.patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    mock_client = MagicMock()
+    mocker.patch('openai.OpenAI', return_value=mock_client)
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = (
+        '{"openers": [{"profile_id": 0, "name": "Ann", "opener": "Hi Ann"},'
+        ' {"profile_id": 1, "name": "Ghost", "opener": "Hi Ghost"}]}'
+    )
+    mock_client.chat.completions.create.return_value = mock_response
+    
+    # The second profile's image can't be read
+    mocker.patch('tinder_bot.gpt._build_opener_content',
+                 side_effect=lambda paths: None if paths == "missing.png" else [{"type": "text", "text": "img"}])
+    
+    results = generate_openers_batch(profiles, n=3)
+    
+    kwargs = mock_client.chat.completions.create.call_args[1]
+    assert kwargs['messages'][0] == tinder_bot.gpt._batch_system_message(2)
+    assert kwargs['max_tokens'] == tinder_bot.gpt.MAX_TOKENS * 2
+    # An answer for the unsent profile is ignored
+    assert results[1] == ("unknown", FALLBACK_MESSAGE)
+    assert results[0] == ("Ann", "Hi Ann")
@@ -0,0 +1,93 @@
+"""Tests for the CLI logging handlers."""
+
+import atexit
+import logging
+import queue
+
+from tinder_bot.log_handlers import BufferedFileHandler, DeferredQueueHandler, configure_queue_logging
+
+
+def test_buffered_file_handler_flushes_on_error_and_close(tmp_path):
+    """Test that routine records stay buffered until an ERROR record or close."""
+    log_file = tmp_path / "bot.log"
+    handler = BufferedFileHandler(log_file)
+    logger = logging.getLogger("tinder_bot.tests.buffered")
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    try:
+        logger.debug("scrolling")
+        assert log_file.read_text() == ""
+        
+        logger.error("capture failed")
+        assert log_file.read_text() == "scrolling\ncapture failed\n"
+        
+        logger.info("done")
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+    
+    assert log_file.read_text() == "scrolling\ncapture failed\ndone\n"
+
+
+def test_deferred_queue_handler_enqueues_unformatted_record():
+    """Test that records reach the queue with their args and exc_info intact."""
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    logger = logging.getLogger("tinder_bot.tests.deferred")
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        try:
+            raise ValueError("bad frame")
+        except ValueError:
+            logger.error("Capture %d failed", 3, exc_info=True)
+    finally:
+        logger.removeHandler(handler)
+    
+    record = log_queue.get_nowait()
+    assert record.msg == "Capture %d failed"
+    assert record.args == (3,)
+    assert record.exc_info[0] is ValueError
+
+
+def test_buffered_file_handler_delay_creates_nothing_until_first_record(tmp_path):
+    """Test that a delayed handler creates the log directory and file only when a record is written."""
+    log_file = tmp_path / "logs" / "bot.log"
+    handler = BufferedFileHandler(log_file, delay=True)
+    handler.close()
+    assert not log_file.parent.exists()
+    
+    handler = BufferedFileHandler(log_file, delay=True)
+    handler.emit(logging.makeLogRecord({"msg": "boom", "levelno": logging.ERROR}))
+    handler.close()
+    assert log_file.read_text() == "boom\n"
+
+
+def test_configure_queue_logging_writes_through_listener(tmp_path):
+    """Test that root logger records reach the log file via the queue listener."""
+    log_file = tmp_path / "logs" / "bot.log"
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    root.handlers = []
+    try:
+        queue_handler = configure_queue_logging(log_file, logging.INFO)
+        assert root.handlers == [queue_handler]
+        
+        logging.getLogger("tinder_bot.tests.configured").info("Profile %d done", 1)
+        logging.getLogger("tinder_bot.tests.configured").debug("not written")
+        # Stop it here instead of at exit, so the records are written now
+        atexit.unregister(queue_handler.listener.stop)
+        queue_handler.listener.stop()
+    finally:
+        for handler in root.handlers:
+            handler.close()
+        root.handlers = saved_handlers
+        root.setLevel(saved_level)
+    
+    # stop() does not close the file handler; logging.shutdown does at exit
+    for handler in queue_handler.listener.handlers:
+        handler.close()
+    text = log_file.read_text()
+    assert "INFO - Profile 1 done" in text
+    assert "not written" not in text
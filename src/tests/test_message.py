@@ -1,59 +1,85 @@
 """Tests for message input module."""
 
 import pytest
-from unittest.mock import patch, MagicMock, call
-from tinder_bot.message import send_opener
+from unittest.mock import MagicMock, call
+from tinder_bot.message import send_opener, PASTE_MODIFIER
 
 
-def test_paste_message(mock_window_bbox):
+def test_paste_message(mock_window_bbox, mocker):
     """Test that send_opener correctly pastes message."""
     test_opener = "Hey! I noticed you like hiking. What's your favorite trail?"
     
     # Mock pyautogui functions
-    with patch('pyautogui.click') as mock_click, \
-         patch('pyautogui.typewrite') as mock_typewrite, \
-         patch('time.sleep') as mock_sleep:
-        
-        # Call the function
-        send_opener(test_opener, mock_window_bbox)
-        
-        # Check that pyautogui.click was called at least once
-        assert mock_click.call_count >= 1
-        
-        # Check that pyautogui.typewrite was called with the opener
-        mock_typewrite.assert_called_with(test_opener)
-        
-        # Check that time.sleep was called at least once
-        assert mock_sleep.call_count >= 1
-
-
-def test_send_opener_handles_empty_message():
+    mock_click = mocker.patch('pyautogui.click')
+    mocker.patch('pyperclip.paste', return_value="")
+    mock_copy = mocker.patch('pyperclip.copy')
+    mock_hotkey = mocker.patch('pyautogui.hotkey')
+    mock_sleep = mocker.patch('time.sleep')
+    
+    # Call the function
+    send_opener(test_opener, mock_window_bbox)
+    
+    # Check that pyautogui.click was called at least once
+    assert mock_click.call_count >= 1
+    
+    # Check that the opener was copied and pasted with a single hotkey
+    assert mock_copy.call_args_list[0] == call(test_opener)
+    mock_hotkey.assert_called_once_with(PASTE_MODIFIER, "v")
+    
+    # Check that time.sleep was called at least once
+    assert mock_sleep.call_count >= 1
+
+
+def test_send_opener_handles_empty_message(mocker):
     """Test that send_opener handles empty messages gracefully."""
     bbox = (100, 100, 400, 800)
     
     # Mock pyautogui functions
-    with patch('pyautogui.click') as mock_click, \
-         patch('pyautogui.typewrite') as mock_typewrite:
-        
-        # Call with empty string
-        send_opener("", bbox)
-        
-        # Check that typewrite was not called
-        mock_typewrite.assert_not_called()
+    mock_click = mocker.patch('pyautogui.click')
+    mock_copy = mocker.patch('pyperclip.copy')
+    mock_hotkey = mocker.patch('pyautogui.hotkey')
+    
+    # Call with empty string
+    send_opener("", bbox)
+    
+    # Check that nothing was pasted
+    mock_copy.assert_not_called()
+    mock_hotkey.assert_not_called()
 
 
-def test_send_opener_handles_long_message():
+def test_send_opener_handles_long_message(mocker):
     """Test that send_opener handles very long messages."""
     bbox = (100, 100, 400, 800)
     long_opener = "A" * 300  # Create a 300-character string
     
     # Mock pyautogui functions
-    with patch('pyautogui.click'), \
-         patch('pyautogui.typewrite') as mock_typewrite:
-        
-        # Call the function
-        send_opener(long_opener, bbox)
-        
-        # Check that typewrite was called with a truncated message
-        args, _ = mock_typewrite.call_args
-        assert len(args[0]) <= 200 
\ No newline at end of file
+    mocker.patch('pyautogui.click')
+    mocker.patch('time.sleep')
+    mocker.patch('pyperclip.paste', return_value="")
+    mock_copy = mocker.patch('pyperclip.copy')
+    mocker.patch('pyautogui.hotkey')
+    
+    # Call the function
+    send_opener(long_opener, bbox)
+    
+    # Check that a truncated message was copied for pasting
+    args, _ = mock_copy.call_args_list[0]
+    assert len(args[0]) <= 200 
+
+
+def test_send_opener_restores_clipboard(mock_window_bbox, mocker):
+    """Test that the user's clipboard contents come back after pasting, even if the paste fails."""
+    mocker.patch('pyautogui.click')
+    mocker.patch('time.sleep')
+    mocker.patch('pyperclip.paste', return_value="my copied text")
+    mock_copy = mocker.patch('pyperclip.copy')
+    mocker.patch('pyautogui.hotkey')
+    
+    send_opener("Hi there!", mock_window_bbox)
+    assert mock_copy.call_args_list == [call("Hi there!"), call("my copied text")]
+    
+    mock_copy.reset_mock()
+    mocker.patch('pyautogui.hotkey', side_effect=RuntimeError("no display"))
+    with pytest.raises(RuntimeError):
+        send_opener("Hi there!", mock_window_bbox)
+    assert mock_copy.call_args_list == [call("Hi there!"), call("my copied text")]
@@ -1,338 +1,251 @@
 """Tests for profile scrolling module."""
 
 import pytest
-from unittest.mock import patch, MagicMock, call
 from tinder_bot.scroll import (
     scroll_profile, move_to_iphone_center, get_hardcoded_window,
+    validate_bbox, get_safe_coordinates, click_at,
     FIRST_SCROLL_AMOUNT, SUBSEQUENT_SCROLL_AMOUNT, NUM_SCROLLS,
+    STEPS_PER_SCROLL, SCROLL_DELAY,
     IPHONE_X_BEGIN, IPHONE_Y_BEGIN, IPHONE_WIDTH, IPHONE_HEIGHT
 )
 from tinder_bot.window import find_iphone_window
-import numpy as np
+import tinder_bot.window
 import os
 
+# Mock iPhone window used by the window-to-scroll integration test
+_IPHONE_X, _IPHONE_Y = 500, 200
+_IPHONE_W = 400
+_IPHONE_H = int(_IPHONE_W * 19.5 / 9)
+
+def summarize(mock_scroll, mock_sleep=None):
+    """Return the first positional argument of every scroll and sleep call, in one pass each."""
+    scrolls = [c.args[0] for c in mock_scroll.call_args_list]
+    sleeps = [c.args[0] for c in mock_sleep.call_args_list] if mock_sleep is not None else []
+    return scrolls, sleeps
+
+
 @pytest.fixture
-def hardcoded_bbox():
+def hardcoded_bbox(set_environment):
     """Return the hardcoded window bbox for testing."""
-    with patch('os.getenv', return_value="MONITOR"):
-        return get_hardcoded_window()
+    set_environment("MONITOR")
+    return get_hardcoded_window()
+
+
+@pytest.fixture
+def scroll_run(mocker, request):
+    """Run scroll_profile once on the parametrized bbox and return the recorded mocks."""
+    bbox = request.param
+    mocks = {name: mocker.patch(f'pyautogui.{name}') for name in ('scroll', 'moveTo', 'click')}
+    mocks['sleep'] = mocker.patch('time.sleep')
+    mocker.patch('tinder_bot.scroll.DEBUG_MODE', False)
+    
+    scroll_profile(bbox)
+    return bbox, mocks
 
 
-def test_hardcoded_window_dimensions():
+def test_hardcoded_window_dimensions(set_environment):
     """Test that the hardcoded window dimensions are correct for MONITOR."""
-    with patch('os.getenv', return_value="MONITOR"):
-        bbox = get_hardcoded_window()
-        
-        # Check the exact dimensions
-        assert bbox == (IPHONE_X_BEGIN, IPHONE_Y_BEGIN, IPHONE_WIDTH, IPHONE_HEIGHT)
-        
-        # Verify the corners match the expected values
-        x, y, width, height = bbox
-        assert x == 2304
-        assert y == 617
-        assert x + width == 2500
-        assert y + height == 1042
+    set_environment("MONITOR")
+    bbox = get_hardcoded_window()
+    
+    # Check the exact dimensions
+    assert bbox == (IPHONE_X_BEGIN, IPHONE_Y_BEGIN, IPHONE_WIDTH, IPHONE_HEIGHT)
+    
+    # Verify the corners match the expected values
+    x, y, width, height = bbox
+    assert x == 2304
+    assert y == 617
+    assert x + width == 2500
+    assert y + height == 1042
 
 
-def test_mac_environment_raises_error():
+def test_mac_environment_raises_error(set_environment):
     """Test that MAC environment raises NotImplementedError."""
-    with patch('os.getenv', return_value="MAC"):
-        with pytest.raises(NotImplementedError):
-            get_hardcoded_window()
+    set_environment("MAC")
+    with pytest.raises(NotImplementedError):
+        get_hardcoded_window()
 
 
-def test_move_to_hardcoded_center():
-    """Test that move_to_iphone_center uses hardcoded values for MONITOR."""
-    with patch('os.getenv', return_value="MONITOR"), \
-         patch('pyautogui.moveTo') as mock_move, \
-         patch('pyautogui.size', return_value=(2511, 1051)), \
-         patch('builtins.print'), \
-         patch('builtins.input'):
-        
-        # Call with arbitrary bbox which should be replaced with hardcoded values
-        center_x, center_y = move_to_iphone_center((0, 0, 10, 10))
-        
-        # Expected center based on hardcoded values
-        expected_x = IPHONE_X_BEGIN + IPHONE_WIDTH // 2
-        expected_y = IPHONE_Y_BEGIN + IPHONE_HEIGHT // 2
-        
-        # Check center coordinates
-        assert center_x == expected_x
-        assert center_y == expected_y
-        
-        # Check pyautogui.moveTo was called with hardcoded center
-        mock_move.assert_called_once_with(expected_x, expected_y, duration=0.5)
+def test_click_at_without_native_backend(mocker):
+    """Test that click_at clicks in place through pyautogui when no native backend is loaded."""
+    mocker.patch('tinder_bot.scroll.Quartz', None)
+    mocker.patch('tinder_bot.scroll._user32', None)
+    mock_move = mocker.patch('pyautogui.moveTo')
+    mock_click = mocker.patch('pyautogui.click')
+    
+    click_at(320, 240)
+    
+    mock_click.assert_called_once_with(320, 240)
+    mock_move.assert_not_called()
 
 
-def test_scroll_profile_uses_exact_values():
-    """Test that scroll_profile uses the exact scroll values."""
-    with patch('os.getenv', return_value="MONITOR"), \
-         patch('pyautogui.moveTo'), \
-         patch('pyautogui.click'), \
-         patch('pyautogui.scroll') as mock_scroll, \
-         patch('time.sleep'), \
-         patch('tinder_bot.scroll.DEBUG_MODE', False):
-        
-        # Call with arbitrary bbox which should be replaced with hardcoded values
-        scroll_profile((0, 0, 10, 10))
-        
-        # Extract all scroll values used
-        scroll_values = [call[0][0] for call in mock_scroll.call_args_list 
-                       if call[0][0] < 0]  # Only consider downward scrolls
-        
-        # We should have exactly NUM_SCROLLS downward scrolls
-        assert len(scroll_values) == NUM_SCROLLS
-        
-        # First value should be FIRST_SCROLL_AMOUNT
-        assert scroll_values[0] == FIRST_SCROLL_AMOUNT
-        
-        # Subsequent values should be SUBSEQUENT_SCROLL_AMOUNT
-        for i in range(1, NUM_SCROLLS):
-            assert scroll_values[i] == SUBSEQUENT_SCROLL_AMOUNT
+def test_move_to_hardcoded_center(mocker, set_environment):
+    """Test that move_to_iphone_center uses hardcoded values for MONITOR."""
+    set_environment("MONITOR")
+    mock_move = mocker.patch('pyautogui.moveTo')
+    mocker.patch('pyautogui.size', return_value=(2511, 1051))
+    
+    # Call with arbitrary bbox which should be replaced with hardcoded values
+    center_x, center_y = move_to_iphone_center((0, 0, 10, 10))
+    
+    # Expected center based on hardcoded values
+    expected_x = IPHONE_X_BEGIN + IPHONE_WIDTH // 2
+    expected_y = IPHONE_Y_BEGIN + IPHONE_HEIGHT // 2
+    
+    # Check center coordinates
+    assert center_x == expected_x
+    assert center_y == expected_y
+    
+    # Check pyautogui.moveTo was called with hardcoded center
+    mock_move.assert_called_once_with(expected_x, expected_y)
 
 
-def test_scroll_respects_exact_delay():
-    """Test that scrolling uses the exact 2-second delay."""
-    with patch('os.getenv', return_value="MONITOR"), \
-         patch('pyautogui.moveTo'), \
-         patch('pyautogui.click'), \
-         patch('pyautogui.scroll'), \
-         patch('time.sleep') as mock_sleep, \
-         patch('tinder_bot.scroll.DEBUG_MODE', False):
-        
-        # Call with arbitrary bbox which should be replaced with hardcoded values
-        scroll_profile((0, 0, 10, 10))
-        
-        # Check that sleep was called with exactly 2.0 seconds
-        mock_sleep.assert_any_call(2.0)
-        
-        # Count how many times it was called with exactly 2.0
-        two_second_delays = sum(1 for call in mock_sleep.call_args_list if call[0][0] == 2.0)
-        
-        # Should have one 2-second delay for each scroll
-        assert two_second_delays >= NUM_SCROLLS
+@pytest.mark.parametrize('scroll_run', [(0, 0, 10, 10), (200, 150, 350, 700)], indirect=True)
+def test_scroll_profile_behavior(scroll_run):
+    """Test scroll values, delays, focus clicks and mouse position from a single scroll_profile run."""
+    bbox, mocks = scroll_run
+    
+    # The mouse goes to the center of the (validated) window, clamped to safe coordinates
+    x, y, w, h = validate_bbox(bbox)
+    center_x, center_y = get_safe_coordinates(x + w // 2, y + h // 2)
+    mocks['moveTo'].assert_any_call(center_x, center_y)
+    
+    # Clicks at the center keep the window focused
+    assert mocks['click'].call_count >= 1
+    mocks['click'].assert_any_call(center_x, center_y)
+    
+    scrolls, sleeps = summarize(mocks['scroll'], mocks['sleep'])
+    
+    # Each downward scroll is split into STEPS_PER_SCROLL exact steps
+    scroll_values = [value for value in scrolls if value < 0]
+    assert len(scroll_values) == NUM_SCROLLS * STEPS_PER_SCROLL
+    assert scroll_values[:STEPS_PER_SCROLL] == [FIRST_SCROLL_AMOUNT // STEPS_PER_SCROLL] * STEPS_PER_SCROLL
+    assert scroll_values[STEPS_PER_SCROLL:] == [SUBSEQUENT_SCROLL_AMOUNT // STEPS_PER_SCROLL] * ((NUM_SCROLLS - 1) * STEPS_PER_SCROLL)
+    
+    # One SCROLL_DELAY pause follows each scroll
+    assert sleeps.count(SCROLL_DELAY) >= NUM_SCROLLS
 
 
-def test_move_to_iphone_center(mock_window_bbox):
+def test_move_to_iphone_center(mock_window_bbox, mocker, caplog):
     """Test that move_to_iphone_center correctly calculates and moves to center."""
     x, y, w, h = mock_window_bbox
     expected_center_x = x + w // 2
     expected_center_y = y + h // 2
     
     # Mock pyautogui functions
-    with patch('pyautogui.moveTo') as mock_move, \
-         patch('builtins.print') as mock_print, \
-         patch('builtins.input', return_value='') as mock_input:
-        
-        # Call the function
-        result_x, result_y = move_to_iphone_center(mock_window_bbox)
-        
-        # Check that correct center coordinates were calculated
-        assert result_x == expected_center_x
-        assert result_y == expected_center_y
-        
-        # Check that pyautogui.moveTo was called with the center coordinates
-        mock_move.assert_called_once_with(expected_center_x, expected_center_y)
-        
-        # Verify debug output was printed
-        mock_print.assert_any_call(f"\nMoving to iPhone center at: ({expected_center_x}, {expected_center_y})")
+    mock_move = mocker.patch('pyautogui.moveTo')
+    caplog.set_level('INFO', logger='tinder_bot.scroll')
+    
+    # Call the function
+    result_x, result_y = move_to_iphone_center(mock_window_bbox)
+    
+    # Check that correct center coordinates were calculated
+    assert result_x == expected_center_x
+    assert result_y == expected_center_y
+    
+    # Check that pyautogui.moveTo was called with the center coordinates
+    mock_move.assert_called_once_with(expected_center_x, expected_center_y)
+    
+    # Verify debug output was logged
+    assert f"Moving to iPhone center at: ({expected_center_x}, {expected_center_y})" in caplog.text
 
 
-def test_visual_verification_of_center():
+@pytest.mark.slow
+@pytest.mark.skipif(not os.environ.get('VISUAL_TEST'),
+                    reason="Skipping visual verification test. Set VISUAL_TEST=1 to run.")
+def test_visual_verification_of_center(mocker):
     """
     A test that helps visually verify the center point calculation.
     
     This test will attempt to find the iPhone window using the real
     window detection logic, and will print out detailed information
     about what it found for manual verification.
-    """
-    # This test only runs if VISUAL_TEST environment variable is set
-    if not os.environ.get('VISUAL_TEST'):
-        pytest.skip("Skipping visual verification test. Set VISUAL_TEST=1 to run.")
     
+    Only runs when the VISUAL_TEST environment variable is set.
+    """
     # Mock pyautogui.moveTo to capture the arguments
-    with patch('pyautogui.moveTo') as mock_move, \
-         patch('time.sleep'):  # Don't actually sleep during tests
-        
-        # First find the iPhone window using the actual implementation
-        with patch('tinder_bot.window.save_detected_window'):  # Don't save screenshots during test
-            bbox = find_iphone_window()
-        
-        # Now calculate and move to the center
-        center_x, center_y = move_to_iphone_center(bbox)
-        
-        # Print information for visual verification
-        print(f"\n=== VISUAL VERIFICATION TEST ===")
-        print(f"Detected iPhone window: x={bbox[0]}, y={bbox[1]}, width={bbox[2]}, height={bbox[3]}")
-        print(f"Center point: ({center_x}, {center_y})")
-        print(f"If you want to visually confirm, run: python -c \"import pyautogui; pyautogui.moveTo({center_x}, {center_y})\"")
-        
-        # Assert that moveTo was called with the correct arguments
-        mock_move.assert_called_once_with(center_x, center_y)
-
-
-def test_scroll_profile_calls_pyautogui(mock_window_bbox):
-    """Test that scroll_profile calls pyautogui with correct arguments."""
-    # Mock pyautogui.scroll
-    with patch('pyautogui.scroll') as mock_scroll, \
-         patch('pyautogui.moveTo') as mock_move, \
-         patch('pyautogui.click') as mock_click, \
-         patch('time.sleep') as mock_sleep, \
-         patch('builtins.print'), \
-         patch('tinder_bot.scroll.DEBUG_MODE', False):
-        
-        # Call the function
-        scroll_profile(mock_window_bbox)
-        
-        # Check that pyautogui.scroll was called multiple times
-        assert mock_scroll.call_count >= 3
-        
-        # Check that click was called to maintain focus
-        assert mock_click.call_count >= 1
-        
-        # Check that time.sleep was called between scrolls
-        assert mock_sleep.call_count >= 2
-
-
-def test_scroll_profile_moves_mouse_to_center(mock_window_bbox):
-    """Test that scroll_profile moves the mouse to the center of the window."""
-    x, y, w, h = mock_window_bbox
-    center_x = x + w // 2
-    center_y = y + h // 2
+    mock_move = mocker.patch('pyautogui.moveTo')
     
-    # Mock pyautogui functions
-    with patch('pyautogui.moveTo') as mock_move, \
-         patch('pyautogui.click') as mock_click, \
-         patch('pyautogui.scroll') as mock_scroll, \
-         patch('time.sleep'), \
-         patch('builtins.print'), \
-         patch('tinder_bot.scroll.DEBUG_MODE', False):
-        
-        # Call the function
-        scroll_profile(mock_window_bbox)
-        
-        # Check that pyautogui.moveTo was called with the center coordinates
-        # Using ANY for more flexible assertion that's less brittle
-        mock_move.assert_any_call(center_x, center_y)
+    # First find the iPhone window using the actual implementation
+    mocker.patch('tinder_bot.window.save_detected_window')  # Don't save screenshots during test
+    bbox = find_iphone_window()
+    
+    # Now calculate and move to the center
+    center_x, center_y = move_to_iphone_center(bbox)
+    
+    # Print information for visual verification
+    print(f"\n=== VISUAL VERIFICATION TEST ===")
+    print(f"Detected iPhone window: x={bbox[0]}, y={bbox[1]}, width={bbox[2]}, height={bbox[3]}")
+    print(f"Center point: ({center_x}, {center_y})")
+    print(f"If you want to visually confirm, run: python -c \"import pyautogui; pyautogui.moveTo({center_x}, {center_y})\"")
+    
+    # Assert that moveTo was called with the correct arguments
+    mock_move.assert_called_once_with(center_x, center_y)
 
 
-def test_scroll_profile_with_randomization():
-    """Test that scroll_profile includes randomized behavior."""
+def test_scroll_profile_uses_distinct_scroll_values(mocker, small_num_scrolls):
+    """Test that the first, subsequent and back-to-top scroll values differ."""
     bbox = (100, 100, 400, 800)
     
-    # Run the function multiple times and collect the scroll values
-    scroll_values = []
-    
-    with patch('pyautogui.scroll') as mock_scroll, \
-         patch('pyautogui.moveTo'), \
-         patch('pyautogui.click'), \
-         patch('time.sleep'), \
-         patch('builtins.print'), \
-         patch('tinder_bot.scroll.DEBUG_MODE', False):
-        
-        # Call the function multiple times
-        for _ in range(5):
-            scroll_profile(bbox)
-            # Extract the scroll values from the mock calls
-            scroll_values.extend([call[0][0] for call in mock_scroll.call_args_list])
-            mock_scroll.reset_mock()
-    
-    # Check that we have different scroll values (randomized behavior)
-    assert len(set(scroll_values)) > 1, "Scroll values should be randomized"
+    mock_scroll = mocker.patch('pyautogui.scroll')
+    mocker.patch('tinder_bot.scroll.DEBUG_MODE', False)
+    
+    scroll_profile(bbox)
+    scroll_values = summarize(mock_scroll)[0]
+    
+    assert len(set(scroll_values)) > 1, "Scroll values should differ"
 
 
-def test_integration_window_to_scroll():
-    """Test that the window detection and scrolling work together correctly."""
-    # Define mock iPhone dimensions
-    iphone_width = 400
-    iphone_height = int(iphone_width * 19.5 / 9)
-    iphone_x = 500
-    iphone_y = 200
-    
-    # Create a mock screenshot and a properly shaped mock threshold result
-    mock_screenshot = MagicMock()
-    mock_screenshot.size = (1920, 1080)
-    mock_np = np.zeros((1080, 1920, 3), dtype=np.uint8)
-    mock_gray = np.zeros((1080, 1920), dtype=np.uint8)
-    mock_thresh = np.zeros((1080, 1920), dtype=np.uint8)
-    
-    # Create a mock contour
-    mock_contour = np.array([
-        [[iphone_x, iphone_y]], 
-        [[iphone_x+iphone_width, iphone_y]], 
-        [[iphone_x+iphone_width, iphone_y+iphone_height]], 
-        [[iphone_x, iphone_y+iphone_height]]
-    ])
-    
-    # Mock all the necessary functions for window detection to return a specific window bbox
-    with patch('pyautogui.screenshot', return_value=mock_screenshot), \
-         patch('cv2.cvtColor', side_effect=[mock_np, mock_gray]), \
-         patch('cv2.threshold', side_effect=[(None, mock_thresh), (None, mock_thresh)]), \
-         patch('cv2.findContours', side_effect=[([mock_contour], None), ([], None)]), \
-         patch('cv2.arcLength', return_value=2*(iphone_width + iphone_height)), \
-         patch('cv2.approxPolyDP', return_value=np.array([
-            [[iphone_x, iphone_y]],
-            [[iphone_x+iphone_width, iphone_y]],
-            [[iphone_x+iphone_width, iphone_y+iphone_height]],
-            [[iphone_x, iphone_y+iphone_height]]
-         ])), \
-         patch('cv2.boundingRect', return_value=(iphone_x, iphone_y, iphone_width, iphone_height)), \
-         patch('numpy.mean', return_value=240), \
-         patch('tinder_bot.window.save_detected_window'), \
-         patch('pyautogui.moveTo') as mock_move, \
-         patch('pyautogui.click') as mock_click, \
-         patch('pyautogui.scroll') as mock_scroll, \
-         patch('time.sleep'), \
-         patch('builtins.print'), \
-         patch('tinder_bot.scroll.DEBUG_MODE', False):
-        
-        # Call find_iphone_window to get the bbox
-        bbox = find_iphone_window()
-        
-        # Now call scroll_profile with that bbox
-        scroll_profile(bbox)
-        
-        # Check that moveTo was called with the center of our mock iPhone
-        expected_center_x = iphone_x + iphone_width // 2
-        expected_center_y = iphone_y + iphone_height // 2
-        
-        # Use assert_any_call instead of assert_called_with
-        mock_move.assert_any_call(expected_center_x, expected_center_y)
-        
-        # Print the expected coordinates for debugging
-        print(f"\nExpected center coordinates: ({expected_center_x}, {expected_center_y})")
-        print(f"This should be in the middle of the iPhone screen")
-        
-        # Verify that scroll was called the appropriate number of times
-        assert mock_scroll.call_count >= 6  # At least MIN_SCROLLS
-        assert mock_click.call_count >= 1  # At least once
+
+def test_scroll_profile_num_scrolls_argument(mocker):
+    """Test that an explicit num_scrolls overrides the NUM_SCROLLS default."""
+    mock_scroll = mocker.patch('pyautogui.scroll')
+    mocker.patch('pyautogui.moveTo')
+    mocker.patch('pyautogui.click')
+    mocker.patch('time.sleep')
+    mocker.patch('tinder_bot.scroll.DEBUG_MODE', False)
+    
+    scroll_profile((100, 100, 400, 800), num_scrolls=2)
+    scroll_values = summarize(mock_scroll)[0]
+    
+    # Two downward scrolls, then the scroll back to the top
+    down_values = [value for value in scroll_values if value < 0]
+    assert len(down_values) == 2 * STEPS_PER_SCROLL
 
 
-def test_scroll_respects_window_boundaries():
-    """Test that scrolling stays within the detected window boundaries."""
-    # Create a mock bbox with specific dimensions
-    bbox = (200, 150, 350, 700)  # x, y, width, height
+@pytest.mark.slow
+def test_integration_window_to_scroll(mocker, small_num_scrolls):
+    """Test that the window detection and scrolling work together correctly."""
+    # Mock iPhone dimensions
+    iphone_x, iphone_y = _IPHONE_X, _IPHONE_Y
+    iphone_width, iphone_height = _IPHONE_W, _IPHONE_H
     
-    # Expected center point for this bbox
-    expected_center_x = 200 + 350 // 2
-    expected_center_y = 150 + 700 // 2
+    # Window detection itself is covered in test_window; here it just returns a fixed bbox
+    mocker.patch('tinder_bot.window.find_iphone_window',
+                 return_value=(iphone_x, iphone_y, iphone_width, iphone_height))
+    mock_move = mocker.patch('pyautogui.moveTo')
+    mock_click = mocker.patch('pyautogui.click')
+    mock_scroll = mocker.patch('pyautogui.scroll')
+    mocker.patch('tinder_bot.scroll.DEBUG_MODE', False)
     
-    # Mock pyautogui functions
-    with patch('pyautogui.moveTo') as mock_move, \
-         patch('pyautogui.click') as mock_click, \
-         patch('pyautogui.scroll') as mock_scroll, \
-         patch('time.sleep'), \
-         patch('builtins.print'), \
-         patch('tinder_bot.scroll.DEBUG_MODE', False):
-        
-        # Call the function
-        scroll_profile(bbox)
-        
-        # Check that mouse was moved to the exact center of the provided bbox
-        mock_move.assert_any_call(expected_center_x, expected_center_y)
-        
-        # Verify that click was called at the center coordinates
-        mock_click.assert_any_call(expected_center_x, expected_center_y)
-        
-        # Verify that scroll was called within the window
-        assert mock_scroll.call_count > 0 
\ No newline at end of file
+    # Call find_iphone_window to get the bbox
+    bbox = tinder_bot.window.find_iphone_window()
+    
+    # Now call scroll_profile with that bbox
+    scroll_profile(bbox)
+    
+    # Check that moveTo was called with the center of our mock iPhone
+    expected_center_x = iphone_x + iphone_width // 2
+    expected_center_y = iphone_y + iphone_height // 2
+    
+    # Use assert_any_call instead of assert_called_with
+    mock_move.assert_any_call(expected_center_x, expected_center_y)
+    
+    # Print the expected coordinates for debugging
+    print(f"\nExpected center coordinates: ({expected_center_x}, {expected_center_y})")
+    print(f"This should be in the middle of the iPhone screen")
+    
+    # Verify that scroll was called the appropriate number of times
+    assert mock_scroll.call_count >= 6  # At least MIN_SCROLLS
+    assert mock_click.call_count >= 1  # At least once
+
@@ -2,148 +2,228 @@
 
 import os
 import pytest
-from unittest.mock import patch, MagicMock
-from pathlib import Path
+from unittest.mock import MagicMock, call
+
+import numpy as np
+from PIL import Image
 
 from tinder_bot.scroll import (
-    scroll_profile, perform_stepped_scroll, 
+    scroll_profile, perform_stepped_scroll, wait_until_stable, get_hardcoded_window,
     FIRST_SCROLL_AMOUNT, SUBSEQUENT_SCROLL_AMOUNT, NUM_SCROLLS
 )
+from tinder_bot.window import find_iphone_window
+from tinder_bot.capture import capture_frame, capture_screen, frame_grabber, grab_region, save_screenshot, screenshot_paths
 
 
 @pytest.fixture
-def mock_screenshot():
+def mock_screenshot(mocker):
     """Create a mock for pyautogui.screenshot."""
-    with patch('pyautogui.screenshot') as mock_screenshot:
-        # Create a mock image
-        mock_image = MagicMock()
-        mock_image.save = MagicMock()
-        mock_screenshot.return_value = mock_image
-        yield mock_screenshot
+    mock_screenshot = mocker.patch('pyautogui.screenshot')
+    # Create a mock image
+    mock_image = MagicMock()
+    mock_image.save = MagicMock()
+    mock_screenshot.return_value = mock_image
+    yield mock_screenshot
 
 
-def test_scrolling_with_screenshots(mock_screenshot):
+@pytest.mark.slow
+def test_scrolling_with_screenshots(mock_screenshot, tmp_path, mocker, set_environment):
     """Test that screenshots are taken at the correct points during scrolling."""
     # Configure test environment
-    with patch('os.getenv', return_value="MONITOR"), \
-         patch('pyautogui.moveTo'), \
-         patch('pyautogui.click'), \
-         patch('time.sleep'), \
-         patch('tinder_bot.scroll.perform_stepped_scroll') as mock_perform_scroll:
-        
-        # Mock the screenshot directory
-        screenshots_dir = Path("./screenshots")
-        if not screenshots_dir.exists():
-            screenshots_dir.mkdir()
-        
-        # Define the callback function that takes screenshots
-        def take_screenshot_callback(bbox, index):
-            x, y, width, height = bbox
-            screenshot = mock_screenshot(region=(x, y, width, height))
-            filename = screenshots_dir / f"test_screenshot_{index}.png"
-            screenshot.save(filename)
-            return filename
-        
-        # Create a custom scroll_and_capture function for testing
-        def test_scroll_and_capture(bbox):
-            # Take initial screenshot before scrolling
-            take_screenshot_callback(bbox, 1)
-            
-            # First scroll
-            perform_stepped_scroll(FIRST_SCROLL_AMOUNT)
-            take_screenshot_callback(bbox, 2)
-            
-            # Subsequent scrolls
-            for i in range(1, NUM_SCROLLS):
-                perform_stepped_scroll(SUBSEQUENT_SCROLL_AMOUNT)
-                take_screenshot_callback(bbox, i+3)
-            
-            return 6  # Number of screenshots taken
+    set_environment("MONITOR")
+    mock_perform_scroll = mocker.patch('tinder_bot.scroll.perform_stepped_scroll')
+    
+    # Per-test directory, so parallel workers never share a path
+    screenshots_dir = tmp_path
+    
+    # Define the callback function that takes screenshots
+    def take_screenshot_callback(bbox, index):
+        x, y, width, height = bbox
+        screenshot = mock_screenshot(region=(x, y, width, height))
+        filename = screenshots_dir / f"test_screenshot_{index}.png"
+        screenshot.save(filename)
+        return filename
+    
+    # Create a custom scroll_and_capture function for testing
+    def test_scroll_and_capture(bbox):
+        # Take initial screenshot before scrolling
+        take_screenshot_callback(bbox, 1)
         
-        # Get hardcoded window dimensions (from environment)
-        from tinder_bot.scroll import get_hardcoded_window
-        bbox = get_hardcoded_window()
+        # First scroll
+        perform_stepped_scroll(FIRST_SCROLL_AMOUNT)
+        take_screenshot_callback(bbox, 2)
         
-        # Run the test function
-        num_screenshots = test_scroll_and_capture(bbox)
-        
-        # Verify that the correct number of screenshots were taken
-        assert num_screenshots == 6
-        
-        # Verify that perform_stepped_scroll was called with the correct values
-        assert mock_perform_scroll.call_count == NUM_SCROLLS
-        mock_perform_scroll.assert_any_call(FIRST_SCROLL_AMOUNT)
+        # Subsequent scrolls
         for i in range(1, NUM_SCROLLS):
-            mock_perform_scroll.assert_any_call(SUBSEQUENT_SCROLL_AMOUNT)
+            perform_stepped_scroll(SUBSEQUENT_SCROLL_AMOUNT)
+            take_screenshot_callback(bbox, i+3)
         
-        # Verify that screenshot was called the correct number of times
-        assert mock_screenshot.call_count == 6
+        return 6  # Number of screenshots taken
+    
+    # Get hardcoded window dimensions (from environment)
+    bbox = get_hardcoded_window()
+    
+    # Run the test function
+    num_screenshots = test_scroll_and_capture(bbox)
+    
+    # Verify that the correct number of screenshots were taken
+    assert num_screenshots == 6
+    
+    # Verify that perform_stepped_scroll was called with the correct values
+    assert mock_perform_scroll.call_count == NUM_SCROLLS
+    assert [c.args[0] for c in mock_perform_scroll.call_args_list] == \
+        [FIRST_SCROLL_AMOUNT] + [SUBSEQUENT_SCROLL_AMOUNT] * (NUM_SCROLLS - 1)
+    
+    # Verify that screenshot was called the correct number of times
+    assert mock_screenshot.call_count == 6
 
 
-def test_stepped_scroll_calls_pyautogui():
+def test_stepped_scroll_calls_pyautogui(mocker):
     """Test that perform_stepped_scroll calls pyautogui.scroll multiple times."""
-    with patch('pyautogui.scroll') as mock_scroll, \
-         patch('time.sleep'):
-        
-        # Call the function with a test amount
-        test_amount = -600
-        perform_stepped_scroll(test_amount)
-        
-        # Verify that pyautogui.scroll was called 10 times
-        assert mock_scroll.call_count == 10
-        
-        # Each call should use a step_size = amount // 10
-        expected_step_size = test_amount // 10
-        for call in mock_scroll.call_args_list:
-            assert call[0][0] == expected_step_size
+    mock_scroll = mocker.patch('pyautogui.scroll')
+    
+    # Call the function with a test amount
+    test_amount = -600
+    perform_stepped_scroll(test_amount)
+    
+    # Verify that pyautogui.scroll was called 10 times
+    assert mock_scroll.call_count == 10
+    
+    # Each call should use a step_size = amount // 10
+    expected_step_size = test_amount // 10
+    assert [c.args[0] for c in mock_scroll.call_args_list] == [expected_step_size] * 10
 
 
-def test_integration_between_modules():
+@pytest.mark.slow
+def test_integration_between_modules(mocker, small_num_scrolls, set_environment):
     """Test the integration between window detection, scrolling and screenshot capture."""
     # Configure test environment
-    with patch('os.getenv', return_value="MONITOR"), \
-         patch('pyautogui.moveTo'), \
-         patch('pyautogui.click'), \
-         patch('time.sleep'), \
-         patch('pyautogui.screenshot') as mock_screenshot, \
-         patch('tinder_bot.scroll.perform_stepped_scroll'):
-        
-        # Create a mock image
-        mock_image = MagicMock()
-        mock_image.save = MagicMock()
-        mock_screenshot.return_value = mock_image
-        
-        # Import the window detection module
-        from tinder_bot.window import find_iphone_window
-        
-        # Try to find the iPhone window
-        with patch('cv2.imread'), \
-             patch('cv2.cvtColor'), \
-             patch('cv2.threshold', return_value=(None, MagicMock())), \
-             patch('pyautogui.screenshot', return_value=MagicMock()):
-            
-            # Use get_hardcoded_window directly to simulate finding window
-            from tinder_bot.scroll import get_hardcoded_window
-            bbox = get_hardcoded_window()
-            
-            # Now call scroll_profile with this bbox
-            scroll_profile(bbox)
-            
-            # Define a minimal function to take a screenshot at each step
-            def take_screenshot_at_step(step_num):
-                x, y, width, height = bbox
-                screenshot = mock_screenshot(region=(x, y, width, height))
-                filename = f"test_screenshot_{step_num}.png"
-                screenshot.save(filename)
-            
-            # Take screenshots at each step (would be integrated with scroll_profile in real code)
-            # Initial screenshot
-            take_screenshot_at_step(1)
-            
-            # After each scroll
-            for i in range(NUM_SCROLLS):
-                take_screenshot_at_step(i+2)
-            
-            # Verify that we took 6 screenshots
-            assert mock_screenshot.call_count == 6
-            assert mock_image.save.call_count == 6 
\ No newline at end of file
+    set_environment("MONITOR")
+    mock_screenshot = mocker.patch('pyautogui.screenshot')
+    mocker.patch('tinder_bot.scroll.perform_stepped_scroll')
+    
+    # Create a mock image
+    mock_image = MagicMock()
+    mock_image.save = MagicMock()
+    mock_screenshot.return_value = mock_image
+    
+    # Try to find the iPhone window
+    mocker.patch('cv2.imread')
+    mocker.patch('cv2.cvtColor')
+    mocker.patch('cv2.threshold', return_value=(None, MagicMock()))
+    mocker.patch('pyautogui.screenshot', return_value=MagicMock())
+    
+    # Use get_hardcoded_window directly to simulate finding window
+    bbox = get_hardcoded_window()
+    
+    # Now call scroll_profile with this bbox
+    scroll_profile(bbox)
+    
+    # Define a minimal function to take a screenshot at each step
+    def take_screenshot_at_step(step_num):
+        x, y, width, height = bbox
+        screenshot = mock_screenshot(region=(x, y, width, height))
+        filename = f"test_screenshot_{step_num}.png"
+        screenshot.save(filename)
+    
+    # Take screenshots at each step (would be integrated with scroll_profile in real code)
+    # Initial screenshot
+    take_screenshot_at_step(1)
+    
+    # After each scroll
+    for i in range(NUM_SCROLLS):
+        take_screenshot_at_step(i+2)
+    
+    # Verify that we took 6 screenshots
+    assert mock_screenshot.call_count == 6
+    assert mock_image.save.call_count == 6 
+
+
+def test_wait_until_stable_returns_once_frames_match(mocker):
+    """Test that wait_until_stable stops polling as soon as two frames match."""
+    moving = np.zeros((400, 200, 3), dtype=np.uint8)
+    settled = np.full((400, 200, 3), 255, dtype=np.uint8)
+    frames = [moving, settled, settled, settled]
+    
+    mock_grab = mocker.patch('tinder_bot.scroll.grab_region', side_effect=frames)
+    assert wait_until_stable((0, 0, 200, 400), timeout=5.0) is True
+    
+    # moving -> settled differs, settled -> settled matches
+    assert mock_grab.call_count == 3
+
+
+def test_wait_until_stable_times_out(mocker):
+    """Test that wait_until_stable gives up when content keeps changing."""
+    rng = np.random.default_rng(0)
+    
+    def changing_frame(bbox):
+        return rng.integers(0, 256, size=(400, 200, 3), dtype=np.uint8)
+    
+    mocker.patch('tinder_bot.scroll.grab_region', side_effect=changing_frame)
+    assert wait_until_stable((0, 0, 200, 400), timeout=0.05, poll=0.01) is False
+
+
+def test_capture_frame_converts_bgra_to_rgb(mocker):
+    """Test that capture_frame and grab_region agree on the RGB pixels of an mss BGRA grab."""
+    bgra = np.random.default_rng(0).integers(0, 256, size=(4, 3, 4), dtype=np.uint8)
+    raw = MagicMock(size=(3, 4), bgra=bgra.tobytes())
+    raw.__array__ = lambda *args, **kwargs: bgra
+    mocker.patch('tinder_bot.capture._get_grabber', return_value=MagicMock(**{"grab.return_value": raw}))
+    mocker.patch('tinder_bot.capture.dxcam', None)
+    
+    frame = capture_frame((0, 0, 3, 4))
+    
+    assert frame.mode == "RGB"
+    assert np.array_equal(np.asarray(frame), bgra[:, :, 2::-1])
+    assert np.array_equal(grab_region((0, 0, 3, 4)), bgra[:, :, 2::-1])
+
+
+def test_capture_screen_grabs_primary_monitor(mocker):
+    """Test that capture_screen decodes the primary monitor's BGRA grab to RGB."""
+    bgra = np.random.default_rng(0).integers(0, 256, size=(4, 3, 4), dtype=np.uint8)
+    grabber = MagicMock(monitors=[{}, {"left": 10, "top": 20, "width": 3, "height": 4}])
+    grabber.grab.return_value = MagicMock(size=(3, 4), bgra=bgra.tobytes())
+    mocker.patch('tinder_bot.capture._get_grabber', return_value=grabber)
+    mocker.patch('tinder_bot.capture.dxcam', None)
+    
+    screen = capture_screen()
+    
+    grabber.grab.assert_called_once_with({"left": 10, "top": 20, "width": 3, "height": 4})
+    assert np.array_equal(np.asarray(screen), bgra[:, :, 2::-1])
+
+
+def test_frame_grabber_reuses_region(mocker):
+    """Test that a bound frame grabber requests the same mss region on every grab."""
+    bgra = np.random.default_rng(0).integers(0, 256, size=(4, 3, 4), dtype=np.uint8)
+    grabber = MagicMock()
+    grabber.grab.return_value = MagicMock(size=(3, 4), bgra=bgra.tobytes())
+    mocker.patch('tinder_bot.capture._get_grabber', return_value=grabber)
+    mocker.patch('tinder_bot.capture.dxcam', None)
+    
+    grab = frame_grabber((10, 20, 3, 4))
+    frames = [grab(), grab()]
+    
+    assert grabber.grab.call_args_list == [call({"left": 10, "top": 20, "width": 3, "height": 4})] * 2
+    assert all(np.array_equal(np.asarray(frame), bgra[:, :, 2::-1]) for frame in frames)
+
+
+def test_save_screenshot_round_trips_pixels(tmp_path):
+    """Test that save_screenshot writes a lossless PNG of the captured frame."""
+    frame = Image.fromarray(np.random.default_rng(0).integers(0, 256, size=(8, 6, 3), dtype=np.uint8))
+    
+    path = save_screenshot(frame, 1, "20240101_000000", output_dir=str(tmp_path))
+    
+    assert path.endswith(".png")
+    with Image.open(path) as saved:
+        assert np.array_equal(np.asarray(saved), np.asarray(frame))
+
+
+def test_screenshot_paths_match_save_screenshot_names(tmp_path):
+    """Test that precomputed paths are the ones save_screenshot would pick itself."""
+    frame = Image.new('RGB', (6, 8), color='blue')
+    
+    paths = screenshot_paths("20240101_000000", 3, output_dir=str(tmp_path))
+    
+    assert len(paths) == 3
+    assert save_screenshot(frame, 2, "20240101_000000", output_dir=str(tmp_path)) == paths[1]
+    assert save_screenshot(frame, 3, "20240101_000000", path=paths[2]) == paths[2]
@@ -1,7 +1,7 @@
 """Tests for window detection module."""
 
 import pytest
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import MagicMock, call
 import numpy as np
 import cv2
 from PIL import Image
@@ -26,7 +26,7 @@ class MockWindow:
 #     ...
 
 
-def test_save_detected_window():
+def test_save_detected_window(mocker, tmp_path):
     """Test saving the detected window with 10% left-side expansion for manual verification."""
     # Create a mock screenshot of size 1920x1080
     mock_screenshot = Image.new('RGB', (1920, 1080), color='black')
@@ -41,30 +41,42 @@ def test_save_detected_window():
     expected_right = x + width  # Should be 1140
     expected_crop_args = (expected_left, y, expected_right, y + height)
     
-    # Create a temporary directory for testing
-    test_dir = "./test_screenshots"
+    # Per-test directory, so parallel workers never share a path
+    test_dir = str(tmp_path)
     
     # Patch the SCREENSHOT_DIR to use our test directory
-    with patch('os.getenv', return_value=test_dir):
-        with patch('pathlib.Path.mkdir'):  # Mock directory creation
-            # Mock the crop method to check its arguments
-            with patch.object(mock_screenshot, 'crop', return_value=mock_screenshot) as mock_crop:
-                with patch.object(mock_screenshot, 'save'):  # Mock save operation
-                    # Call the function
-                    filepath = save_detected_window(mock_screenshot, bbox)
-                    
-                    # Check that the crop was called with the expected arguments
-                    mock_crop.assert_called_once()
-                    crop_args = mock_crop.call_args[0][0]
-                    assert crop_args == expected_crop_args
-                    
-                    # Check that the filepath is correct
-                    assert filepath.startswith(test_dir)
-                    assert "iphone_window_" in filepath
-                    assert filepath.endswith(".png")
+    mocker.patch('tinder_bot.window.SCREENSHOT_DIR', test_dir)
+    # Mock the crop method to check its arguments
+    mock_crop = mocker.patch.object(mock_screenshot, 'crop', return_value=mock_screenshot)
+    mocker.patch.object(mock_screenshot, 'save')  # Mock save operation
+    # Call the function
+    filepath = save_detected_window(mock_screenshot, bbox)
+    
+    # Check that the crop was called with the expected arguments
+    mock_crop.assert_called_once()
+    crop_args = mock_crop.call_args[0][0]
+    assert crop_args == expected_crop_args
+    
+    # Check that the filepath is correct
+    assert filepath.startswith(test_dir)
+    assert "iphone_window_" in filepath
+    assert filepath.endswith(".png")
 
 
-def test_find_iphone_window_with_border_detection():
+def test_save_detected_window_grabs_only_the_region(mocker, tmp_path):
+    """Test that without a screenshot only the expanded window region is grabbed."""
+    x, y, width, height = 700, 200, 400, 800
+    mocker.patch('tinder_bot.window.SCREENSHOT_DIR', str(tmp_path))
+    mock_grab = mocker.patch('tinder_bot.window.capture_frame', return_value=Image.new('RGB', (440, 800)))
+    
+    filepath = save_detected_window(None, (x, y, width, height))
+    
+    # 10% wider on the left: 660 .. 1100
+    mock_grab.assert_called_once_with((x - 40, y, width + 40, height))
+    assert os.path.exists(filepath)
+
+
+def test_find_iphone_window_with_border_detection(mocker):
     """Test finding iPhone window using white border detection."""
     # Create a mock screenshot with iPhone proportions
     mock_screenshot = Image.new('RGB', (1920, 1080), color='black')
@@ -106,37 +118,37 @@ def test_find_iphone_window_with_border_detection():
     ])
     
     # Mock functions for first detection approach
-    with patch('pyautogui.screenshot', return_value=Image.fromarray(mock_np)):
-        with patch('cv2.cvtColor', side_effect=[np.array(mock_np), mock_gray]):
-            with patch('cv2.threshold', side_effect=[(None, mock_thresh), (None, mock_thresh)]):
-                with patch('cv2.findContours', side_effect=[([mock_contour], None), ([], None)]):
-                    with patch('cv2.arcLength', return_value=2*(iphone_width + iphone_height)):
-                        with patch('cv2.approxPolyDP', return_value=np.array([
-                            [[iphone_x, iphone_y]],
-                            [[iphone_x+iphone_width, iphone_y]],
-                            [[iphone_x+iphone_width, iphone_y+iphone_height]],
-                            [[iphone_x, iphone_y+iphone_height]]
-                        ])):
-                            with patch('cv2.boundingRect', return_value=(iphone_x, iphone_y, iphone_width, iphone_height)):
-                                with patch('numpy.mean', return_value=250):  # High value to simulate white border
-                                    with patch('tinder_bot.window.save_detected_window'):
-                                        with patch('cv2.imwrite'):  # Mock saving debug image
-                                            # Call the function
-                                            result = find_iphone_window()
-                                            
-                                            # Check that result is a tuple with 4 elements (x, y, width, height)
-                                            assert isinstance(result, tuple)
-                                            assert len(result) == 4
-                                            
-                                            # We should get coordinates matching our mock iPhone
-                                            x, y, w, h = result
-                                            assert x == iphone_x
-                                            assert y == iphone_y
-                                            assert w == iphone_width
-                                            assert h == iphone_height
+    mocker.patch('pyautogui.screenshot', return_value=Image.fromarray(mock_np))
+    mocker.patch('cv2.cvtColor', return_value=mock_gray)
+    mocker.patch('cv2.threshold', side_effect=[(None, mock_thresh), (None, mock_thresh)])
+    mocker.patch('cv2.findContours', side_effect=[([mock_contour], None), ([], None)])
+    mocker.patch('cv2.arcLength', return_value=2*(iphone_width + iphone_height))
+    mocker.patch('cv2.approxPolyDP', return_value=np.array([
+[[iphone_x, iphone_y]],
+[[iphone_x+iphone_width, iphone_y]],
+[[iphone_x+iphone_width, iphone_y+iphone_height]],
+[[iphone_x, iphone_y+iphone_height]]
+]))
+    mocker.patch('cv2.boundingRect', return_value=(iphone_x, iphone_y, iphone_width, iphone_height))
+    mocker.patch('numpy.mean', return_value=250)  # High value to simulate white border
+    mocker.patch('tinder_bot.window.save_detected_window')
+    mocker.patch('cv2.imwrite')  # Mock saving debug image
+    # Call the function
+    result = find_iphone_window()
+    
+    # Check that result is a tuple with 4 elements (x, y, width, height)
+    assert isinstance(result, tuple)
+    assert len(result) == 4
+    
+    # We should get coordinates matching our mock iPhone
+    x, y, w, h = result
+    assert x == iphone_x
+    assert y == iphone_y
+    assert w == iphone_width
+    assert h == iphone_height
 
 
-def test_find_iphone_window_alternative_detection():
+def test_find_iphone_window_alternative_detection(mocker, zero_gray):
     """Test finding iPhone window using the alternative detection method."""
     # Create a mock screenshot
     mock_screenshot = Image.new('RGB', (1920, 1080), color='black')
@@ -148,10 +160,7 @@ def test_find_iphone_window_alternative_detection():
     iphone_y = (1080 - iphone_height) // 2
     
     # Mock numpy arrays
-    mock_np = np.zeros((1080, 1920, 3), dtype=np.uint8)
-    mock_gray = np.zeros((1080, 1920), dtype=np.uint8)
-    mock_thresh1 = np.zeros((1080, 1920), dtype=np.uint8)
-    mock_thresh2 = np.zeros((1080, 1920), dtype=np.uint8)
+    mock_gray = mock_thresh1 = mock_thresh2 = zero_gray
     
     # Create a mock contour that will be used for the second detection attempt
     mock_contour2 = np.array([
@@ -162,62 +171,59 @@ def test_find_iphone_window_alternative_detection():
     ])
     
     # Mock functions 
-    with patch('pyautogui.screenshot', return_value=mock_screenshot):
-        with patch('cv2.cvtColor', side_effect=[mock_np, mock_gray]):
-            with patch('cv2.threshold', side_effect=[(None, mock_thresh1), (None, mock_thresh2)]):
-                # First detection fails (empty contours)
-                # Second detection succeeds
-                with patch('cv2.findContours', side_effect=[([], None), ([mock_contour2], None)]):
-                    with patch('cv2.contourArea', return_value=iphone_width*iphone_height):
-                        with patch('cv2.boundingRect', return_value=(iphone_x, iphone_y, iphone_width, iphone_height)):
-                            with patch('tinder_bot.window.save_detected_window'):
-                                with patch('cv2.imwrite'):  # Mock saving debug image
-                                    # Call the function
-                                    result = find_iphone_window()
-                                    
-                                    # Check that result is a tuple with 4 elements (x, y, width, height)
-                                    assert isinstance(result, tuple)
-                                    assert len(result) == 4
-                                    
-                                    # We should get coordinates matching our mock iPhone
-                                    x, y, w, h = result
-                                    assert x == iphone_x
-                                    assert y == iphone_y
-                                    assert w == iphone_width
-                                    assert h == iphone_height
+    mocker.patch('pyautogui.screenshot', return_value=mock_screenshot)
+    mocker.patch('cv2.cvtColor', return_value=mock_gray)
+    mocker.patch('cv2.threshold', side_effect=[(None, mock_thresh1), (None, mock_thresh2)])
+    # First detection fails (empty contours)
+    # Second detection succeeds
+    mocker.patch('cv2.findContours', side_effect=[([], None), ([mock_contour2], None)])
+    mocker.patch('cv2.contourArea', return_value=iphone_width*iphone_height)
+    mocker.patch('cv2.boundingRect', return_value=(iphone_x, iphone_y, iphone_width, iphone_height))
+    mocker.patch('tinder_bot.window.save_detected_window')
+    mocker.patch('cv2.imwrite')  # Mock saving debug image
+    # Call the function
+    result = find_iphone_window()
+    
+    # Check that result is a tuple with 4 elements (x, y, width, height)
+    assert isinstance(result, tuple)
+    assert len(result) == 4
+    
+    # We should get coordinates matching our mock iPhone
+    x, y, w, h = result
+    assert x == iphone_x
+    assert y == iphone_y
+    assert w == iphone_width
+    assert h == iphone_height
 
 
-def test_find_iphone_window_fallback():
+def test_find_iphone_window_fallback(mocker, zero_gray):
     """Test fallback to estimated region when detection fails."""
     # Mock screenshot size
     mock_size = (1920, 1080)
     mock_screenshot = MagicMock(size=mock_size)
     
     # Create mock arrays
-    mock_np = np.zeros((1080, 1920, 3), dtype=np.uint8)
-    mock_gray = np.zeros((1080, 1920), dtype=np.uint8)
-    mock_thresh1 = np.zeros((1080, 1920), dtype=np.uint8)
-    mock_thresh2 = np.zeros((1080, 1920), dtype=np.uint8)
+    mock_gray = mock_thresh1 = mock_thresh2 = zero_gray
     
     # Mock all detection methods to fail
-    with patch('pyautogui.screenshot', return_value=mock_screenshot):
-        with patch('cv2.cvtColor', side_effect=[mock_np, mock_gray]):
-            with patch('cv2.threshold', side_effect=[(None, mock_thresh1), (None, mock_thresh2)]):
-                with patch('cv2.findContours', side_effect=[([], None), ([], None)]):  # Both detection attempts fail
-                    with patch('tinder_bot.window.save_detected_window'):
-                        with patch('cv2.imwrite'):  # Mock saving debug image
-                            # Call the function
-                            result = find_iphone_window()
-                            
-                            # We expect an estimated region in the center of the screen
-                            x, y, width, height = result
-                            
-                            # Check that width is about 1/4 of screen width
-                            assert width == mock_size[0] // 4
-                            
-                            # Check that height maintains iPhone aspect ratio
-                            assert abs(width / height - 9 / 19.5) < 0.1
-                            
-                            # Check that it's centered
-                            assert x == (mock_size[0] - width) // 2
-                            assert y == (mock_size[1] - height) // 2 
\ No newline at end of file
+    mocker.patch('pyautogui.screenshot', return_value=mock_screenshot)
+    mocker.patch('cv2.cvtColor', return_value=mock_gray)
+    mocker.patch('cv2.threshold', side_effect=[(None, mock_thresh1), (None, mock_thresh2)])
+    mocker.patch('cv2.findContours', side_effect=[([], None), ([], None)])  # Both detection attempts fail
+    mocker.patch('tinder_bot.window.save_detected_window')
+    mocker.patch('cv2.imwrite')  # Mock saving debug image
+    # Call the function
+    result = find_iphone_window()
+    
+    # We expect an estimated region in the center of the screen
+    x, y, width, height = result
+    
+    # Check that width is about 1/4 of screen width
+    assert width == mock_size[0] // 4
+    
+    # Check that height maintains iPhone aspect ratio
+    assert abs(width / height - 9 / 19.5) < 0.1
+    
+    # Check that it's centered
+    assert x == (mock_size[0] - width) // 2
+    assert y == (mock_size[1] - height) // 2 
\ No newline at end of file
@@ -1,64 +1,136 @@
 """Module for checking if a profile view is an advertisement."""
 
+import json
 import logging
-from rich.console import Console
 import os
+from collections import OrderedDict
 from pathlib import Path
-import time
-from datetime import datetime
+from typing import Optional
+import cv2
+import numpy as np
+from PIL import Image
+from rich.console import Console
 
 # Import necessary functions
 from tinder_bot.gpt import gpt_check_ads 
 from tinder_bot.scroll import get_hardcoded_window # To get window coords
-from tinder_bot.capture import take_high_quality_screenshot # To take the screenshot
+from tinder_bot.capture import capture_frame # To grab the window in memory
 
 logger = logging.getLogger(__name__)
 console = Console()
 
+# Ad cards recur across sessions, so known ads are remembered by perceptual hash
+AD_HASH_CACHE_PATH = Path(os.getenv("TINDER_BOT_CACHE_DIR", Path.home() / ".cache" / "tinder_bot")) / "ad_hashes.json"
+AD_HASH_CACHE_SIZE = 512  # Most recently seen ad hashes kept on disk
+AD_HASH_MAX_DISTANCE = 2  # Hamming distance (in bits) still treated as the same screen
 
-def check_for_ads(iteration_index: int, debug: bool) -> str:
+_ad_hash_cache: Optional["OrderedDict[int, None]"] = None # Loaded lazily from AD_HASH_CACHE_PATH
+
+
+def _phash(frame: Image.Image) -> int:
     """
-    Takes a screenshot, calls GPT to check if it's an ad, cleans up, and returns the result.
+    Computes a 64-bit perceptual hash of a frame.
+
+    Same scheme as imagehash.phash: the 8x8 low-frequency corner of the DCT
+    of a 32x32 grayscale downsample, thresholded at its median.
 
     Args:
-        iteration_index: The current iteration number (used for temporary filename).
-        debug: Boolean indicating if debug mode is active.
+        frame: The window frame to hash.
 
     Returns:
-        str: "YES" if the AI determines it's an ad, "NO" otherwise.
-             Returns "ERROR" if the API call or screenshot fails.
+        int: The hash, one bit per DCT coefficient.
     """
-    screenshot_path = None
+    small = np.asarray(frame.convert("L").resize((32, 32), Image.Resampling.LANCZOS), dtype=np.float32)
+    low = cv2.dct(small)[:8, :8]
+    bits = (low > np.median(low)).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def _load_ad_hash_cache() -> "OrderedDict[int, None]":
+    """Returns the in-memory set of known ad hashes, reading it from disk on first use."""
+    global _ad_hash_cache
+    if _ad_hash_cache is None:
+        _ad_hash_cache = OrderedDict()
+        try:
+            entries = json.loads(AD_HASH_CACHE_PATH.read_text())
+            _ad_hash_cache.update((int(h, 16), None) for h in entries)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Could not read ad hash cache %s: %s", AD_HASH_CACHE_PATH, e)
+    return _ad_hash_cache
+
+
+def _is_known_ad(frame_hash: int) -> bool:
+    """
+    Checks whether a hash is within AD_HASH_MAX_DISTANCE of a known ad.
+
+    Args:
+        frame_hash: Perceptual hash from _phash.
+
+    Returns:
+        bool: True if the frame matches a remembered ad.
+    """
+    cache = _load_ad_hash_cache()
+    best = min(cache, key=lambda h: (h ^ frame_hash).bit_count(), default=None)
+    if best is None or (best ^ frame_hash).bit_count() > AD_HASH_MAX_DISTANCE:
+        return False
+    cache.move_to_end(best)
+    return True
+
+
+def _remember_ad(frame_hash: int) -> None:
+    """
+    Remembers an ad's hash, evicting the least recently used beyond AD_HASH_CACHE_SIZE.
+
+    Only ads are stored: ordinary profiles are new every time, and caching
+    them would push real ads out and let look-alike frames skip the check.
+
+    Args:
+        frame_hash: Perceptual hash from _phash.
+    """
+    cache = _load_ad_hash_cache()
+    cache[frame_hash] = None
+    cache.move_to_end(frame_hash)
+    while len(cache) > AD_HASH_CACHE_SIZE:
+        cache.popitem(last=False)
     try:
-        # 1. Get window dimensions
-        bbox = get_hardcoded_window()
-        if not bbox:
-            logger.error("Failed to get window dimensions for ad check.")
-            return "ERROR"
-        
-        # 2. Define timestamp (needed for the function call)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S") # Use timestamp for uniqueness
-        screenshot_dir = Path("./screenshots")
-        screenshot_dir.mkdir(exist_ok=True) # Ensure directory exists
-        # The function will construct the path, so we don't define screenshot_path here yet.
-
-        # 3. Take a single screenshot using the correct arguments
-        logger.info(f"Taking temporary screenshot for ad check (iteration {iteration_index})")
-        # Pass bbox, index, timestamp, and the target directory
-        screenshot_path_str = take_high_quality_screenshot(bbox, iteration_index, timestamp, output_dir=str(screenshot_dir))
-        screenshot_path = Path(screenshot_path_str) # Convert returned string path to Path object
-        time.sleep(0.5) # Brief pause after screenshot
-
-        # 4. Call GPT for ad check
-        logger.info(f"Checking image for ads: {screenshot_path}")
-        decision = gpt_check_ads(str(screenshot_path))
-        
-        # 5. Process decision
+        AD_HASH_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so an interrupted run never leaves a partial file
+        tmp_path = AD_HASH_CACHE_PATH.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps([f"{h:016x}" for h in cache]))
+        os.replace(tmp_path, AD_HASH_CACHE_PATH)
+    except OSError as e:
+        logger.warning("Could not write ad hash cache %s: %s", AD_HASH_CACHE_PATH, e)
+
+
+def _classify_frame(frame: Image.Image) -> str:
+    """
+    Calls GPT on a grabbed frame and maps its answer to the ad verdict.
+
+    Frames that look like a known ad are answered "YES" without a GPT
+    call. Every failure is turned into "ERROR" rather
+    than raised.
+
+    Args:
+        frame: The window frame to classify.
+
+    Returns:
+        str: "YES", "NO" or "ERROR", as for check_for_ads.
+    """
+    try:
+        frame_hash = _phash(frame)
+        if _is_known_ad(frame_hash):
+            logger.info("Ad check cache hit for hash %016x", frame_hash)
+            decision = "YES"
+        else:
+            logger.info("Checking captured frame for ads")
+            decision = gpt_check_ads(frame)
+            if decision == "YES":
+                _remember_ad(frame_hash)
+
         if decision == "YES":
-            # Only print this if CLI isn't already printing the action
-            # Since CLI prints "Ad detected. Performing PASS action.", we can remove this one
-            # if debug: 
-            #    console.print("[bold yellow]Ad detected.[/bold yellow]")
+            # CLI prints "Ad detected. Performing PASS action.", so only log here
             logger.info("AI determined the image is an advertisement.")
             return "YES"
         elif decision == "NO":
@@ -66,19 +138,46 @@ def check_for_ads(iteration_index: int, debug: bool) -> str:
             logger.info("AI determined the image is not an advertisement.")
             return "NO"
         else: # Handle API errors or unexpected responses
-             logger.error(f"Ad check failed with status: {decision}")
+             logger.error("Ad check failed with status: %s", decision)
              console.print(f"[bold red]Error:[/bold red] Failed to check for ads (Status: {decision}). Assuming not an ad.")
              return "ERROR" # Indicate an error occurred
 
     except Exception as e:
-        logger.error(f"Unexpected error during ad check process: {e}", exc_info=True)
-        console.print(f"[bold red]Error:[/bold red] Unexpected error during ad check. Assuming not an ad.")
+        logger.error("Unexpected error during ad check process: %s", e, exc_info=True)
+        console.print("[bold red]Error:[/bold red] Unexpected error during ad check. Assuming not an ad.")
         return "ERROR"
-    finally:
-        # 6. Clean up screenshot regardless of outcome
-        if screenshot_path and screenshot_path.exists():
-            try:
-                os.remove(screenshot_path)
-                logger.debug(f"Deleted temporary ad check screenshot: {screenshot_path}")
-            except OSError as e:
-                logger.warning(f"Could not delete temporary ad check screenshot {screenshot_path}: {e}") 
\ No newline at end of file
+
+
+def check_for_ads(iteration_index: int, debug: bool) -> str:
+    """
+    Grabs the window in memory, calls GPT to check if it's an ad, and returns the result.
+
+    The frame goes straight to the vision API as an in-memory JPEG, so no
+    temporary screenshot is written, re-read or deleted.
+
+    Args:
+        iteration_index: The current iteration number (used for logging).
+        debug: Boolean indicating if debug mode is active.
+
+    Returns:
+        str: "YES" if the AI determines it's an ad, "NO" otherwise.
+             Returns "ERROR" if the API call or screenshot fails.
+    """
+    try:
+        # 1. Get window dimensions
+        bbox = get_hardcoded_window()
+        if not bbox:
+            logger.error("Failed to get window dimensions for ad check.")
+            return "ERROR"
+
+        # 2. Grab a single frame in memory
+        logger.info("Capturing frame for ad check (iteration %s)", iteration_index)
+        frame = capture_frame(bbox)
+
+    except Exception as e:
+        logger.error("Unexpected error during ad check process: %s", e, exc_info=True)
+        console.print("[bold red]Error:[/bold red] Unexpected error during ad check. Assuming not an ad.")
+        return "ERROR"
+
+    # 3. Call GPT for ad check (unless the frame is a known ad)
+    return _classify_frame(frame)
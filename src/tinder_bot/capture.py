@@ -1,11 +1,16 @@
 """Screenshot capture module for Tinder Bot using direct region capture."""
 
-from typing import Tuple, Optional
-import pyautogui
+from typing import Callable, List, Tuple, Optional, Union
+import functools
+import mss
+import mss.tools
 import numpy as np
 from PIL import Image
 import os
+import sys
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -16,13 +21,199 @@ SCREENSHOT_DIR = os.getenv("SCREENSHOT_DIR", "./screenshots")
 
 # Screenshot quality settings
 SCREENSHOT_FORMAT = "png"  # Use lossless PNG format
-SCREENSHOT_DPI = 600  # High DPI for better quality
+SCREENSHOT_COMPRESS_LEVEL = 1  # zlib level for PNG saves; still lossless, much faster than the default 6
+
+# On Windows, DXcam reads frames through the Desktop Duplication API, which is
+# faster than mss's GDI BitBlt; every other platform uses mss
+if sys.platform == "win32":
+    try:
+        import dxcam
+    except ImportError:
+        dxcam = None
+else:
+    dxcam = None
+
+# mss grabbers are not thread-safe, so each thread keeps its own persistent instance
+_grabber_local = threading.local()
+
+
+def _get_grabber() -> "mss.base.MSSBase":
+    """Return this thread's persistent mss grabber, creating it on first use."""
+    sct = getattr(_grabber_local, "sct", None)
+    if sct is None:
+        sct = mss.mss()
+        _grabber_local.sct = sct
+    return sct
+
+
+@functools.lru_cache(maxsize=None)
+def _get_camera() -> "dxcam.DXCamera":
+    """Return the shared DXcam camera for the primary output, creating it on first use."""
+    return dxcam.create(output_color="RGB")
+
+
+def _region_grabber(
+    bbox: Tuple[int, int, int, int]
+) -> Callable[[], Union[np.ndarray, "mss.screenshot.ScreenShot"]]:
+    """
+    Bind the DXcam-then-mss capture to one screen region.
+    
+    The region is unpacked into DXcam's and mss's formats once, rather than
+    on every grab of a profile's screenshots.
+    
+    Args:
+        bbox: (x, y, width, height) of the region to capture
+    
+    Returns:
+        A no-argument function returning DXcam's RGB pixel array, or mss's raw
+        BGRA shot when DXcam is unavailable or has no new frame (it returns
+        None when the screen has not changed since the last grab)
+    """
+    x, y, width, height = bbox
+    region = {"left": x, "top": y, "width": width, "height": height}
+    dxcam_region = (x, y, x + width, y + height)
+    
+    def grab() -> Union[np.ndarray, "mss.screenshot.ScreenShot"]:
+        if dxcam is not None:
+            frame = _get_camera().grab(region=dxcam_region)
+            if frame is not None:
+                return frame
+        return _get_grabber().grab(region)
+    
+    return grab
+
+
+def _to_image(shot: Union[np.ndarray, "mss.screenshot.ScreenShot"]) -> Image.Image:
+    """Turn a _region_grabber result into an RGB PIL image."""
+    if isinstance(shot, np.ndarray):
+        # DXcam already hands back RGB pixels
+        return Image.fromarray(shot)
+    # Let PIL's raw decoder convert mss's BGRA to RGB in one pass over the buffer
+    return Image.frombuffer("RGB", shot.size, shot.bgra, "raw", "BGRX", 0, 1)
+
+
+def grab_region(bbox: Tuple[int, int, int, int]) -> np.ndarray:
+    """
+    Capture a screen region in-process (DXcam on Windows, else the persistent mss grabber).
+    
+    Args:
+        bbox: (x, y, width, height) of the region to capture
+        
+    Returns:
+        RGB pixel array of shape (height, width, 3)
+    """
+    shot = _region_grabber(bbox)()
+    if isinstance(shot, np.ndarray):
+        return shot
+    # mss returns BGRA; reverse the colour channels to get an RGB view
+    return np.asarray(shot)[:, :, 2::-1]
+
+
+def capture_frame(bbox: Tuple[int, int, int, int]) -> Image.Image:
+    """
+    Capture the iPhone window area as an in-memory image.
+    
+    Args:
+        bbox: (x, y, width, height) of the iPhone window
+    
+    Returns:
+        RGB PIL image of the window
+    """
+    return _to_image(_region_grabber(bbox)())
+
+def frame_grabber(bbox: Tuple[int, int, int, int]) -> Callable[[], Image.Image]:
+    """
+    Bind capture_frame to one region, for grabbing it repeatedly.
+    
+    Args:
+        bbox: (x, y, width, height) of the iPhone window
+    
+    Returns:
+        A no-argument function returning an RGB PIL image of the window
+    """
+    grab = _region_grabber(bbox)
+    return lambda: _to_image(grab())
+
+def capture_screen() -> Image.Image:
+    """
+    Capture the primary monitor as an in-memory image.
+    
+    Returns:
+        RGB PIL image of the whole screen
+    """
+    monitor = _get_grabber().monitors[1]
+    return capture_frame((monitor["left"], monitor["top"], monitor["width"], monitor["height"]))
+
+@functools.lru_cache(maxsize=None)
+def _screenshot_dir(directory: str) -> Path:
+    """Return a screenshot directory as a Path, creating it on first use only."""
+    screenshots_dir = Path(directory)
+    screenshots_dir.mkdir(exist_ok=True)
+    return screenshots_dir
+
+def _screenshot_name(index: int, timestamp: str) -> str:
+    """File name of one profile screenshot."""
+    return f"profile_screenshot_{index}_{timestamp}.{SCREENSHOT_FORMAT}"
+
+def screenshot_paths(timestamp: str, count: int, output_dir: Optional[str] = None) -> List[str]:
+    """
+    Build the file paths for a profile's screenshots up front.
+    
+    Args:
+        timestamp: Timestamp string shared by the profile's screenshots
+        count: Number of screenshots (indices 1..count)
+        output_dir: Optional custom output directory (defaults to SCREENSHOT_DIR)
+    
+    Returns:
+        Paths in index order, as save_screenshot would name them
+    """
+    # Use custom output directory if provided, otherwise use default
+    screenshots_dir = _screenshot_dir(output_dir if output_dir else SCREENSHOT_DIR)
+    return [
+        str(screenshots_dir / _screenshot_name(index, timestamp))
+        for index in range(1, count + 1)
+    ]
+
+def save_screenshot(
+    screenshot: Image.Image,
+    index: int,
+    timestamp: str,
+    output_dir: Optional[str] = None,
+    path: Optional[str] = None
+) -> str:
+    """
+    Save a captured frame as a high-quality screenshot.
+    
+    Args:
+        screenshot: Image returned by capture_frame
+        index: Screenshot index number for filename (1-6)
+        timestamp: Timestamp string for the filename
+        output_dir: Optional custom output directory (defaults to SCREENSHOT_DIR)
+        path: Optional precomputed path from screenshot_paths; skips building
+              the filename from index/timestamp/output_dir
+    
+    Returns:
+        Path to the saved screenshot
+    """
+    if path is None:
+        # Use custom output directory if provided, otherwise use default
+        screenshots_dir = _screenshot_dir(output_dir if output_dir else SCREENSHOT_DIR)
+        path = str(screenshots_dir / _screenshot_name(index, timestamp))
+    
+    # mss's writer skips PIL's per-row filter search, so it encodes several times faster
+    if screenshot.mode != "RGB":
+        screenshot = screenshot.convert("RGB")
+    mss.tools.to_png(screenshot.tobytes(), screenshot.size, level=SCREENSHOT_COMPRESS_LEVEL, output=path)
+    
+    logger.info("Saved high-quality screenshot #%d to %s", index, path)
+    return path
 
 def take_high_quality_screenshot(
     bbox: Tuple[int, int, int, int], 
     index: int, 
     timestamp: str,
-    output_dir: Optional[str] = None
+    output_dir: Optional[str] = None,
+    path: Optional[str] = None
 ) -> str:
     """
     Take a high-quality screenshot of the iPhone window area using direct region capture.
@@ -32,44 +223,38 @@ def take_high_quality_screenshot(
         index: Screenshot index number for filename (1-6)
         timestamp: Timestamp string for the filename
         output_dir: Optional custom output directory (defaults to SCREENSHOT_DIR)
+        path: Optional precomputed path from screenshot_paths
     
     Returns:
         Path to the saved screenshot
     """
     x, y, width, height = bbox
+    # Lazy %-formatting: this runs for every screenshot, so skip the string build when INFO is off
+    logger.info("Taking high-quality screenshot #%d at position (%d, %d) with size %dx%d", index, x, y, width, height)
     
-    # Use custom output directory if provided, otherwise use default
-    screenshots_dir = Path(output_dir if output_dir else SCREENSHOT_DIR)
-    screenshots_dir.mkdir(exist_ok=True)
-    
-    # Create the filename
-    filename = screenshots_dir / f"profile_screenshot_{index}_{timestamp}.{SCREENSHOT_FORMAT}"
-    
-    logger.info(f"Taking high-quality screenshot #{index} at position ({x}, {y}) with size {width}x{height}")
-    
-    # Use PyAutoGUI for direct region capture
-    screenshot = pyautogui.screenshot(region=(x, y, width, height))
-    
-    # Convert to numpy array for processing
-    img_array = np.array(screenshot)
-    
-    # Convert back to PIL Image with higher quality settings
-    high_quality_img = Image.fromarray(img_array)
-    
-    # Save with high DPI and quality settings
-    high_quality_img.save(
-        filename, 
-        format=SCREENSHOT_FORMAT,
-        dpi=(SCREENSHOT_DPI, SCREENSHOT_DPI),
-        quality=100  # Maximum quality (only applies to JPEG)
-    )
-    
-    logger.info(f"Saved high-quality screenshot #{index} to {filename}")
-    return str(filename)
+    # Grab the region straight into memory with the persistent mss grabber
+    return save_screenshot(capture_frame(bbox), index, timestamp, output_dir, path)
+
+def _safe_unlink(path: str) -> bool:
+    """Delete one screenshot file, logging instead of raising on failure."""
+    try:
+        os.remove(path)
+        logger.info("Deleted screenshot: %s", path)
+        return True
+    except FileNotFoundError:
+        logger.debug("Screenshot already gone: %s", path)
+        return False
+    except Exception as e:
+        logger.warning("Failed to delete %s: %s", path, e)
+        return False
 
 def delete_screenshots(screenshot_paths):
     """
-    Delete screenshot files after they've been stitched together.
+    Delete screenshot files, e.g. after they've been stitched together or
+    when clearing old screenshots at startup.
+    
+    Unlinks run on a small thread pool, since each one blocks on filesystem
+    metadata without holding the GIL.
     
     Args:
         screenshot_paths: List of paths to screenshot files to delete
@@ -77,14 +262,12 @@ def delete_screenshots(screenshot_paths):
     Returns:
         int: Number of files deleted
     """
-    count = 0
-    for path in screenshot_paths:
-        try:
-            os.remove(path)
-            logger.info(f"Deleted screenshot: {path}")
-            count += 1
-        except Exception as e:
-            logger.warning(f"Failed to delete {path}: {e}")
-    
-    logger.info(f"Deleted {count} screenshots after stitching")
-    return count 
\ No newline at end of file
+    paths = list(screenshot_paths)
+    if not paths:
+        count = 0
+    else:
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+            count = sum(executor.map(_safe_unlink, paths))
+    
+    logger.info("Deleted %d screenshots", count)
+    return count
@@ -4,32 +4,143 @@ import logging
 import os
 from pathlib import Path
 import time
-import pyautogui
 import random
-from typing import Tuple, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, Tuple, List, Optional
 from rich.console import Console
 from datetime import datetime
+from PIL import Image
 
 # --- Import project modules ---
-from tinder_bot.capture import take_high_quality_screenshot
+from tinder_bot.capture import frame_grabber, save_screenshot, screenshot_paths as build_screenshot_paths
 from tinder_bot.scroll import (
-    get_safe_coordinates,
-    FIRST_SCROLL_AMOUNT, SUBSEQUENT_SCROLL_AMOUNT, SCROLL_DELAY,
-    UP_SCROLL_AMOUNT, STEPS_PER_SCROLL, perform_stepped_scroll, NEXT_PHOTO_POS
+    get_safe_coordinates, click_at,
+    FIRST_SCROLL_AMOUNT, SUBSEQUENT_SCROLL_AMOUNT,
+    UP_SCROLL_AMOUNT, STEPS_PER_SCROLL, perform_stepped_scroll, NEXT_PHOTO_POS,
+    wait_until_stable
 )
-from tinder_bot.image_utils import stitch_images
+from tinder_bot.image_utils import new_grid_canvas, save_stitched_image, stitch_grid
+
+# Background PNG encoding/writes overlap with the next scroll or click delay
+_SAVE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="screenshot-save")
+
+def get_stitch_layout(env: str, num_scrolls: int) -> Tuple[int, int]:
+    """
+    Return the (rows, cols) grid used to stitch a profile's screenshots.
+
+    Args:
+        env: The current environment (e.g., 'AIR', 'PRO').
+        num_scrolls: Number of scrolls performed (for non-AIR envs).
+    """
+    return (2, 2) if env == "AIR" else (2, (num_scrolls + 1 + 1) // 2) # Dynamic layout
+
+def count_profile_frames(env: str, num_scrolls: int) -> int:
+    """
+    Return how many screenshots capture_profile_frames takes for a profile.
+
+    Args:
+        env: The current environment (e.g., 'AIR', 'PRO').
+        num_scrolls: Number of scrolls performed (for non-AIR envs).
+    """
+    return 4 if env == "AIR" else num_scrolls + 1 # Initial shot plus one per click/scroll
+
+def capture_profile_frames(
+    bbox: Tuple[int, int, int, int],
+    env: str,
+    num_scrolls: int,
+    logger: logging.Logger,
+    console: Console,
+    debug: bool
+) -> Iterator[Tuple[int, Image.Image]]:
+    """
+    Walk through a profile (clicking or scrolling based on env) and yield each screenshot.
+
+    Frames are yielded as soon as they are grabbed; the next click/scroll only
+    happens once the caller asks for the next frame.
+
+    Args:
+        bbox: The bounding box of the profile window.
+        env: The current environment (e.g., 'AIR', 'PRO').
+        num_scrolls: Number of scrolls to perform (for non-AIR envs).
+        logger: Logger instance.
+        console: Rich console instance.
+        debug: Debug flag for conditional prints.
+
+    Yields:
+        (screenshot_number, image) tuples, starting at 1.
+    """
+    x, y, width, height = bbox
+    center_x = x + width // 2
+    center_y = y + height // 2
+    # Same region for every screenshot of the profile
+    grab_frame = frame_grabber(bbox)
+
+    # Step 2: Begin screenshot capture process
+    if debug:
+        console.print("\n[bold]Step 2:[/bold] Capturing initial screenshot...")
+
+    # Ensure focus before initial capture
+    click_at(center_x, center_y)
+    time.sleep(1.0)
+    # Add a small delay right before capturing to ensure stability
+    time.sleep(0.2)
+
+    yield 1, grab_frame()
+
+    # Step 3 & 4: Capture subsequent screenshots
+    if env == "AIR":
+        if debug:
+            console.print("\n[bold]Step 3:[/bold] Clicking for next photos...")
+        # Random delay between clicks, drawn up front for the whole profile
+        photo_click_delays = [random.uniform(0.5, 1.5) for _ in range(count_profile_frames(env, num_scrolls) - 1)]
+        safe_click_x, safe_click_y = get_safe_coordinates(NEXT_PHOTO_POS[0], NEXT_PHOTO_POS[1])
+        for i, photo_click_delay in enumerate(photo_click_delays):
+            if debug:
+                console.print(f"Clicking next photo ({i+1}/3)...")
+            logger.debug("Attempting click at safe coordinates: (%d, %d)", safe_click_x, safe_click_y)
+            click_at(safe_click_x, safe_click_y)
+            logger.debug("Waiting %.2fs before taking next photo...", photo_click_delay)
+            time.sleep(photo_click_delay)
+
+            yield i + 2, grab_frame()
+    else:
+        # Scrolling logic for non-AIR
+        if debug:
+            console.print("\n[bold]Step 3:[/bold] Scrolling and capturing profile...")
+        perform_stepped_scroll(FIRST_SCROLL_AMOUNT)
+        wait_until_stable(bbox)
+
+        yield 2, grab_frame()
+
+        if debug:
+            console.print("\n[bold]Step 4:[/bold] Continuing scroll and capture...")
+        total_screenshots = num_scrolls + 1 # Recalculate for loop
+        # The focus click before the first screenshot holds for every scroll,
+        # so the loop only scrolls, settles and grabs
+        for i in range(num_scrolls - 1):
+            if debug:
+                console.print(f"Scroll {i+2}/{total_screenshots}: {SUBSEQUENT_SCROLL_AMOUNT} pixels...")
+            perform_stepped_scroll(SUBSEQUENT_SCROLL_AMOUNT)
+            wait_until_stable(bbox)
+
+            yield i + 3, grab_frame()
+
+        # Scroll back to top (only for non-AIR envs) - Moved from here
+        # This should probably happen *after* processing the profile in the main loop
+        # if the goal is to reset for the *next* profile in sequence.
+        # Removing scroll-up from this function.
 
 def capture_and_stitch_profile(
-    bbox: Tuple[int, int, int, int], 
-    env: str, 
-    num_scrolls: int, 
-    logger: logging.Logger, 
+    bbox: Tuple[int, int, int, int],
+    env: str,
+    num_scrolls: int,
+    logger: logging.Logger,
     console: Console,
     debug: bool
 ) -> Tuple[Optional[str], List[str]]:
     """
     Captures screenshots for a profile (clicking or scrolling based on env) and stitches them.
-    
+
     Args:
         bbox: The bounding box of the profile window.
         env: The current environment (e.g., 'AIR', 'PRO').
@@ -39,103 +150,92 @@ def capture_and_stitch_profile(
         debug: Debug flag for conditional prints.
 
     Returns:
-        A tuple containing the path to the stitched image (or None on error) 
+        A tuple containing the path to the stitched image (or None on error)
         and the list of paths to the original screenshots.
     """
     screenshot_paths: List[str] = []
+    save_futures: List[Future] = []
+    frames: List[Image.Image] = []
+    layout = get_stitch_layout(env, num_scrolls)
+    canvas = None
     try:
-        x, y, width, height = bbox
-        center_x = x + width // 2
-        center_y = y + height // 2
-        
-        # Step 2: Begin screenshot capture process
-        if debug:
-            console.print("\n[bold]Step 2:[/bold] Capturing initial screenshot...")
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Ensure focus before initial capture
-        pyautogui.moveTo(center_x, center_y, duration=0.5)
-        pyautogui.click()
-        time.sleep(1.0)
-        # Add a small delay right before capturing to ensure stability
-        time.sleep(0.2) 
-        
-        initial_path = take_high_quality_screenshot(bbox, 1, timestamp)
-        screenshot_paths.append(initial_path)
-        if debug:
-            console.print(f"Initial screenshot saved to: {initial_path}")
-        
-        # Step 3 & 4: Capture subsequent screenshots
-        if env == "AIR":
-            if debug:
-                console.print("\n[bold]Step 3:[/bold] Clicking for next photos...")
-            for i in range(3): 
-                if debug:
-                    console.print(f"Clicking next photo ({i+1}/3)...")
-                safe_click_x, safe_click_y = get_safe_coordinates(NEXT_PHOTO_POS[0], NEXT_PHOTO_POS[1])
-                logger.debug(f"Attempting click at safe coordinates: ({safe_click_x}, {safe_click_y})")
-                pyautogui.click(safe_click_x, safe_click_y)
-                photo_click_delay = random.uniform(0.5, 1.5)
-                logger.debug(f"Waiting {photo_click_delay:.2f}s before taking next photo...")
-                time.sleep(photo_click_delay) # Random delay between clicks
-                
-                screenshot_number = i + 2
-                screenshot_path = take_high_quality_screenshot(bbox, screenshot_number, timestamp)
-                screenshot_paths.append(screenshot_path)
-                if debug:
-                    console.print(f"Screenshot {screenshot_number} saved to: {screenshot_path}")
-        else:
-            # Scrolling logic for non-AIR
-            if debug:
-                console.print("\n[bold]Step 3:[/bold] Scrolling and capturing profile...")
-            perform_stepped_scroll(FIRST_SCROLL_AMOUNT)
-            time.sleep(SCROLL_DELAY)
-            
-            screenshot_number = 2
-            screenshot_path = take_high_quality_screenshot(bbox, screenshot_number, timestamp)
+        # Name every screenshot once, before the capture loop
+        output_paths = build_screenshot_paths(timestamp, count_profile_frames(env, num_scrolls))
+
+        for screenshot_number, frame in capture_profile_frames(bbox, env, num_scrolls, logger, console, debug):
+            frames.append(frame)
+            if canvas is None:
+                # Size the composite from a real frame: on Retina Macs frames are
+                # grabbed in pixels, twice the bbox's logical size
+                canvas = new_grid_canvas(frame.size, layout)
+            # Encode and write in the background while the next scroll/click settles
+            save_futures.append(_SAVE_POOL.submit(
+                save_screenshot, frame, screenshot_number, timestamp, path=output_paths[screenshot_number - 1]
+            ))
+
+        # Wait for every save, in capture order, before stitching
+        for screenshot_number, future in enumerate(save_futures, start=1):
+            screenshot_path = future.result()
             screenshot_paths.append(screenshot_path)
             if debug:
                 console.print(f"Screenshot {screenshot_number} saved to: {screenshot_path}")
-            
-            if debug:
-                console.print("\n[bold]Step 4:[/bold] Continuing scroll and capture...")
-            total_screenshots = num_scrolls + 1 # Recalculate for loop
-            for i in range(num_scrolls - 1): 
-                pyautogui.moveTo(center_x, center_y, duration=0.3)
-                pyautogui.click()
-                time.sleep(0.1)
-                if debug:
-                    console.print(f"Scroll {i+2}/{total_screenshots}: {SUBSEQUENT_SCROLL_AMOUNT} pixels...")
-                perform_stepped_scroll(SUBSEQUENT_SCROLL_AMOUNT)
-                time.sleep(SCROLL_DELAY)
-                
-                screenshot_number = i + 3
-                screenshot_path = take_high_quality_screenshot(bbox, screenshot_number, timestamp)
-                screenshot_paths.append(screenshot_path)
-                if debug:
-                    console.print(f"Screenshot {screenshot_number} saved to: {screenshot_path}")
-
-            # Scroll back to top (only for non-AIR envs) - Moved from here
-            # This should probably happen *after* processing the profile in the main loop
-            # if the goal is to reset for the *next* profile in sequence.
-            # Removing scroll-up from this function.
-            pass # Placeholder for removed scroll-up logic
-
-        # Stitch the images
+
+        # Stitch the frames already in memory; the saved copies are only kept for the
+        # caller (deletion handled by caller based on keep_screenshots), never re-read
         if debug:
             console.print("\nStitching screenshots...")
-        stitch_layout = (2, 2) if env == "AIR" else (2, (num_scrolls + 1 + 1) // 2) # Dynamic layout
-        stitched_path = stitch_images(
-            screenshot_paths, 
-            delete_originals=False, # Deletion handled by caller based on keep_screenshots
-            layout=stitch_layout
-        )
+        stitched_path = save_stitched_image(stitch_grid(frames, layout, canvas))
         if debug:
             console.print(f"Stitched image created: {stitched_path}")
-        
+
         return stitched_path, screenshot_paths
 
     except Exception as e:
         logger.error("Error during screenshot capture or stitching", exc_info=True)
         console.print(f"[bold red]ERROR:[/bold red] Error capturing/stitching profile: {e}")
-        return None, screenshot_paths # Return None for path, but paths list for potential cleanup 
\ No newline at end of file
+        # Collect whatever background saves did land, so the caller can clean them up
+        for future in save_futures[len(screenshot_paths):]:
+            try:
+                screenshot_paths.append(future.result())
+            except Exception:
+                pass
+        return None, screenshot_paths # Return None for path, but paths list for potential cleanup
+
+def capture_profile_image(
+    bbox: Tuple[int, int, int, int],
+    env: str,
+    num_scrolls: int,
+    logger: logging.Logger,
+    console: Console,
+    debug: bool
+) -> Optional[Image.Image]:
+    """
+    Captures screenshots for a profile and stitches them entirely in memory.
+
+    Nothing is written to disk, which skips a PNG encode and write per
+    screenshot plus the stitched PNG compared to capture_and_stitch_profile.
+
+    Args:
+        bbox: The bounding box of the profile window.
+        env: The current environment (e.g., 'AIR', 'PRO').
+        num_scrolls: Number of scrolls to perform (for non-AIR envs).
+        logger: Logger instance.
+        console: Rich console instance.
+        debug: Debug flag for conditional prints.
+
+    Returns:
+        The stitched image, or None on error.
+    """
+    layout = get_stitch_layout(env, num_scrolls)
+    try:
+        frames = [frame for _, frame in capture_profile_frames(bbox, env, num_scrolls, logger, console, debug)]
+
+        if debug:
+            console.print("\nStitching screenshots in memory...")
+        return stitch_grid(frames, layout)
+
+    except Exception as e:
+        logger.error("Error during screenshot capture or stitching", exc_info=True)
+        console.print(f"[bold red]ERROR:[/bold red] Error capturing/stitching profile: {e}")
+        return None
@@ -1,56 +1,177 @@
 """Command-line interface for Tinder Bot."""
 
-import typer
+import asyncio
+import functools
 import logging
+import random
+import time
+import typer
 import os
-from rich.console import Console
-from rich.logging import RichHandler
-from dotenv import load_dotenv
 from datetime import datetime
 from pathlib import Path
-import time
-import pyautogui
-import glob # Import glob
-import random # Import random
+from typing import TYPE_CHECKING, Annotated, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# GUI automation, Rich logging and .env handling are imported inside the commands
+# that use them, so `--help` and `version` don't pay for pyautogui & co.
 
 # Initialize Typer app
 app = typer.Typer(help="Tinder Bot - Automated opener generator")
 
-# Load environment variables
-load_dotenv()
-NUM_SCROLLS = int(os.getenv("NUM_SCROLLS", 5))
-NUM_COLS = NUM_SCROLLS // 2
-LAYOUT = (2, NUM_COLS)
+@functools.lru_cache(maxsize=None)
+def _get_console() -> "Console":
+    """Return the shared Rich console, importing Rich on first use."""
+    from rich.console import Console
+    return Console()
+
+MAX_REDOS = 5  # Default cap on opener "redo" requests per profile (override with MAX_REDOS)
 
-# Configure logging
-console = Console()
+# Set once setup_logging has installed its handlers
+_logging_configured = False
 
-def setup_logging():
-    """Set up logging with Rich handler."""
+def _extract_opener(full_response: str) -> str:
+    """
+    Return the opener line from a GPT response.
+    
+    Args:
+        full_response: Response text; the opener is its first line, optionally
+                       written as "- Label: text"
+    
+    Returns:
+        The first line, without a leading "- Label:" prefix
+    """
+    opener = full_response.partition("\n")[0].strip()
+    if opener.startswith("-"):
+        before, sep, after = opener.partition(":")
+        opener = (after if sep else before).strip()
+    return opener
+
+def _profile_output_paths(base_dir: Path, name: str) -> Tuple[Path, Path]:
+    """
+    Pick the stitched-image and responses paths for a profile.
+    
+    Args:
+        base_dir: Folder the profile's files are saved in
+        name: Profile name from GPT; spaces become underscores
+    
+    Returns:
+        (image_path, responses_path), with a time suffix if the name is taken
+    """
+    name = name.strip().replace(" ", "_") # Sanitize name for filename
+    profile_image_path = base_dir / f"profile_{name}.png"
+    responses_file_path = base_dir / f"profile_{name}_responses.txt"
+    
+    # Handle potential filename collisions
+    if profile_image_path.exists():
+        timestamp_suffix = time.strftime("%H%M%S")
+        profile_image_path = base_dir / f"profile_{name}_{timestamp_suffix}.png"
+        responses_file_path = base_dir / f"profile_{name}_{timestamp_suffix}_responses.txt"
+    return profile_image_path, responses_file_path
+
+def _save_profile_image(stitched, profile_image_path: Path) -> None:
+    """
+    Move the stitched image to its final path, or encode it there if it was kept in memory.
+    
+    Args:
+        stitched: Path of the stitched PNG, or the stitched PIL image
+        profile_image_path: Where the profile image should end up
+    """
+    if isinstance(stitched, str):
+        Path(stitched).rename(profile_image_path)
+    else:
+        stitched.save(profile_image_path, format="PNG")
+
+def _pick_opener(stitched, base_dir: Path, console: "Console", max_redos: int) -> Tuple[str, str, str, Path, Path]:
+    """
+    Generate openers until the user picks one, then store the stitched image.
+    
+    The number of "redo" requests is capped so a stuck redo can't keep
+    spending API calls. An in-memory image is encoded in the background while
+    the user reads the suggestion; a stitched file is only moved once the
+    loop is over, because every redo reads it again.
+    
+    Args:
+        stitched: Path of the stitched PNG, or the stitched PIL image
+        base_dir: Folder the profile's files are saved in
+        console: Rich console for the suggestions
+        max_redos: Maximum number of "redo" requests
+    
+    Returns:
+        (full_response, opener, picked_response, profile_image_path, responses_file_path)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from tinder_bot.gpt import generate_opener
+    
+    opener = ""
+    profile_image_path = None
+    image_saved = None
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="profile-save") as save_pool:
+        for _ in range(max_redos + 1):
+            name, full_response = generate_opener(stitched)
+            if profile_image_path is None:
+                # Files are named after the first generation; a redo is the same profile
+                profile_image_path, responses_file_path = _profile_output_paths(base_dir, name)
+                if not isinstance(stitched, str):
+                    image_saved = save_pool.submit(_save_profile_image, stitched, profile_image_path)
+            console.print(f"\n[bold green]Generated opener:[/bold green] {full_response}")
+            
+            # Extract just the first line as the potential opener to send
+            if full_response:
+                opener = _extract_opener(full_response)
+            
+            # Prompt the user to enter their picked response
+            picked_response = typer.prompt(
+                f"Suggested: '{opener}'\nEnter the response you decided to pick (or 'redo')",
+                default="", show_default=False
+            )
+            if picked_response.strip().lower() != "redo":
+                break
+        else:
+            console.print(f"[bold yellow]Warning:[/bold yellow] Reached the limit of {max_redos} redos, using the last suggestion.")
+            picked_response = ""
+        
+        if image_saved is not None:
+            # The encode usually finished while the prompt was open
+            image_saved.result()
+        else:
+            _save_profile_image(stitched, profile_image_path)
+    
+    return full_response, opener, picked_response, profile_image_path, responses_file_path
+
+def setup_logging(timestamp: Optional[str] = None, level: Optional[int] = None):
+    """
+    Set up logging with Rich handler.
+    
+    Args:
+        timestamp: Optional "%Y%m%d_%H%M%S" stamp for the log file name, so a
+                   caller that already took the time doesn't format it again
+        level: Optional numeric level overriding LOG_LEVEL (e.g. logging.DEBUG for --debug)
+    """
+    from tinder_bot.log_handlers import LOG_LEVELS, configure_queue_logging
+    global _logging_configured
+    
+    # A second call would stack another listener thread and log file on the root logger
+    if _logging_configured:
+        return logging.getLogger("tinder_bot")
+    
     log_level = os.getenv("LOG_LEVEL", "ERROR")
     log_dir = os.getenv("LOG_DIR", "./logs")
     
-    # Create log directory if it doesn't exist
-    Path(log_dir).mkdir(exist_ok=True)
-    
     # Create log file with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if timestamp is None:
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
     log_file = Path(log_dir) / f"tinder_bot_{timestamp}.log"
     
-    # Get the numeric log level
-    numeric_level = getattr(logging, log_level)
+    # Get the numeric log level; reject typos with a clean CLI error, not a traceback
+    numeric_level = level if level is not None else LOG_LEVELS.get(log_level.upper())
+    if numeric_level is None:
+        raise typer.BadParameter(
+            f"Bad LOG_LEVEL={log_level!r}, expected one of {', '.join(LOG_LEVELS)}"
+        )
     
-    # Create handlers with the correct level
-    rich_handler = RichHandler(console=console, rich_tracebacks=True, level=numeric_level)
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(numeric_level)
-    
-    # Configure the root logger - this affects ALL loggers in the application
-    logging.basicConfig(
-        level=numeric_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[rich_handler, file_handler]
-    )
+    configure_queue_logging(log_file, numeric_level, _get_console())
     
     # Make sure the root logger level is set
     root_logger = logging.getLogger()
@@ -60,32 +181,15 @@ def setup_logging():
     for handler in root_logger.handlers:
         handler.setLevel(numeric_level)
     
-    # Explicitly set the level for the tinder_bot package loggers
+    # Explicitly set the level for the tinder_bot package logger; the module
+    # loggers under it inherit it, so --debug only needs to lower this one
     tinder_bot_logger = logging.getLogger("tinder_bot")
     tinder_bot_logger.setLevel(numeric_level)
     
-    # Also set levels for specific module loggers
-    module_loggers = [
-        logging.getLogger("tinder_bot.gpt"),
-        logging.getLogger("tinder_bot.window"),
-        logging.getLogger("tinder_bot.scroll"),
-        logging.getLogger("tinder_bot.capture"),
-        logging.getLogger("tinder_bot.image_utils"),
-        logging.getLogger("httpx")  # Also silence the httpx library if needed
-    ]
-    
-    for logger in module_loggers:
-        logger.setLevel(numeric_level)
-        # Also set the level on all handlers attached to each logger
-        for handler in logger.handlers:
-            handler.setLevel(numeric_level)
-    
-    # Also explicitly disable propagation for these loggers if needed
-    # This prevents log messages from being handled by parent loggers
-    # Uncomment if you're still seeing unwanted logs
-    # for logger in module_loggers:
-    #     logger.propagate = False
+    # Keep the httpx library's per-request logs out unless something goes wrong
+    logging.getLogger("httpx").setLevel(max(numeric_level, logging.WARNING))
     
+    _logging_configured = True
     return tinder_bot_logger
 
 @app.command()
@@ -99,6 +203,9 @@ def run(
     debug: bool = typer.Option(
         False, "--debug", help="Run in debug mode with extra output"
     ),
+    verify_window: bool = typer.Option(
+        False, "--verify-window", help="Pause after positioning the mouse on the iPhone window so it can be checked visually"
+    ),
     env: str = typer.Option(
         "MONITOR", "--env", "-e", help="Environment to use (MONITOR, PRO, or AIR)"
     ),
@@ -115,59 +222,32 @@ def run(
     """
     Run the Tinder Bot to generate and optionally send openers.
     """
+    from dotenv import load_dotenv
+    
+    # Load environment variables (values already set in the shell win)
+    load_dotenv()
+    console = _get_console()
+    # One clock read for the run's log file name and output directory
+    started_at = datetime.now()
+    
     # Set environment variables for the session before importing any modules that use them
     os.environ["ENVIRONMENT"] = env
-    os.environ["DEBUG_SCROLL"] = str(debug).lower()
+    # Visual verification pauses are opt-in; --debug only raises verbosity
+    os.environ["DEBUG_SCROLL"] = str(verify_window).lower()
     
     # Calculate layout based on num_scrolls
     total_screenshots = num_scrolls + 1  # Add 1 for the initial screenshot
     num_cols = (total_screenshots + 1) // 2  # Ensure we have enough columns
     layout = (2, num_cols)
     
-    # Now import the modules that depend on environment variables
-    from tinder_bot.window import find_iphone_window, save_detected_window
-    from tinder_bot.capture import take_high_quality_screenshot, delete_screenshots
-    from tinder_bot.scroll import scroll_profile, get_hardcoded_window
-    from tinder_bot.gpt import generate_opener # Import will be conditional later
-    from tinder_bot.like import like_photo # Import the new like function
-    from tinder_bot.message import send_opener
-    from tinder_bot.image_utils import stitch_images
-    # Import the profile processor
+    # Now import the modules that depend on environment variables; everything
+    # else is imported in the mode branch that first uses it
     from tinder_bot.profile_processor import process_single_profile 
-    # Import the ad checker
-    from tinder_bot.ads import check_for_ads 
-    
-    # Import scroll constants and override NUM_SCROLLS
-    from tinder_bot.scroll import (
-        FIRST_SCROLL_AMOUNT, SUBSEQUENT_SCROLL_AMOUNT, SCROLL_DELAY, 
-        UP_SCROLL_AMOUNT, STEPS_PER_SCROLL, perform_stepped_scroll, NEXT_PHOTO_POS,
-        PASS_BUTTON, LIKE_BUTTON, get_safe_coordinates, ENVIRONMENT # Import button coords and env
-    )
-    import tinder_bot.scroll as scroll
-    scroll.NUM_SCROLLS = num_scrolls
 
     # Set up logging
-    logger = setup_logging()
-    
+    # --debug configures every logger and handler at DEBUG in one pass
+    logger = setup_logging(started_at.strftime("%Y%m%d_%H%M%S"), logging.DEBUG if debug else None)
     if debug:
-        # Set DEBUG level for all loggers in the application
-        debug_level = logging.DEBUG
-        
-        # Set the level for the root logger
-        root_logger = logging.getLogger()
-        root_logger.setLevel(debug_level)
-        
-        # Set the level for all handlers
-        for handler in root_logger.handlers:
-            handler.setLevel(debug_level)
-        
-        # Set the level for our main logger
-        logger.setLevel(debug_level)
-        
-        # Set the level for all handlers on our main logger
-        for handler in logger.handlers:
-            handler.setLevel(debug_level)
-        
         logger.debug("Debug mode enabled")
     
     console.print(f"[bold green]Tinder Bot[/bold green] - Starting up in {env} environment...")
@@ -183,17 +263,18 @@ def run(
         console.print("\n[bold]Step 1.5:[/bold] Clearing old screenshots from root directory...")
         screenshots_dir = Path("./screenshots")
         screenshots_dir.mkdir(exist_ok=True) # Ensure directory exists
-        old_screenshots = glob.glob(str(screenshots_dir / "*.png"))
-        deleted_count = 0
+        from tinder_bot.capture import delete_screenshots
+        # One directory pass; the entries already carry their full paths
+        with os.scandir(screenshots_dir) as entries:
+            old_screenshots = [
+                entry.path for entry in entries
+                if entry.name.endswith(".png") and entry.is_file(follow_symlinks=False)
+            ]
         if old_screenshots:
             console.print(f"Found {len(old_screenshots)} old screenshots to clear...")
-            for f_path in old_screenshots:
-                try:
-                    os.remove(f_path)
-                    deleted_count += 1
-                    logger.debug(f"Deleted old screenshot: {f_path}")
-                except OSError as e:
-                    logger.warning(f"Could not delete old screenshot {f_path}: {e}")
+            # Only loose PNGs go; the profile_<date>/ folders beside them hold saved
+            # openers, so the folder itself is never wiped
+            deleted_count = delete_screenshots(old_screenshots)
             console.print(f"Cleared {deleted_count} old screenshots.")
         else:
             console.print("No old screenshots found in root directory to clear.")
@@ -203,107 +284,120 @@ def run(
             num_iterations = random.randint(50, 100)
             console.print(f"\n[bold]Running LIKE mode for {num_iterations} iterations or max {duration} minutes...[/bold]")
             
-            start_time = time.time()
+            # Import the ad checker, the like/pass decision and the button coords
+            from tinder_bot.ads import check_for_ads 
+            from tinder_bot.like import like_photo
+            from tinder_bot.scroll import get_hardcoded_window, get_safe_coordinates, click_at, PASS_BUTTON, ENVIRONMENT
+            from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeRemainingColumn
+            
+            # Monotonic, so an NTP step or clock change can't cut the run short or stretch it
+            start_time = time.monotonic()
             end_time = start_time + duration * 60
             iterations_completed = 0 # Keep track of actual iterations done
+            # Random delays drawn up front; each iteration takes at most one pause and one ad PASS delay
+            pause_durations = [random.uniform(2.0, 3.0) for _ in range(num_iterations)]
+            ad_pass_delays = [random.uniform(1.0, 2.0) for _ in range(num_iterations)]
+            # The PASS button and screen size don't change between iterations
+            ad_pass_xy = get_safe_coordinates(PASS_BUTTON[0], PASS_BUTTON[1]) if ENVIRONMENT == "AIR" and PASS_BUTTON else None
             
-            for i in range(num_iterations):
-                # --- Time Check --- 
-                if time.time() >= end_time:
-                    console.print(f"\n[bold]Time limit ({duration} minutes) reached. Stopping early.[/bold]")
-                    break # Exit the loop if duration exceeded
-                # ------------------
+            # One progress bar instead of a rule per iteration; Rich redraws it at its own pace
+            with Progress(
+                TextColumn("[bold]{task.description}"), BarColumn(), MofNCompleteColumn(), TimeRemainingColumn(),
+                console=console
+            ) as progress:
+                for i in progress.track(range(num_iterations), description="Like"):
+                    # --- Time Check --- 
+                    now = time.monotonic()
+                    if now >= end_time:
+                        console.print(f"\n[bold]Time limit ({duration} minutes) reached. Stopping early.[/bold]")
+                        break # Exit the loop if duration exceeded
+                    # ------------------
                 
-                console.rule(f"Iteration {i+1}/{num_iterations} (Time left: {max(0, int(end_time - time.time()))}s)")
-                try:
-                    # Step 0: Check for Ads 
-                    if debug:
-                        console.print("\n[bold]Step 0:[/bold] Checking for advertisements...")
-                    # Pass debug flag to ad checker
-                    ad_result = check_for_ads(i + 1, debug)
+                    logger.debug("Iteration %d/%d (time left: %ds)", i + 1, num_iterations, max(0, int(end_time - now)))
+                    try:
+                        # Step 0: Check for Ads 
+                        logger.debug("Step 0: Checking for advertisements...")
+                        # Pass debug flag to ad checker
+                        ad_result = check_for_ads(i + 1, debug)
                     
-                    # If it's an ad, PASS and skip
-                    if ad_result == "YES":
-                        # Keep this message as it indicates a specific action/decision
-                        console.print("[bold yellow]Ad detected. Performing PASS action.[/bold yellow]") 
-                        if ENVIRONMENT == "AIR" and PASS_BUTTON:
-                            try:
-                                safe_x, safe_y = get_safe_coordinates(PASS_BUTTON[0], PASS_BUTTON[1])
-                                logger.info(f"Clicking PASS button (ad detected) at safe coordinates: ({safe_x}, {safe_y})")
-                                pass_delay = random.uniform(1.0, 2.0)
-                                logger.debug(f"Waiting {pass_delay:.2f}s before clicking PASS (ad)...")
-                                time.sleep(pass_delay)
-                                pyautogui.click(safe_x, safe_y)
-                                time.sleep(0.5) # Small delay after click
-                            except Exception as click_err:
-                                logger.error(f"Error clicking PASS for ad: {click_err}", exc_info=True)
-                                console.print(f"[bold red]Error:[/bold red] Failed PASS click for ad.")
-                        else:
-                            if debug: # Only show placeholder if debugging
-                                console.print(f"[italic yellow]Placeholder: PASS action for ad (Env: {ENVIRONMENT}, Button defined: {PASS_BUTTON is not None}).[/italic yellow]")
+                        # If it's an ad, PASS and skip
+                        if ad_result == "YES":
+                            # Keep this message as it indicates a specific action/decision
+                            console.print("[bold yellow]Ad detected. Performing PASS action.[/bold yellow]") 
+                            if ad_pass_xy is not None:
+                                try:
+                                    safe_x, safe_y = ad_pass_xy
+                                    logger.info("Clicking PASS button (ad detected) at safe coordinates: (%s, %s)", safe_x, safe_y)
+                                    pass_delay = ad_pass_delays[i]
+                                    logger.debug("Waiting %.2fs before clicking PASS (ad)...", pass_delay)
+                                    time.sleep(pass_delay)
+                                    click_at(safe_x, safe_y)
+                                    time.sleep(0.5) # Small delay after click
+                                except Exception as click_err:
+                                    logger.error("Error clicking PASS for ad: %s", click_err, exc_info=True)
+                                    console.print(f"[bold red]Error:[/bold red] Failed PASS click for ad.")
+                            else:
+                                logger.debug("Placeholder: PASS action for ad (Env: %s, Button defined: %s).", ENVIRONMENT, PASS_BUTTON is not None)
                         
-                        # Pause and continue
-                        pause_duration = random.uniform(2.0, 3.0)
-                        if debug:
-                            console.print(f"\n--- Ad handled. Pausing for {pause_duration:.2f} seconds before next iteration... ---")
-                        time.sleep(pause_duration)
-                        continue
-                    elif ad_result == "ERROR":
-                        # Keep this warning
-                        console.print("[bold yellow]Warning:[/bold yellow] Ad check failed. Proceeding with profile processing.")
-                        logger.warning("Ad check resulted in ERROR, proceeding with normal like/pass flow.")
-                    else: # ad_result == "NO"
-                        if debug:
-                            console.print("No ad detected. Proceeding with profile processing.")
+                            # Pause and continue
+                            pause_duration = pause_durations[i]
+                            logger.debug("Ad handled. Pausing for %.2f seconds before next iteration...", pause_duration)
+                            time.sleep(pause_duration)
+                            continue
+                        elif ad_result == "ERROR":
+                            # Keep this warning
+                            console.print("[bold yellow]Warning:[/bold yellow] Ad check failed. Proceeding with profile processing.")
+                            logger.warning("Ad check resulted in ERROR, proceeding with normal like/pass flow.")
+                        else: # ad_result == "NO"
+                            logger.debug("No ad detected. Proceeding with profile processing.")
                     
-                    # Step 1-4: Process profile 
-                    if debug:
-                        console.print("\n[bold]Step 1-4:[/bold] Processing profile (capture & stitch)...")
-                    # Get window coords 
-                    bbox = get_hardcoded_window() # Needed for profile_processor
-                    # Pass debug flag to profile processor
-                    stitched_path, _ = process_single_profile(
-                        env=env, 
-                        num_scrolls=num_scrolls, 
-                        logger=logger, 
-                        console=console, 
-                        keep_screenshots=keep_screenshots,
-                        debug=debug # Pass the flag
-                    )
-
-                    if not stitched_path:
-                        console.print("[bold red]ERROR:[/bold red] Failed to process profile for this iteration.")
-                        time.sleep(random.uniform(2.0, 3.0))
-                        continue 
+                        # Step 1-4: Process profile 
+                        logger.debug("Step 1-4: Processing profile (capture & stitch)...")
+                        # Get window coords 
+                        bbox = get_hardcoded_window() # Needed for profile_processor
+                        # Pass debug flag to profile processor
+                        stitched_path, _ = process_single_profile(
+                            env=env, 
+                            num_scrolls=num_scrolls, 
+                            logger=logger, 
+                            console=console, 
+                            keep_screenshots=keep_screenshots,
+                            debug=debug # Pass the flag
+                        )
+
+                        if not stitched_path:
+                            console.print("[bold red]ERROR:[/bold red] Failed to process profile for this iteration.")
+                            time.sleep(pause_durations[i])
+                            continue 
                     
-                    if debug:
-                        console.print(f"Stitched profile image: {stitched_path}")
-
-                    # Step 5: Decide Like/Pass
-                    if debug:
-                        console.print("\n[bold]Step 5:[/bold] Deciding Like/Pass...")
-                    # Pass debug flag to like_photo
-                    like_photo(stitched_path, debug)
-                except Exception as iter_e:
-                     logger.error(f"An unexpected error occurred during iteration {i+1}", exc_info=True)
-                     console.print(f"[bold red]ERROR:[/bold red] Unexpected error during iteration {i+1}: {iter_e}")
-                     console.print("Attempting to continue to the next iteration...")
-
-                iterations_completed += 1 # Increment counter only if iteration finishes (or before sleep)
-                # Pause between iterations
-                pause_duration = random.uniform(2.0, 3.0)
-                # Check time again before sleeping long
-                if time.time() + pause_duration >= end_time:
-                    console.print(f"\n--- Iteration {i+1} complete. Time limit reached during pause. Finishing... ---")
-                    # No need to break here as the check at the start of the next loop will catch it, or the loop ends
-                    # Or we could break here to be absolutely sure: break
+                        logger.debug("Stitched profile image: %s", stitched_path)
+
+                        # Step 5: Decide Like/Pass
+                        logger.debug("Step 5: Deciding Like/Pass...")
+                        # Pass debug flag to like_photo
+                        like_photo(stitched_path, debug)
+                    except Exception as iter_e:
+                         logger.error("An unexpected error occurred during iteration %s", i+1, exc_info=True)
+                         console.print(
+                             f"[bold red]ERROR:[/bold red] Unexpected error during iteration {i+1}: {iter_e}",
+                             "Attempting to continue to the next iteration...",
+                             sep="\n"
+                         )
+
+                    iterations_completed += 1 # Increment counter only if iteration finishes (or before sleep)
+                    # Pause between iterations
+                    pause_duration = pause_durations[i]
+                    # Check time again before sleeping long
+                    if time.monotonic() + pause_duration >= end_time:
+                        console.print(f"\n--- Iteration {i+1} complete. Time limit reached during pause. Finishing... ---")
+                        # No need to break here as the check at the start of the next loop will catch it, or the loop ends
+                        # Or we could break here to be absolutely sure: break
                 
-                if debug:
-                    console.print(f"\n--- Iteration {i+1} complete. Pausing for {pause_duration:.2f} seconds... ---")
-                time.sleep(pause_duration)
+                    logger.debug("Iteration %d complete. Pausing for %.2f seconds...", i + 1, pause_duration)
+                    time.sleep(pause_duration)
             
             # Print final status
-            elapsed_time = time.time() - start_time
+            elapsed_time = time.monotonic() - start_time
             if iterations_completed < num_iterations:
                 console.print(f"\n[bold]Like mode finished early due to time limit ({duration} min). Ran for {elapsed_time:.2f}s, completed {iterations_completed}/{num_iterations} iterations.[/bold]")
             else:
@@ -311,6 +405,12 @@ def run(
 
         elif mode == "opener":
             # --- Opener Mode Logic (Runs Once) ---
+            # Create the output folder up front, so a permissions or disk problem
+            # surfaces before any capture or GPT-4o call is paid for
+            date_str = started_at.strftime("%Y%m%d")
+            base_dir = Path(f"./screenshots/profile_{date_str}")
+            base_dir.mkdir(parents=True, exist_ok=True)
+
             # Step 1-4: Process profile (capture & stitch)
             console.print("\n[bold]Step 1-4:[/bold] Processing profile (capture & stitch)...")
             stitched_path, bbox = process_single_profile(
@@ -319,48 +419,30 @@ def run(
                 logger=logger, 
                 console=console, 
                 keep_screenshots=keep_screenshots,
-                debug=debug # Pass the flag
+                debug=debug, # Pass the flag
+                in_memory=not keep_screenshots # Screenshot files are only needed when kept for debugging
             )
 
-            if not stitched_path or not bbox:
+            if stitched_path is None or not bbox:
                 console.print("[bold red]ERROR:[/bold red] Failed to process profile.")
                 raise typer.Exit(code=1)
 
             x, y, width, height = bbox
             center_x = x + width // 2
             center_y = y + height // 2
-            console.print(f"Profile processed. Using window at ({x}, {y}) size {width}x{height}")
-            console.print(f"Stitched profile image: {stitched_path}")
+            # Collect the status lines and print them in one go
+            status_lines = [f"Profile processed. Using window at ({x}, {y}) size {width}x{height}"]
+            if isinstance(stitched_path, str):
+                status_lines.append(f"Stitched profile image: {stitched_path}")
+            console.print(*status_lines, sep="\n")
 
             # Step 5: Generate opener 
             # The stitching is done inside process_single_profile now
             console.print("\n[bold]Step 5:[/bold] Generating opener with GPT-4o...")
-            full_response = ""
-            opener = ""
-            name = "unknown" # Default name
-            
-            # Generate opener using the stitched image
-            name, full_response = generate_opener(stitched_path)
-            console.print(f"\n[bold green]Generated opener:[/bold green] {full_response}")
-            
-            # Prompt the user to enter their picked response
-            # Extract just the first line as the potential opener to send
-            if full_response:
-                opener = full_response.split('\n')[0].strip()
-                if opener.startswith("-"):
-                    opener = opener.split(":", 1)[-1].strip()
-
-            picked_response = input(f"Suggested: '{opener}'\nEnter the response you decided to pick (or 'redo'): ")
-            
-            # If the user wants to redo the opener, generate a new one
-            while picked_response.strip().lower() == "redo":
-                name, full_response = generate_opener(stitched_path)
-                console.print(f"\n[bold green]Generated opener:[/bold green] {full_response}")
-                if full_response:
-                    opener = full_response.split('\n')[0].strip()
-                    if opener.startswith("-"):
-                        opener = opener.split(":", 1)[-1].strip()
-                picked_response = input(f"Suggested: '{opener}'\nEnter the response you decided to pick (or 'redo'): ")
+            max_redos = int(os.getenv("MAX_REDOS", MAX_REDOS))
+            full_response, opener, picked_response, profile_image_path, responses_file_path = _pick_opener(
+                stitched_path, base_dir, console, max_redos
+            )
             
             # Use the user's picked response if provided, otherwise use the first generated line
             final_opener_to_send = picked_response if picked_response else opener
@@ -369,25 +451,13 @@ def run(
             full_response_to_save = full_response + f"\n\nPicked: {final_opener_to_send}"
             
             # --- Save results (common logic, maybe refactor later) ---
-            date_str = datetime.now().strftime("%Y%m%d")
-            base_dir = Path(f"./screenshots/profile_{date_str}")
-            base_dir.mkdir(parents=True, exist_ok=True)
-            
-            name = name.strip().replace(" ", "_") # Sanitize name for filename
-            profile_image_path = base_dir / f"profile_{name}.png"
-            responses_file_path = base_dir / f"profile_{name}_responses.txt"
-            
-            # Handle potential filename collisions
-            if profile_image_path.exists():
-                timestamp_suffix = datetime.now().strftime("%H%M%S")
-                profile_image_path = base_dir / f"profile_{name}_{timestamp_suffix}.png"
-                responses_file_path = base_dir / f"profile_{name}_{timestamp_suffix}_responses.txt"
-            
-            # Rename stitched image and save response
-            Path(stitched_path).rename(profile_image_path)
-            console.print(f"Stitched image saved as: {profile_image_path}")
-            responses_file_path.write_text(full_response_to_save)
-            console.print(f"Responses saved to: {responses_file_path}")
+            # The stitched image is already in place; only the response needs the picked text
+            responses_file_path.write_text(full_response_to_save, encoding="utf-8", newline="\n")
+            console.print(
+                f"Stitched image saved as: {profile_image_path}",
+                f"Responses saved to: {responses_file_path}",
+                sep="\n"
+            )
             # --- End Save results --- 
 
             # Original screenshot deletion is handled by process_single_profile now
@@ -397,13 +467,17 @@ def run(
             #     # deleted_count = delete_screenshots(screenshot_paths) 
             #     # console.print(f"Deleted {deleted_count} original screenshots")
             #     pass # Deletion handled earlier
-            logger.info(f"Generated opener using stitched image: {profile_image_path}")
+            logger.info("Generated opener using stitched image: %s", profile_image_path)
             
-            console.print("\n[bold]Opener to send:[/bold]")
-            console.print(final_opener_to_send if final_opener_to_send else "[yellow]No opener generated/picked.[/yellow]")
+            console.print(
+                "\n[bold]Opener to send:[/bold]",
+                final_opener_to_send if final_opener_to_send else "[yellow]No opener generated/picked.[/yellow]",
+                sep="\n"
+            )
             
             # Optionally send the message
             if send_message and final_opener_to_send:
+                from tinder_bot.message import send_opener
                 console.print("\n[bold]Step 6:[/bold] Sending opener in Tinder...")
                 send_opener(final_opener_to_send, bbox)
                 logger.info("Sent opener to Tinder")
@@ -419,15 +493,46 @@ def run(
         console.print(f"[bold red]ERROR:[/bold red] An unexpected error occurred: {e}")
         raise typer.Exit(code=1)
 
+@app.command()
+def openers(
+    image_paths: Annotated[List[Path], typer.Argument(help="Stitched profile images to generate openers for")]
+):
+    """
+    Generate openers for several stitched profile images concurrently.
+    """
+    from dotenv import load_dotenv
+    from tinder_bot.gpt import generate_openers_async
+
+    load_dotenv()
+    console = _get_console()
+    logger = setup_logging()
+
+    if not os.getenv("OPENAI_API_KEY"):
+        console.print("[bold red]ERROR:[/bold red] OPENAI_API_KEY not set. Please add it to your .env file.")
+        raise typer.Exit(code=1)
+
+    console.print(f"[bold green]Tinder Bot[/bold green] - Generating openers for {len(image_paths)} profiles...")
+    results = asyncio.run(generate_openers_async([str(p) for p in image_paths]))
+
+    for image_path, (name, full_response) in zip(image_paths, results, strict=True):
+        console.rule(f"{image_path.name} ({name})")
+        console.print(full_response)
+    logger.info("Generated openers for %s profiles", len(results))
+
 @app.command()
 def version():
     """Display version information."""
-    console.print("[bold green]Tinder Bot[/bold green] v0.1.0")
-    console.print("A Python application that automates crafting personalized openers on Tinder.")
+    console = _get_console()
+    console.print(
+        "[bold green]Tinder Bot[/bold green] v0.1.0",
+        "A Python application that automates crafting personalized openers on Tinder.",
+        sep="\n"
+    )
 
 @app.command()
 def analyze_profile():
     # Implementation of analyze_profile command
+    console = _get_console()
     console.print("[bold green]Analyzing profile...[/bold green]")
     # Add your implementation here
 
@@ -1,18 +1,26 @@
 """GPT-4o integration for generating openers based on profile screenshots."""
 
-from typing import List, Optional, Union, Tuple
+from typing import Dict, List, Optional, Union, Tuple
+import asyncio
+import functools
 import os
 import openai
 import logging
 import base64
+import io
+import numpy as np
+from PIL import Image
 from pathlib import Path
 import time
 import re
-from tinder_bot.system_prompt import opener_prompt, like_prompt, ad_check_prompt
+import json
+from tinder_bot.system_prompt import opener_prompt, like_prompt, ad_check_prompt, batch_opener_prompt
 from random import choice
 
 # Import from our new image_utils module
-from tinder_bot.image_utils import stitch_images, optimize_image
+from tinder_bot.image_utils import (
+    stitch_grid, load_screenshots, optimize_image, image_mime_type, JPEG_QUALITY
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,158 +28,426 @@ logger = logging.getLogger(__name__)
 DEFAULT_MODEL = "gpt-4.1"  # Default model to use
 MAX_TOKENS = 400  # Increased to accommodate multiple openers
 TEMPERATURE = 0.7  # Creativity level (0.0-1.0)
+MAX_CONCURRENT_REQUESTS = 8  # Cap on in-flight requests for batch generation
+BATCH_SIZE = 5  # Profiles sent together in one generate_openers_batch request
+OPENER_IMAGE_DETAIL = os.getenv("OPENAI_IMAGE_DETAIL", "low")  # "low" keeps opener requests cheap and fast
 
 # User prompt focuses on the specific task and image description
 
 
 FALLBACK_MESSAGE = "Hi there! I noticed something interesting in your profile, but I'd love to know more about you. What's been keeping you busy lately?"
 
+# The system prompts never change, so their message dicts are built once and
+# shared by every request (the client only serializes them, never mutates them)
+_OPENER_SYSTEM_MESSAGE = {"role": "system", "content": opener_prompt}
+_AD_CHECK_SYSTEM_MESSAGE = {"role": "system", "content": ad_check_prompt}
+_LIKE_SYSTEM_MESSAGE = {"role": "system", "content": like_prompt}
 
-def encode_image(image_path: str) -> str:
+
+@functools.lru_cache(maxsize=4)
+def _client(api_key: str) -> openai.OpenAI:
     """
-    Encode an image file to a base64 string.
+    Return a shared OpenAI client for the given API key.
+    
+    Building a client sets up an HTTP connection pool and TLS context, so it
+    is created once and reused to keep connections alive across requests.
     
     Args:
-        image_path: Path to the image file
+        api_key: OpenAI API key
+        
+    Returns:
+        Cached OpenAI client
+    """
+    return openai.OpenAI(api_key=api_key)
+
+
+def encode_image(image: Union[str, bytes, Image.Image, np.ndarray]) -> str:
+    """
+    Encode an image to a base64 string.
+    
+    In-memory images (e.g. straight from a screen grab) are JPEG-encoded
+    without touching disk.
+    
+    Args:
+        image: Path to the image file, already-encoded image bytes, a PIL
+               image, or an RGB numpy array
         
     Returns:
         Base64 encoded string of the image
     """
+    if isinstance(image, np.ndarray):
+        image = Image.fromarray(image)
+    if isinstance(image, Image.Image):
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=JPEG_QUALITY)
+        image = buffer.getvalue()
+    if isinstance(image, bytes):
+        return base64.b64encode(image).decode('ascii')
     try:
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
+        with open(image, "rb") as image_file:
+            return base64.b64encode(image_file.read()).decode('ascii')
     except Exception as e:
-        logger.error(f"Error encoding image {image_path}: {e}")
+        logger.error(f"Error encoding image {image}: {e}")
         raise
 
 
-def generate_opener(image_paths: Union[List[str], str]) -> Tuple[str, str]:
+@functools.lru_cache(maxsize=64)
+def _cached_data_url(image_path: str, mtime_ns: int, size: int) -> str:
     """
-    Generate a personalized opener based on profile screenshots.
+    Build (and memoize) the data URL for an image file.
+    
+    The file's modification time and size are part of the key, so a file
+    rewritten in place is optimized again rather than served stale.
     
     Args:
-        image_paths: List of paths to profile screenshots or a single stitched image path
+        image_path: Path to the image file
+        mtime_ns: Modification time of the file in nanoseconds
+        size: Size of the file in bytes
         
     Returns:
-        Tuple containing the profile name and the full response
+        data: URL of the optimized image
     """
-    # Verify OpenAI API key is set
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        logger.error("OPENAI_API_KEY environment variable is not set")
-        return "unknown", FALLBACK_MESSAGE
+    data = optimize_image(image_path)
+    return f"data:{image_mime_type(data)};base64,{encode_image(data)}"
+
+
+def _image_data_url(image: Union[str, Image.Image]) -> str:
+    """
+    Downscale an image and return it as a base64 data URL for the vision API.
     
-    # Get model from environment or use default
-    model = os.getenv("OPENAI_MODEL", DEFAULT_MODEL)
-    logger.info(f"Using OpenAI model: {model}")
+    Files are memoized in process, so repeated requests for the same unchanged
+    file skip decoding, resizing and re-encoding.
+    
+    Args:
+        image: Path to the image file, or an in-memory PIL image
+        
+    Returns:
+        data: URL with the MIME type matching the optimized encoding
+    """
+    if not isinstance(image, Image.Image):
+        try:
+            stat = os.stat(image)
+        except OSError as e:
+            # Missing or unreadable file; let optimize_image report the problem
+            logger.debug(f"Not caching {image}: {e}")
+        else:
+            return _cached_data_url(str(image), stat.st_mtime_ns, stat.st_size)
     
-    # Initialize OpenAI client
-    client = openai.OpenAI(api_key=api_key)
+    data = optimize_image(image)
+    return f"data:{image_mime_type(data)};base64,{encode_image(data)}"
+
+
+def _build_opener_content(
+    image_paths: Union[List[str], str, List[Image.Image], Image.Image]
+) -> Optional[List[dict]]:
+    """
+    Build the user message content (image parts) for an opener request.
     
+    Args:
+        image_paths: List of paths to profile screenshots or a single stitched image path.
+                     In-memory PIL images (a list of screenshots or one stitched image)
+                     are accepted too and never touch disk.
+        
+    Returns:
+        List of content parts, or None if the stitched image could not be processed
+    """
     # Determine if we need to stitch images
-    single_image_path = ""
-    if isinstance(image_paths, str):
+    single_image = None
+    if isinstance(image_paths, (str, Image.Image)):
         # Single image (already stitched) provided
-        single_image_path = image_paths
-        logger.info(f"Using provided stitched image: {single_image_path}")
-        is_stitched = True
+        single_image = image_paths
+        logger.info(f"Using provided stitched image: {single_image}")
     elif len(image_paths) > 1:
-        # Stitch multiple images into one
+        # Stitch multiple images into one so the request carries a single image.
+        # The composite stays in memory: profiles are stitched concurrently and
+        # a shared file name could hand one request another profile's photos.
         try:
-            single_image_path = stitch_images(image_paths)
-            logger.info(f"Created stitched image: {single_image_path}")
-            is_stitched = True
+            if all(isinstance(image, Image.Image) for image in image_paths):
+                single_image = stitch_grid(image_paths)
+            else:
+                single_image = stitch_grid(load_screenshots(image_paths))
+            logger.info("Created in-memory stitched image")
         except Exception as e:
             logger.error(f"Failed to stitch images: {e}")
             # Fall back to using multiple images
-            single_image_path = ""
-            is_stitched = False
-    else:
-        is_stitched = False
+            single_image = None
     
-    try:
-        # Prepare the content for the API call
-        content = []
+    # Prepare the content for the API call
+    content = []
+    
+    if single_image is not None:
+        # Process single stitched image
+        logger.info(f"Processing stitched image: {single_image}")
         
-        if single_image_path:
-            # Process single stitched image
-            logger.info(f"Processing stitched image: {single_image_path}")
+        try:
+            # Downscale and encode the image in memory
+            image_url = _image_data_url(single_image)
+            
+            # Add to content
+            content.append({
+                "type": "image_url",
+                "image_url": {
+                    "url": image_url,
+                    "detail": OPENER_IMAGE_DETAIL
+                }
+            })
+        except Exception as e:
+            logger.error(f"Error processing stitched image {single_image}: {e}")
+            return None
+    else:
+        # Process and add each image separately
+        for i, image_path in enumerate(image_paths):
+            logger.info(f"Processing image {i+1}/{len(image_paths)}: {image_path}")
             
             try:
-                # Optimize image if needed
-                optimized_path = optimize_image(single_image_path)
-                
-                # Encode the image
-                base64_image = encode_image(optimized_path)
+                # Downscale and encode the image in memory
+                image_url = _image_data_url(image_path)
                 
                 # Add to content
                 content.append({
                     "type": "image_url",
                     "image_url": {
-                        "url": f"data:image/png;base64,{base64_image}",
-                        "detail": "high"  # Use high detail for stitched image
+                        "url": image_url,
+                        "detail": OPENER_IMAGE_DETAIL
                     }
                 })
             except Exception as e:
-                logger.error(f"Error processing stitched image {single_image_path}: {e}")
-                return "unknown", FALLBACK_MESSAGE
-        else:
-            # Process and add each image separately
-            for i, image_path in enumerate(image_paths):
-                logger.info(f"Processing image {i+1}/{len(image_paths)}: {image_path}")
-                
-                try:
-                    # Optimize image if needed
-                    optimized_path = optimize_image(image_path)
-                    
-                    # Encode the image
-                    base64_image = encode_image(optimized_path)
-                    
-                    # Add to content
-                    content.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/png;base64,{base64_image}",
-                            "detail": "low"  # Use "low" detail to reduce token usage
-                        }
-                    })
-                except Exception as e:
-                    logger.error(f"Error processing image {image_path}: {e}")
-                    # Continue with remaining images
+                logger.error(f"Error processing image {image_path}: {e}")
+                # Continue with remaining images
+    
+    return content
+
+
+def _opener_messages(content: List[dict]) -> List[dict]:
+    """
+    Build the chat messages for an opener request.
+    
+    Args:
+        content: Image content parts from _build_opener_content
+        
+    Returns:
+        Messages list with the opener system prompt and the user images
+    """
+    return [_OPENER_SYSTEM_MESSAGE, {"role": "user", "content": content}]
+
+
+@functools.lru_cache(maxsize=None)
+def _batch_system_message(n: int) -> dict:
+    """
+    Return the system message for a batch of n profiles.
+    
+    Args:
+        n: Number of profiles in the batch
+        
+    Returns:
+        System message dict with the batch prompt formatted for n
+    """
+    return {"role": "system", "content": batch_opener_prompt.format(n=n)}
+
+
+def _parse_opener_response(response) -> Tuple[str, str]:
+    """
+    Extract the profile name and full text from an opener completion.
+    
+    Args:
+        response: Chat completion response from the OpenAI API
+        
+    Returns:
+        Tuple containing the profile name and the full response
+    """
+    # Extract the generated opener from the response
+    full_response = response.choices[0].message.content.strip()
+    logger.info(f"Generated full response: {full_response}")
+
+    # Parse the response to extract the name
+    name_match = re.search(r"Name: (.+)", full_response)
+    name = name_match.group(1) if name_match else "unknown"
+
+    return name, full_response
+
+
+def generate_opener(
+    image_paths: Union[List[str], str, List[Image.Image], Image.Image]
+) -> Tuple[str, str]:
+    """
+    Generate a personalized opener based on profile screenshots.
+    
+    Args:
+        image_paths: List of paths to profile screenshots or a single stitched image path,
+                     or the same as in-memory PIL images
+        
+    Returns:
+        Tuple containing the profile name and the full response
+    """
+    # Verify OpenAI API key is set
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        logger.error("OPENAI_API_KEY environment variable is not set")
+        return "unknown", FALLBACK_MESSAGE
+    
+    # Get model from environment or use default
+    model = os.getenv("OPENAI_MODEL", DEFAULT_MODEL)
+    logger.info(f"Using OpenAI model: {model}")
+    
+    # Reuse the cached OpenAI client (and its connection pool)
+    client = _client(api_key)
+    
+    try:
+        content = _build_opener_content(image_paths)
+        if content is None:
+            return "unknown", FALLBACK_MESSAGE
         
         # Call the OpenAI API
         logger.info("Sending request to OpenAI API")
         response = client.chat.completions.create(
             model=model,
-            messages=[
-                {"role": "system", "content": opener_prompt},
-                {"role": "user", "content": content}
-            ],
+            messages=_opener_messages(content),
             max_tokens=MAX_TOKENS,
             temperature=TEMPERATURE
         )
         
-        # Extract the generated opener from the response
-        full_response = response.choices[0].message.content.strip()
-        logger.info(f"Generated full response: {full_response}")
-
-        # Parse the response to extract the name
-        name_match = re.search(r"Name: (.+)", full_response)
-        name = name_match.group(1) if name_match else "unknown"
-
-        return name, full_response
+        return _parse_opener_response(response)
         
     except Exception as e:
         logger.error(f"Error generating opener: {e}")
         return "unknown", FALLBACK_MESSAGE 
 
 
-def gpt_check_ads(image_path: str) -> str:
+async def generate_openers_async(
+    profiles: List[Union[List[str], str]],
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS
+) -> List[Tuple[str, str]]:
+    """
+    Generate openers for several profiles concurrently.
+    
+    Each profile is sent as its own request; at most max_concurrency requests
+    are in flight at once, so a batch takes roughly as long as its slowest call.
+    
+    Args:
+        profiles: One entry per profile, each a list of screenshot paths or a stitched image path
+        max_concurrency: Maximum number of simultaneous API requests
+        
+    Returns:
+        List of (name, full_response) tuples in the same order as profiles
+    """
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        logger.error("OPENAI_API_KEY environment variable is not set")
+        return [("unknown", FALLBACK_MESSAGE) for _ in profiles]
+    
+    model = os.getenv("OPENAI_MODEL", DEFAULT_MODEL)
+    logger.info(f"Using OpenAI model: {model} for {len(profiles)} profiles")
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def bounded_call(client: openai.AsyncOpenAI, image_paths: Union[List[str], str]) -> Tuple[str, str]:
+        async with semaphore:
+            try:
+                # Image decoding/encoding is blocking work, keep it off the event loop
+                content = await asyncio.to_thread(_build_opener_content, image_paths)
+                if content is None:
+                    return "unknown", FALLBACK_MESSAGE
+                
+                logger.info(f"Sending request to OpenAI API for {image_paths}")
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=_opener_messages(content),
+                    max_tokens=MAX_TOKENS,
+                    temperature=TEMPERATURE
+                )
+                return _parse_opener_response(response)
+            except Exception as e:
+                logger.error(f"Error generating opener for {image_paths}: {e}")
+                return "unknown", FALLBACK_MESSAGE
+    
+    # Closing the client releases its HTTP connection pool
+    async with openai.AsyncOpenAI(api_key=api_key) as client:
+        return list(await asyncio.gather(*[bounded_call(client, p) for p in profiles]))
+
+
+def generate_openers_batch(
+    profiles: List[Union[List[str], str]],
+    n: int = BATCH_SIZE
+) -> Dict[int, Tuple[str, str]]:
+    """
+    Generate openers for several profiles with one API request per n profiles.
+    
+    Sending a batch of collages in a single request amortizes the per-request
+    overhead (connection, prompt prefill) across profiles. The model is asked
+    for a JSON object with one entry per profile.
+    
+    Args:
+        profiles: One entry per profile, each a list of screenshot paths or a stitched image path
+        n: Number of profiles per request
+        
+    Returns:
+        Dict mapping profile_id (index into profiles) to a (name, opener) tuple.
+        Profiles that could not be processed map to ("unknown", FALLBACK_MESSAGE).
+    """
+    results = {i: ("unknown", FALLBACK_MESSAGE) for i in range(len(profiles))}
+    
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        logger.error("OPENAI_API_KEY environment variable is not set")
+        return results
+    
+    model = os.getenv("OPENAI_MODEL", DEFAULT_MODEL)
+    logger.info(f"Using OpenAI model: {model} for {len(profiles)} profiles in batches of {n}")
+    
+    client = _client(api_key)
+    
+    for start in range(0, len(profiles), n):
+        batch_ids = range(start, min(start + n, len(profiles)))
+        
+        # Label each profile's images so the model can key its answers
+        content = []
+        sent_ids = []
+        for profile_id in batch_ids:
+            profile_content = _build_opener_content(profiles[profile_id])
+            if not profile_content:
+                logger.warning(f"Skipping profile {profile_id}: no images could be processed")
+                continue
+            content.append({"type": "text", "text": f"Profile {profile_id}"})
+            content.extend(profile_content)
+            sent_ids.append(profile_id)
+        
+        if not content:
+            continue
+        
+        try:
+            logger.info(f"Sending batch request to OpenAI API for profiles {batch_ids.start}-{batch_ids.stop - 1}")
+            response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    # Ask only for the profiles whose images were actually sent
+                    _batch_system_message(len(sent_ids)),
+                    {"role": "user", "content": content}
+                ],
+                max_tokens=MAX_TOKENS * len(sent_ids),
+                temperature=TEMPERATURE,
+                response_format={"type": "json_object"}
+            )
+            
+            parsed = json.loads(response.choices[0].message.content)
+            for entry in parsed.get("openers", []):
+                profile_id = int(entry["profile_id"])
+                if profile_id in sent_ids:
+                    results[profile_id] = (entry.get("name", "unknown"), entry["opener"])
+        except Exception as e:
+            logger.error(f"Error generating openers for batch starting at {start}: {e}")
+    
+    return results
+
+
+def gpt_check_ads(image: Union[str, Image.Image]) -> str:
     """
     Calls OpenAI API to check if a single image screenshot is an advertisement.
 
     Args:
-        image_path: Path to the single screenshot image.
+        image: Path to the single screenshot image, or the captured frame itself
+            (encoded in memory, never written to disk).
 
     Returns:
         str: "YES" if it's an ad, "NO" otherwise (or fallback/error indicator).
@@ -183,19 +459,18 @@ def gpt_check_ads(image_path: str) -> str:
 
     model = os.getenv("OPENAI_MODEL", DEFAULT_MODEL) 
     logger.info(f"Using OpenAI model for ad check: {model}")
-    client = openai.OpenAI(api_key=api_key)
+    client = _client(api_key)
 
     try:
         # Optimize and encode the single image
-        logger.info(f"Processing image for ad check: {image_path}")
-        optimized_path = optimize_image(image_path)
-        base64_image = encode_image(optimized_path)
+        logger.info(f"Processing image for ad check: {image if isinstance(image, str) else 'in-memory frame'}")
+        image_url = _image_data_url(image)
 
         content = [
             {
                 "type": "image_url",
                 "image_url": {
-                    "url": f"data:image/png;base64,{base64_image}",
+                    "url": image_url,
                     "detail": "low" # Low detail might be sufficient for spotting an "AD" label
                 }
             }
@@ -206,7 +481,7 @@ def gpt_check_ads(image_path: str) -> str:
         response = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": ad_check_prompt},
+                _AD_CHECK_SYSTEM_MESSAGE,
                 {"role": "user", "content": content}
             ],
             max_tokens=5,  # Expecting only YES or NO
@@ -247,20 +522,19 @@ def like_or_pass(stitched_image_path: str) -> Tuple[str, str]:
 
     model = os.getenv("OPENAI_MODEL", DEFAULT_MODEL)
     logger.info(f"Using OpenAI model for like/pass: {model}")
-    client = openai.OpenAI(api_key=api_key)
+    client = _client(api_key)
     full_response = "(No response received)" # Initialize in case of early error
 
     try:
         # Optimize and encode the single stitched image
         logger.info(f"Processing stitched image for like/pass: {stitched_image_path}")
-        optimized_path = optimize_image(stitched_image_path)
-        base64_image = encode_image(optimized_path)
+        image_url = _image_data_url(stitched_image_path)
 
         content = [
             {
                 "type": "image_url",
                 "image_url": {
-                    "url": f"data:image/png;base64,{base64_image}",
+                    "url": image_url,
                     "detail": "high" # Use high detail for decision making
                 }
             }
@@ -271,7 +545,7 @@ def like_or_pass(stitched_image_path: str) -> Tuple[str, str]:
         response = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": like_prompt},
+                _LIKE_SYSTEM_MESSAGE,
                 {"role": "user", "content": content}
             ],
             max_tokens=50,  # Increased slightly for reason
@@ -1,49 +1,46 @@
 """Utility functions for image processing and manipulation."""
 
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
+import io
+import math
 import os
 import time
 import logging
 from pathlib import Path
+import numpy as np
 from PIL import Image
 
 logger = logging.getLogger(__name__)
 
-def stitch_images(image_paths: List[str], 
-                 output_dir: Optional[str] = None,
-                 delete_originals: bool = False,
-                 layout: Optional[Tuple[int, int]] = None) -> str:
+# Images sent to the vision API are downscaled to fit within this box
+MAX_IMAGE_SIZE = (1024, 2048)
+JPEG_QUALITY = 82
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"  # Magic bytes at the start of every PNG file
+
+def stitch_grid(images: List[Image.Image],
+                layout: Optional[Tuple[int, int]] = None,
+                canvas: Optional[np.ndarray] = None) -> Image.Image:
     """
-    Stitch multiple screenshots into a single image in a grid layout.
+    Arrange in-memory images into a single grid image.
     
     Args:
-        image_paths: List of paths to the screenshots to stitch
-        output_dir: Directory to save the stitched image (defaults to ./screenshots/stitched)
-        delete_originals: Whether to delete the original images after stitching
+        images: Images to place in reading order
         layout: Optional tuple of (rows, cols) for custom grid layout. 
                Defaults to (2, 3) for backward compatibility.
+        canvas: Optional preallocated (rows*height, cols*width, 3) uint8 array
+               to stitch into, e.g. sized from the first grabbed frame. It is
+               ignored (and a new one allocated) if the frames don't fit it.
         
     Returns:
-        Path to the stitched image file
+        The stitched RGB image
     """
-    if len(image_paths) < 1:
+    if len(images) < 1:
         logger.error("No images provided for stitching")
         raise ValueError("At least one image is required for stitching")
     
-    # Sort images by their index in the filename if available
-    def extract_index(path):
-        try:
-            # Extract number from filename (e.g., profile_screenshot_2_...)
-            filename = os.path.basename(path)
-            parts = filename.split('_')
-            if len(parts) >= 2 and parts[1].isdigit():
-                return int(parts[1])
-        except:
-            pass
-        return 999  # Default high value for files without proper numbering
-        
-    sorted_paths = sorted(image_paths, key=extract_index)
-    num_images = len(sorted_paths)
+    # Resizing below replaces entries; keep the caller's list untouched
+    images = list(images)
+    num_images = len(images)
     
     logger.info(f"Stitching {num_images} images...")
     
@@ -64,13 +61,6 @@ def stitch_images(image_paths: List[str],
             cols = 3
             rows = 2
     
-    # Load all images
-    try:
-        images = [Image.open(path) for path in sorted_paths]
-    except Exception as e:
-        logger.error(f"Error loading images: {e}")
-        raise
-    
     # Ensure all images have the same dimensions
     width, height = images[0].size
     for i, img in enumerate(images):
@@ -78,23 +68,66 @@ def stitch_images(image_paths: List[str],
             logger.warning(f"Image {i+1} has different dimensions. Resizing to match first image.")
             images[i] = img.resize((width, height), Image.LANCZOS)
     
-    # Create a new image with grid layout
+    # Pre-allocate the whole grid once and copy each panel into its cell;
+    # cells left empty by a partial layout stay black as before
     grid_width = width * cols
     grid_height = height * rows
-    stitched_img = Image.new('RGB', (grid_width, grid_height))
+    num_cells = cols * rows
+    if canvas is not None and canvas.shape != (grid_height, grid_width, 3):
+        # e.g. Retina grabs come back at twice the bbox size
+        logger.debug(f"Canvas shape {canvas.shape} doesn't fit {rows}x{cols} grid of {width}x{height}, reallocating")
+        canvas = None
+    if canvas is not None:
+        if num_images < num_cells:
+            canvas[:] = 0
+    elif num_images < num_cells:
+        canvas = np.zeros((grid_height, grid_width, 3), dtype=np.uint8)
+    else:
+        canvas = np.empty((grid_height, grid_width, 3), dtype=np.uint8)
     
-    # Paste images in grid
+    # Copy images into the grid
     for i, img in enumerate(images):
-        if i >= cols * rows:
-            logger.warning(f"Too many images ({num_images}), only using first {cols * rows}")
+        if i >= num_cells:
+            logger.warning(f"Too many images ({num_images}), only using first {num_cells}")
             break
             
         row = i // cols
         col = i % cols
         x = col * width
         y = row * height
-        stitched_img.paste(img, (x, y))
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        canvas[y:y + height, x:x + width] = np.asarray(img)
+    
+    return Image.fromarray(canvas)
+
+def new_grid_canvas(frame_size: Tuple[int, int], layout: Tuple[int, int]) -> np.ndarray:
+    """
+    Allocate an uninitialized canvas for stitch_grid.
+    
+    Args:
+        frame_size: (width, height) of every frame, e.g. the first grabbed frame's size
+        layout: (rows, cols) of the grid
+        
+    Returns:
+        An empty (rows*height, cols*width, 3) uint8 array
+    """
+    width, height = frame_size
+    rows, cols = layout
+    return np.empty((rows * height, cols * width, 3), dtype=np.uint8)
+
+def save_stitched_image(stitched_img: Image.Image, image_format: str = "PNG") -> str:
+    """
+    Save a stitched profile image under ./screenshots/profile_YYYYMMDD/.
     
+    Args:
+        stitched_img: The stitched image, e.g. from stitch_grid
+        image_format: "PNG" (lossless, default) or "JPEG" (much smaller, for images
+               that are only sent to the vision API)
+        
+    Returns:
+        Path to the stitched image file
+    """
     # Generate directory name based on date
     date_str = time.strftime("%Y%m%d")
     profile_dir = Path(f"./screenshots/profile_{date_str}")
@@ -102,19 +135,82 @@ def stitch_images(image_paths: List[str],
     
     # Generate timestamp for unique filename
     timestamp = time.strftime("%H%M%S")
-    stitched_path = profile_dir / f"profile_stitched_{timestamp}.png"
+    extension = "jpg" if image_format.upper() == "JPEG" else "png"
+    stitched_path = profile_dir / f"profile_stitched_{timestamp}.{extension}"
     
     # Save the stitched image
     try:
-        stitched_img.save(stitched_path, format="PNG", dpi=(300, 300))
+        if extension == "jpg":
+            # High quality since optimize_image re-encodes it before upload
+            stitched_img.save(stitched_path, format="JPEG", quality=95, dpi=(300, 300))
+        else:
+            stitched_img.save(stitched_path, format="PNG", dpi=(300, 300))
         logger.info(f"Stitched image saved to: {stitched_path}")
     except Exception as e:
         logger.error(f"Error saving stitched image: {e}")
         raise
     
+    return str(stitched_path)
+
+def _screenshot_index(path: str) -> int:
+    """Index of a screenshot from its filename (e.g. profile_2_...), for sorting."""
+    try:
+        # Extract number from filename (e.g., profile_screenshot_2_...)
+        filename = os.path.basename(path)
+        parts = filename.split('_')
+        if len(parts) >= 2 and parts[1].isdigit():
+            return int(parts[1])
+    except:
+        pass
+    return 999  # Default high value for files without proper numbering
+
+def load_screenshots(image_paths: List[str]) -> List[Image.Image]:
+    """
+    Open screenshots in the order stitch_images places them.
+    
+    Args:
+        image_paths: List of paths to the screenshots
+        
+    Returns:
+        The opened images, sorted by the index in their filenames
+    """
+    try:
+        return [Image.open(path) for path in sorted(image_paths, key=_screenshot_index)]
+    except Exception as e:
+        logger.error(f"Error loading images: {e}")
+        raise
+
+def stitch_images(image_paths: List[str], 
+                 output_dir: Optional[str] = None,
+                 delete_originals: bool = False,
+                 layout: Optional[Tuple[int, int]] = None,
+                 image_format: str = "PNG") -> str:
+    """
+    Stitch multiple screenshots into a single image in a grid layout.
+    
+    Args:
+        image_paths: List of paths to the screenshots to stitch
+        output_dir: Directory to save the stitched image (defaults to ./screenshots/stitched)
+        delete_originals: Whether to delete the original images after stitching
+        layout: Optional tuple of (rows, cols) for custom grid layout. 
+               Defaults to (2, 3) for backward compatibility.
+        image_format: "PNG" (lossless, default) or "JPEG" (much smaller, for images
+               that are only sent to the vision API)
+        
+    Returns:
+        Path to the stitched image file
+    """
+    if len(image_paths) < 1:
+        logger.error("No images provided for stitching")
+        raise ValueError("At least one image is required for stitching")
+    
+    images = load_screenshots(image_paths)
+    
+    stitched_path = save_stitched_image(stitch_grid(images, layout), image_format)
+    
     # Delete original images if requested
     if delete_originals:
-        for path in sorted_paths:
+        for path in image_paths:
             try:
                 os.remove(path)
                 logger.debug(f"Deleted original image: {os.path.basename(path)}")
@@ -123,43 +219,76 @@ def stitch_images(image_paths: List[str],
     
     return str(stitched_path)
 
-def optimize_image(image_path: str, max_size_mb: float = 5.0) -> str:
+def optimize_image(image: Union[str, Image.Image],
+                   max_size: Tuple[int, int] = MAX_IMAGE_SIZE,
+                   quality: int = JPEG_QUALITY) -> bytes:
     """
-    Optimize an image to reduce its size if needed.
+    Downscale an image and re-encode it in memory for upload.
+    
+    Vision requests are billed and slowed by image resolution, so every image
+    is shrunk to fit within max_size before it is sent, regardless of its
+    size on disk. Screenshots are photographic and compress far better as
+    JPEG; images with an alpha channel are kept as PNG so transparency is
+    not flattened.
     
     Args:
-        image_path: Path to the image file
-        max_size_mb: Maximum size in MB
+        image: Path to the image file, or an in-memory PIL image
+        max_size: Maximum (width, height) of the returned image
+        quality: JPEG quality (1-95)
         
     Returns:
-        Path to the optimized image (same as input if no optimization needed)
+        JPEG-encoded image bytes, or PNG bytes if the image has alpha
     """
-    # Check current file size
-    file_size_mb = os.path.getsize(image_path) / (1024 * 1024)
-    
-    # If file is already small enough, return the original path
-    if file_size_mb <= max_size_mb:
-        return image_path
-    
-    logger.info(f"Image {image_path} is {file_size_mb:.2f}MB, optimizing to under {max_size_mb}MB")
-    
-    # Open and resize the image
-    img = Image.open(image_path)
-    
-    # Calculate scaling factor based on current size
-    scale_factor = (max_size_mb / file_size_mb) ** 0.5
-    new_width = int(img.width * scale_factor)
-    new_height = int(img.height * scale_factor)
-    
-    # Resize the image
-    resized_img = img.resize((new_width, new_height), Image.LANCZOS)
+    if isinstance(image, Image.Image):
+        # thumbnail() resizes in place, so work on a copy of the caller's image
+        source = "in-memory image"
+        img = image.copy()
+    else:
+        source = image
+        img = Image.open(image)
     
-    # Prepare new filename
-    path = Path(image_path)
-    new_path = path.parent / f"{path.stem}_optimized{path.suffix}"
+    with img:
+        original_size = img.size
+        
+        # JPEGs can be decoded straight at 1/2, 1/4 or 1/8 scale; ask for the
+        # smallest scale that still covers the target so the full-resolution
+        # IDCT is skipped. thumbnail() only does this with a 2x safety margin.
+        if img.format == "JPEG":
+            scale = min(max_size[0] / img.width, max_size[1] / img.height)
+            if scale < 1:
+                img.draft("RGB", (math.ceil(img.width * scale), math.ceil(img.height * scale)))
+        
+        img.thumbnail(max_size, Image.LANCZOS)
+        
+        has_alpha = img.mode in ("RGBA", "LA") or (
+            img.mode == "P" and "transparency" in img.info
+        )
+        
+        buffer = io.BytesIO()
+        if has_alpha:
+            img.save(buffer, format="PNG", optimize=True)
+        else:
+            # JPEG has no alpha channel
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            img.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+        optimized_size = img.size
     
-    # Save with optimization
-    resized_img.save(new_path, optimize=True, quality=85)
+    data = buffer.getvalue()
+    logger.info(
+        f"Optimized {source}: {original_size[0]}x{original_size[1]} -> "
+        f"{optimized_size[0]}x{optimized_size[1]}, {len(data) / 1024:.1f}KB"
+    )
+    return data
+
+def image_mime_type(data: bytes) -> str:
+    """
+    Return the MIME type of image bytes produced by optimize_image.
     
-    logger.info(f"Optimized image saved to {new_path}")
-    return str(new_path) 
\ No newline at end of file
+    Args:
+        data: Encoded image bytes
+        
+    Returns:
+        "image/png" for PNG data, otherwise "image/jpeg"
+    """
+    return "image/png" if data.startswith(PNG_SIGNATURE) else "image/jpeg"
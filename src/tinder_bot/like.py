@@ -6,6 +6,8 @@ import pyautogui # Import pyautogui
 import time      # Import time
 import os        # Import os to check environment
 import random    # Import random
+from functools import lru_cache
+from typing import Tuple
 
 # Import the function that calls the API (will be created in gpt.py)
 from tinder_bot.gpt import like_or_pass 
@@ -15,6 +17,11 @@ from tinder_bot.scroll import LIKE_BUTTON, PASS_BUTTON, ENVIRONMENT, get_safe_co
 logger = logging.getLogger(__name__)
 console = Console()
 
+@lru_cache(maxsize=None)
+def _button_position(button: Tuple[int, int]) -> Tuple[int, int]:
+    """Return a button's click position clamped to the screen (both fixed for the run)."""
+    return get_safe_coordinates(button[0], button[1])
+
 def like_photo(stitched_image_path: str, debug: bool):
     """
     Coordinates the process of deciding whether to like or pass a profile based on its image.
@@ -29,7 +36,7 @@ def like_photo(stitched_image_path: str, debug: bool):
     final_action = "PASS" # Default action, especially if errors occur early
     ai_reason = "(Decision process failed early)" # Default reason
     try:
-        logger.info(f"Starting like/pass decision for image: {stitched_image_path}")
+        logger.info("Starting like/pass decision for image: %s", stitched_image_path)
         
         # Step 1: Get AI decision and reason
         # like_or_pass now returns a tuple (decision, reason)
@@ -42,32 +49,32 @@ def like_photo(stitched_image_path: str, debug: bool):
                 final_action = "LIKE"
                 # Print decision and reason
                 console.print(f"[bold green]Decision: LIKE[/bold green] - Reason: {ai_reason}")
-                logger.info(f"AI: LIKE (Reason: {ai_reason}), Probability < 0.95 ({like_probability:.2f}). Final Action: {final_action}")
+                logger.info("AI: LIKE (Reason: %s), Probability < 0.95 (%.2f). Final Action: %s", ai_reason, like_probability, final_action)
             else: # 5% chance to PASS instead
                 final_action = "PASS" # Override
                 # Print decision, override, and reason
                 console.print(f"[bold green]Decision: LIKE[/bold green] -> [bold red](Override) PASS[/bold red] - Reason: {ai_reason}")
-                logger.info(f"AI: LIKE (Reason: {ai_reason}), Probability >= 0.95 ({like_probability:.2f}). Overriding. Final Action: {final_action}")
+                logger.info("AI: LIKE (Reason: %s), Probability >= 0.95 (%.2f). Overriding. Final Action: %s", ai_reason, like_probability, final_action)
         elif ai_decision == "PASS":
             final_action = "PASS"
             # Print decision and reason
             console.print(f"[bold red]Decision: PASS[/bold red] - Reason: {ai_reason}")
-            logger.info(f"AI: PASS (Reason: {ai_reason}). Final Action: {final_action}")
+            logger.info("AI: PASS (Reason: %s). Final Action: %s", ai_reason, final_action)
         else: # This case should technically not be reached if like_or_pass always returns LIKE/PASS
               # But keeping it as a safeguard. ai_decision might contain error info if tuple return failed (though unlikely now)
             final_action = "PASS"
             console.print(f"[bold yellow]Warning:[/bold yellow] Unexpected state after AI decision ('{ai_decision}'). Defaulting to PASS. Detail: {ai_reason}")
-            logger.warning(f"Unexpected state after AI decision: {ai_decision}. Reason/Detail: {ai_reason}. Final Action: {final_action} (Fallback)")
+            logger.warning("Unexpected state after AI decision: %s. Reason/Detail: %s. Final Action: %s (Fallback)", ai_decision, ai_reason, final_action)
 
         # Step 3: Execute the final action (Clicking or Placeholder)
-        logger.info(f"Preparing to execute final action: {final_action}")
+        logger.info("Preparing to execute final action: %s", final_action)
         if ENVIRONMENT == "AIR":
             if final_action == "LIKE":
                 if LIKE_BUTTON:
-                    safe_x, safe_y = get_safe_coordinates(LIKE_BUTTON[0], LIKE_BUTTON[1])
-                    logger.info(f"Clicking LIKE button at safe coordinates: ({safe_x}, {safe_y})")
+                    safe_x, safe_y = _button_position(LIKE_BUTTON)
+                    logger.info("Clicking LIKE button at safe coordinates: (%s, %s)", safe_x, safe_y)
                     like_delay = random.uniform(1.0, 2.0)
-                    logger.debug(f"Waiting {like_delay:.2f}s before clicking LIKE...")
+                    logger.debug("Waiting %.2fs before clicking LIKE...", like_delay)
                     time.sleep(like_delay)
                     pyautogui.click(safe_x, safe_y)
                     time.sleep(0.5) # Small delay after click
@@ -77,10 +84,10 @@ def like_photo(stitched_image_path: str, debug: bool):
             
             elif final_action == "PASS": # Covers decision == PASS, LIKE override, and unexpected fallback
                  if PASS_BUTTON:
-                    safe_x, safe_y = get_safe_coordinates(PASS_BUTTON[0], PASS_BUTTON[1])
-                    logger.info(f"Clicking PASS button at safe coordinates: ({safe_x}, {safe_y})")
+                    safe_x, safe_y = _button_position(PASS_BUTTON)
+                    logger.info("Clicking PASS button at safe coordinates: (%s, %s)", safe_x, safe_y)
                     pass_delay = random.uniform(1.0, 2.0)
-                    logger.debug(f"Waiting {pass_delay:.2f}s before clicking PASS...")
+                    logger.debug("Waiting %.2fs before clicking PASS...", pass_delay)
                     time.sleep(pass_delay)
                     pyautogui.click(safe_x, safe_y)
                     time.sleep(0.5) # Small delay after click
@@ -92,21 +99,21 @@ def like_photo(stitched_image_path: str, debug: bool):
              console.print(f"[italic yellow]Placeholder: Final action is {final_action}. (Environment: {ENVIRONMENT})[/italic yellow]")
 
     except Exception as e:
-        logger.error(f"Error during like/pass decision process for {stitched_image_path}: {e}", exc_info=True)
+        logger.error("Error during like/pass decision process for %s: %s", stitched_image_path, e, exc_info=True)
         # Print error and the last known reason (which might be the default or from the API call error)
         console.print(f"[bold red]Error:[/bold red] Failed to make like/pass decision. See logs. Last recorded reason/detail: {ai_reason}")
         # Fallback action on error - still attempt to click PASS if possible in AIR env
         if ENVIRONMENT == "AIR" and PASS_BUTTON:
             try:
-                safe_x, safe_y = get_safe_coordinates(PASS_BUTTON[0], PASS_BUTTON[1])
-                logger.error(f"Error occurred. Clicking PASS as fallback at safe coordinates: ({safe_x}, {safe_y})")
+                safe_x, safe_y = _button_position(PASS_BUTTON)
+                logger.error("Error occurred. Clicking PASS as fallback at safe coordinates: (%s, %s)", safe_x, safe_y)
                 error_pass_delay = random.uniform(1.0, 2.0)
-                logger.debug(f"Waiting {error_pass_delay:.2f}s before clicking PASS (error fallback)...")
+                logger.debug("Waiting %.2fs before clicking PASS (error fallback)...", error_pass_delay)
                 time.sleep(error_pass_delay)
                 pyautogui.click(safe_x, safe_y)
                 time.sleep(0.5)
             except Exception as click_err:
-                 logger.error(f"Error attempting fallback PASS click: {click_err}", exc_info=True)
+                 logger.error("Error attempting fallback PASS click: %s", click_err, exc_info=True)
                  console.print("[bold red]Error:[/bold red] Failed during fallback PASS click.")
         else:
             # Log placeholder if not AIR or PASS_BUTTON is undefined during error
@@ -0,0 +1,112 @@
+"""Logging handlers used by the CLIs, and the setup that wires them to the root logger."""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FILE_BUFFER = 64 * 1024  # Bytes buffered before the log file is written
+
+# Accepted LOG_LEVEL values (matched case-insensitively) and their numeric levels
+LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that batches writes through a large buffer.
+    
+    logging.FileHandler flushes after every record, i.e. one write() syscall
+    per log line. This handler only flushes on ERROR and above, so routine
+    DEBUG/INFO records in the scroll and capture loops are written in
+    LOG_FILE_BUFFER-sized chunks. Anything still buffered is written when
+    logging shuts down at interpreter exit (logging.shutdown closes every
+    handler). With delay=True, neither the file nor its directory is
+    created until the first record is written.
+    """
+
+    def __init__(self, filename, mode="a", encoding=None, delay=False, errors=None,
+                 buffer_size: int = LOG_FILE_BUFFER):
+        self.buffer_size = buffer_size
+        super().__init__(filename, mode, encoding, delay, errors)
+
+    def _open(self):
+        """Open the log file with a buffer_size write buffer, creating its directory if needed."""
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record, flushing only for ERROR and above."""
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the QueueListener's handlers.
+    
+    The stock QueueHandler formats each record before enqueueing it (and
+    flattens exc_info into text), which keeps the formatting cost on the
+    logging thread and loses RichHandler's rich tracebacks. Records are
+    only consumed in-process, so they can be enqueued untouched.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Enqueue the record as-is."""
+        return record
+
+
+def configure_queue_logging(log_file, level: int, console=None) -> DeferredQueueHandler:
+    """
+    Route the root logger through a queue to a Rich console handler and a buffered log file.
+    
+    Records are formatted and written on a QueueListener thread, so the bot's
+    loops only enqueue them. The listener is stopped at exit, which drains the
+    queue before logging.shutdown flushes and closes the file.
+    
+    Args:
+        log_file: Path of the log file; it (and its directory) is only created
+                  when the first record is written
+        level: Numeric log level for the root logger and both handlers
+        console: Optional Rich console for the console handler
+        
+    Returns:
+        The queue handler installed on the root logger
+    """
+    from rich.logging import RichHandler
+    
+    # Rich tracebacks pull in pygments for highlighting; quiet runs get the plain
+    # traceback from the formatter instead
+    rich_handler = RichHandler(console=console, rich_tracebacks=level <= logging.INFO, level=level)
+    # Buffered, so DEBUG runs don't pay a write() syscall per log line, and
+    # delayed, so a run that logs nothing leaves no empty file (or log dir) behind
+    file_handler = BufferedFileHandler(log_file, delay=True)
+    file_handler.setLevel(level)
+    
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    rich_handler.setFormatter(formatter)
+    file_handler.setFormatter(formatter)
+    
+    queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+    queue_handler.listener = QueueListener(queue_handler.queue, rich_handler, file_handler, respect_handler_level=True)
+    queue_handler.listener.start()
+    atexit.register(queue_handler.listener.stop)
+    
+    # Configure the root logger - this affects ALL loggers in the application
+    logging.basicConfig(level=level, handlers=[queue_handler])
+    return queue_handler
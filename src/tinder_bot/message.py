@@ -1,6 +1,8 @@
 """Message input module for sending openers in Tinder chats."""
 
 import pyautogui
+import pyperclip
+import sys
 import time
 import random
 import logging
@@ -12,6 +14,7 @@ logger = logging.getLogger(__name__)
 MAX_MESSAGE_LENGTH = 200  # Maximum message length (per requirements)
 TYPING_SPEED_MIN = 0.01  # Minimum delay between characters for human-like typing
 TYPING_SPEED_MAX = 0.03  # Maximum delay
+PASTE_MODIFIER = "command" if sys.platform == "darwin" else "ctrl"  # Modifier for the paste shortcut
 
 
 def send_opener(opener: str, bbox: Tuple[int, int, int, int]) -> None:
@@ -47,12 +50,19 @@ def send_opener(opener: str, bbox: Tuple[int, int, int, int]) -> None:
     # Wait a moment before typing
     time.sleep(random.uniform(0.5, 1.0))
     
-    # Type the message (with human-like timing)
-    logger.debug("Typing opener message")
-    pyautogui.typewrite(opener)
-    
-    # Wait a moment after typing
-    time.sleep(random.uniform(0.5, 1.0))
+    # Paste the message in one go; typing it key by key scales with its length
+    # and cannot enter emoji or other non-ASCII characters
+    logger.debug("Pasting opener message")
+    previous_clipboard = pyperclip.paste()
+    try:
+        pyperclip.copy(opener)
+        pyautogui.hotkey(PASTE_MODIFIER, "v")
+        
+        # Wait a moment after pasting
+        time.sleep(random.uniform(0.5, 1.0))
+    finally:
+        # Give the user back whatever they had copied
+        pyperclip.copy(previous_clipboard)
     
     # Find and click the send button (usually to the right of the text field)
     # In Tinder, this might be at the right edge of the text input area
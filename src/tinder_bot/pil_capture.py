@@ -2,7 +2,6 @@
 
 from typing import List, Tuple, Optional
 from PIL import Image
-import pyautogui
 import os
 import logging
 from datetime import datetime
@@ -10,6 +9,8 @@ import math
 import numpy as np
 from pathlib import Path
 
+from tinder_bot.capture import capture_screen
+
 logger = logging.getLogger(__name__)
 
 # iPhone aspect ratio (width:height)
@@ -31,7 +32,7 @@ def take_screenshot() -> Image.Image:
         PIL.Image: Screenshot as PIL Image
     """
     logger.debug("Taking full screenshot")
-    screenshot = pyautogui.screenshot()
+    screenshot = capture_screen()
     logger.debug(f"Took screenshot with dimensions: {screenshot.size}")
     return screenshot
 
@@ -156,6 +157,9 @@ def split_profile_blocks(
     width, height = cropped_screen.size
     block_height = height // num_blocks
     
+    # Convert once; each block below is a zero-copy row slice of this array
+    screen_array = np.asarray(cropped_screen)
+    
     blocks = []
     for i in range(num_blocks):
         # Calculate the top and bottom coordinates for this block
@@ -163,8 +167,7 @@ def split_profile_blocks(
         # For the last block, include any remaining pixels
         bottom = height if i == num_blocks - 1 else (i + 1) * block_height
         
-        # Crop to get this block
-        block = cropped_screen.crop((0, top, width, bottom))
+        block = Image.fromarray(screen_array[top:bottom])
         blocks.append(block)
         
         logger.debug(f"Created block {i+1}/{num_blocks}: {block.size}")
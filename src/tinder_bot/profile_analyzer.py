@@ -4,14 +4,13 @@ import typer
 import logging
 import os
 from rich.console import Console
-from rich.logging import RichHandler
 from dotenv import load_dotenv
 from datetime import datetime
 from pathlib import Path
 import time
-import pyautogui
 import random
 from typing import List
+from concurrent.futures import ThreadPoolExecutor
 
 # Initialize Typer app
 app = typer.Typer(help="Tinder Profile Analyzer - Get personalized profile improvement suggestions")
@@ -30,30 +29,23 @@ MAX_COMPARISON_PROFILES = 20
 
 def setup_logging():
     """Set up logging with Rich handler."""
+    from tinder_bot.log_handlers import LOG_LEVELS, configure_queue_logging
+    
     log_level = os.getenv("LOG_LEVEL", "ERROR")
     log_dir = os.getenv("LOG_DIR", "./logs")
     
-    # Create log directory if it doesn't exist
-    Path(log_dir).mkdir(exist_ok=True)
-    
     # Create log file with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_file = Path(log_dir) / f"tinder_bot_{timestamp}.log"
     
-    # Get the numeric log level
-    numeric_level = getattr(logging, log_level)
-    
-    # Create handlers with the correct level
-    rich_handler = RichHandler(console=console, rich_tracebacks=True, level=numeric_level)
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(numeric_level)
+    # Get the numeric log level; reject typos with a clean CLI error, not a traceback
+    numeric_level = LOG_LEVELS.get(log_level.upper())
+    if numeric_level is None:
+        raise typer.BadParameter(
+            f"Bad LOG_LEVEL={log_level!r}, expected one of {', '.join(LOG_LEVELS)}"
+        )
     
-    # Configure the root logger - this affects ALL loggers in the application
-    logging.basicConfig(
-        level=numeric_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[rich_handler, file_handler]
-    )
+    configure_queue_logging(log_file, numeric_level, console)
     
     # Get the logger for this module
     logger = logging.getLogger(__name__)
@@ -66,6 +58,9 @@ def analyze(
     debug: bool = typer.Option(
         False, "--debug", help="Run in debug mode with extra output"
     ),
+    verify_window: bool = typer.Option(
+        False, "--verify-window", help="Pause after positioning the mouse on the iPhone window so it can be checked visually"
+    ),
     env: str = typer.Option(
         "MONITOR", "--env", help="Environment to use (MONITOR or MAC)"
     ),
@@ -81,17 +76,18 @@ def analyze(
     """
     # Set environment variables
     os.environ["ENVIRONMENT"] = env
-    os.environ["DEBUG_SCROLL"] = str(debug).lower()
+    # Visual verification pauses are opt-in; --debug only raises verbosity
+    os.environ["DEBUG_SCROLL"] = str(verify_window).lower()
     
     # Set up logging BEFORE importing modules
     logger = setup_logging()
     
     # Import dependencies after setting environment variables
     from tinder_bot.window import find_iphone_window
-    from tinder_bot.capture import take_high_quality_screenshot, delete_screenshots
+    from tinder_bot.capture import frame_grabber, save_screenshot, delete_screenshots, screenshot_paths as build_screenshot_paths
     from tinder_bot.scroll import (
         FIRST_SCROLL_AMOUNT, SUBSEQUENT_SCROLL_AMOUNT, SCROLL_DELAY,
-        UP_SCROLL_AMOUNT, STEPS_PER_SCROLL, perform_stepped_scroll, get_hardcoded_window
+        UP_SCROLL_AMOUNT, STEPS_PER_SCROLL, perform_stepped_scroll, get_hardcoded_window, click_at
     )
     from tinder_bot.gpt import generate_opener
     from tinder_bot.image_utils import stitch_images
@@ -150,31 +146,39 @@ def analyze(
             
             # Step 3: Capture profile screenshots
             console.print("\n[bold]Step 2:[/bold] Capturing your profile...")
-            screenshot_paths = []
-            
-            # Take initial screenshot
-            initial_path = take_high_quality_screenshot(bbox, 1, timestamp, output_dir=MY_PROFILE_DIR)
-            screenshot_paths.append(initial_path)
+            # Every output path is known up front; build them once outside the scroll loop
+            output_paths = build_screenshot_paths(timestamp, NUM_MY_PROFILE_SCROLLS + 1, output_dir=MY_PROFILE_DIR)
+            grab_frame = frame_grabber(bbox)
             
-            # Scroll and capture remaining screenshots
-            for i in range(NUM_MY_PROFILE_SCROLLS):
-                scroll_amount = FIRST_SCROLL_AMOUNT if i == 0 else SUBSEQUENT_SCROLL_AMOUNT
+            # Grab on this thread, but encode and write each PNG in the background
+            # so the next scroll starts as soon as the pixels are in memory
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="screenshot-save") as io_pool:
+                save_futures = []
                 
-                # Ensure focus and scroll
-                pyautogui.moveTo(center_x, center_y, duration=0.3)
-                pyautogui.click()
-                time.sleep(0.1)
+                # Take initial screenshot
+                save_futures.append(io_pool.submit(save_screenshot, grab_frame(), 1, timestamp, path=output_paths[0]))
                 
-                console.print(f"Scroll {i+1}/{NUM_MY_PROFILE_SCROLLS}: {scroll_amount} pixels...")
-                perform_stepped_scroll(scroll_amount)
-                time.sleep(SCROLL_DELAY)
+                # Scroll and capture remaining screenshots
+                for i in range(NUM_MY_PROFILE_SCROLLS):
+                    scroll_amount = FIRST_SCROLL_AMOUNT if i == 0 else SUBSEQUENT_SCROLL_AMOUNT
+                    
+                    # Ensure focus and scroll
+                    click_at(center_x, center_y)
+                    time.sleep(0.1)
+                    
+                    console.print(f"Scroll {i+1}/{NUM_MY_PROFILE_SCROLLS}: {scroll_amount} pixels...")
+                    perform_stepped_scroll(scroll_amount)
+                    time.sleep(SCROLL_DELAY)
+                    
+                    # Capture screenshot
+                    screenshot_number = i + 2
+                    save_futures.append(io_pool.submit(
+                        save_screenshot, grab_frame(), screenshot_number, timestamp,
+                        path=output_paths[screenshot_number - 1]
+                    ))
                 
-                # Capture screenshot
-                screenshot_number = i + 2
-                screenshot_path = take_high_quality_screenshot(
-                    bbox, screenshot_number, timestamp, output_dir=MY_PROFILE_DIR
-                )
-                screenshot_paths.append(screenshot_path)
+                # Every file has to be on disk before stitching reads them back
+                screenshot_paths = [future.result() for future in save_futures]
             
             # Step 4: Stitch your profile screenshots (2x4 layout)
             console.print("\n[bold]Step 3:[/bold] Creating profile composite...")
@@ -251,7 +255,7 @@ def analyze(
         console.print(f"Stitched image saved as: {profile_image_path}")
         
         # Save the full response
-        analysis_file_path.write_text(full_response)
+        analysis_file_path.write_text(full_response, encoding="utf-8", newline="\n")
         console.print(f"Analysis saved to: {analysis_file_path}")
         
         console.print("\n[bold green]Done![/bold green] Profile analysis completed successfully.")
@@ -6,16 +6,22 @@ from pathlib import Path
 import time
 import pyautogui
 import random
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console # Import Console
 from datetime import datetime # Import datetime
+from PIL import Image
 
 # --- Import project modules ---
 from tinder_bot.window import find_iphone_window 
 from tinder_bot.capture import delete_screenshots # Import delete_screenshots
 from tinder_bot.scroll import get_hardcoded_window # Keep this import here
 # Import the new capture and stitch function
-from tinder_bot.capture_and_stitch import capture_and_stitch_profile
+from tinder_bot.capture_and_stitch import capture_and_stitch_profile, capture_profile_image
+
+# Deleting a stitched profile's originals runs here, overlapping the like/pass or opener
+# GPT call that follows; pool threads are joined at interpreter exit
+_CLEANUP_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot-cleanup")
 
 
 # --- Helper Function to Process a Single Profile ---
@@ -25,11 +31,14 @@ def process_single_profile(
     logger: logging.Logger, 
     console: Console,
     keep_screenshots: bool,
-    debug: bool # Add debug flag parameter
-) -> Tuple[Optional[str], Optional[Tuple[int, int, int, int]]]:
+    debug: bool, # Add debug flag parameter
+    in_memory: bool = False
+) -> Tuple[Optional[Union[str, Image.Image]], Optional[Tuple[int, int, int, int]]]:
     """
     Finds the profile window, then calls capture_and_stitch_profile to get the stitched image.
     Handles deletion of original screenshots if requested.
+    With in_memory=True the profile is captured and stitched without writing any files,
+    and the stitched PIL image is returned instead of a path.
     Returns the path to the stitched image and the bounding box, or None if an error occurs.
     """
     stitched_path: Optional[str] = None
@@ -54,6 +63,19 @@ def process_single_profile(
         if debug:
             console.print(f"Found iPhone window at ({bbox[0]}, {bbox[1]}) with size {bbox[2]}x{bbox[3]}")
         
+        if in_memory:
+            stitched_image = capture_profile_image(
+                bbox=bbox, 
+                env=env, 
+                num_scrolls=num_scrolls, 
+                logger=logger, 
+                console=console,
+                debug=debug
+            )
+            if stitched_image is None:
+                logger.error("Failed to capture and stitch profile image.")
+            return stitched_image, bbox
+        
         # Step 2, 3, 4 & Stitching: Call the dedicated function, passing debug flag
         stitched_path, screenshot_paths = capture_and_stitch_profile(
             bbox=bbox, 
@@ -73,13 +95,12 @@ def process_single_profile(
                  delete_screenshots(screenshot_paths)
              return None, bbox # Return None for path, but bbox might be useful
 
-        # Handle deletion of originals if successfully stitched and not keeping
+        # Handle deletion of originals if successfully stitched and not keeping; nothing
+        # reads them again, so the caller doesn't wait for it
         if not keep_screenshots and screenshot_paths:
             if debug:
-                console.print("\nDeleting original screenshots...")
-            deleted_count = delete_screenshots(screenshot_paths)
-            if debug:
-                console.print(f"Deleted {deleted_count} original screenshots.")
+                console.print(f"\nDeleting {len(screenshot_paths)} original screenshots in the background...")
+            _CLEANUP_POOL.submit(delete_screenshots, screenshot_paths)
             
         # Return stitched path and bbox
         return stitched_path, bbox
@@ -1,13 +1,37 @@
 """Profile scrolling module for navigating Tinder profiles."""
 
 from typing import Tuple, Optional
+import functools
 import pyautogui
+import numpy as np
+import sys
 import time
 import logging
 import os
 
+from tinder_bot.capture import grab_region
+
 logger = logging.getLogger(__name__)
 
+# On macOS, post scroll-wheel events straight to Quartz; pyautogui adds its own
+# per-call overhead and pause on top of the same CoreGraphics call
+if sys.platform == "darwin":
+    try:
+        import Quartz
+    except ImportError:
+        Quartz = None
+else:
+    Quartz = None
+
+# On Windows, focus clicks go straight to user32 for the same reason
+if sys.platform == "win32":
+    import ctypes
+    _user32 = ctypes.windll.user32
+else:
+    _user32 = None
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
+
 # Constants for scrolling behavior
 FIRST_SCROLL_AMOUNT = -520  # First scroll amount (negative for downward)
 SUBSEQUENT_SCROLL_AMOUNT = -720  # Subsequent scroll amount
@@ -19,6 +43,12 @@ UP_SCROLL_AMOUNT = 600  # For scrolling back up
 STEPS_PER_SCROLL = 10  # Break each scroll into 10 smaller steps
 STEP_DELAY = 0.01  # Small delay between steps
 
+# Settle detection: poll the window until consecutive frames stop changing
+SETTLE_TIMEOUT = 2.0  # Give up waiting after this many seconds
+SETTLE_POLL = 0.08  # Seconds between sampled frames
+SETTLE_THRESHOLD = 1.0  # Mean absolute pixel difference (0-255) treated as "no change"
+SETTLE_SAMPLE_SIZE = (64, 128)  # (width, height) the window is subsampled to for comparison
+
 # Click position for AIR environment (initialized, set below)
 NEXT_PHOTO_POS: Optional[Tuple[int, int]] = None 
 
@@ -60,8 +90,8 @@ elif ENVIRONMENT == "PRO":
     IPHONE_WIDTH = IPHONE_X_END - IPHONE_X_BEGIN
     IPHONE_HEIGHT = IPHONE_Y_END - IPHONE_Y_BEGIN
     
-    logger.info(f"Using PRO configuration with iPhone dimensions: {IPHONE_WIDTH}x{IPHONE_HEIGHT}")
-    logger.info(f"iPhone position: ({IPHONE_X_BEGIN}, {IPHONE_Y_BEGIN}) to ({IPHONE_X_END}, {IPHONE_Y_END})")
+    logger.info("Using PRO configuration with iPhone dimensions: %sx%s", IPHONE_WIDTH, IPHONE_HEIGHT)
+    logger.info("iPhone position: (%s, %s) to (%s, %s)", IPHONE_X_BEGIN, IPHONE_Y_BEGIN, IPHONE_X_END, IPHONE_Y_END)
 
 elif ENVIRONMENT == "AIR":
     # MacBook Air configuration (PLACEHOLDER - UPDATE THESE VALUES)
@@ -86,20 +116,24 @@ elif ENVIRONMENT == "AIR":
     IPHONE_HEIGHT = IPHONE_Y_END - IPHONE_Y_BEGIN
 
     logger.warning("Using AIR configuration with PLACEHOLDER iPhone dimensions. Update src/tinder_bot/scroll.py!")
-    logger.info(f"Placeholder AIR dimensions: {IPHONE_WIDTH}x{IPHONE_HEIGHT}")
-    logger.info(f"Placeholder AIR position: ({IPHONE_X_BEGIN}, {IPHONE_Y_BEGIN}) to ({IPHONE_X_END}, {IPHONE_Y_END})")
+    logger.info("Placeholder AIR dimensions: %sx%s", IPHONE_WIDTH, IPHONE_HEIGHT)
+    logger.info("Placeholder AIR position: (%s, %s) to (%s, %s)", IPHONE_X_BEGIN, IPHONE_Y_BEGIN, IPHONE_X_END, IPHONE_Y_END)
 else:
     # Use system screen size for other environments
     SCREEN_WIDTH, SCREEN_HEIGHT = pyautogui.size()
 
-# Set to True to enable debug mode with pauses for visual verification
+# Set to True (the CLI's --verify-window) to pause for visual verification
 DEBUG_MODE = os.getenv("DEBUG_SCROLL", "False").lower() == "true"
 
 
+@functools.lru_cache(maxsize=None)
 def get_hardcoded_window() -> Tuple[int, int, int, int]:
     """
     Return the hardcoded window dimensions based on the environment.
     
+    The result only depends on module constants fixed at import time, so it
+    is computed once and cached.
+    
     Returns:
         Tuple[int, int, int, int]: (x, y, width, height) of the iPhone window
     """
@@ -133,7 +167,7 @@ def get_safe_coordinates(x: int, y: int) -> Tuple[int, int]:
     
     # Log if coordinates were adjusted
     if safe_x != x or safe_y != y:
-        logger.warning(f"Adjusted coordinates from ({x}, {y}) to safe values ({safe_x}, {safe_y})")
+        logger.warning("Adjusted coordinates from (%s, %s) to safe values (%s, %s)", x, y, safe_x, safe_y)
         print(f"WARNING: Coordinates ({x}, {y}) were outside safe screen boundaries.")
         print(f"Adjusted to ({safe_x}, {safe_y}) to prevent triggering PyAutoGUI fail-safe.")
     
@@ -166,7 +200,7 @@ def validate_bbox(bbox: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
     
     # Check if the bbox is completely invalid (outside screen or zero dimensions)
     if width <= 0 or height <= 0 or x < 0 or y < 0 or x >= SCREEN_WIDTH or y >= SCREEN_HEIGHT:
-        logger.warning(f"Invalid bbox detected: {bbox}")
+        logger.warning("Invalid bbox detected: %s", bbox)
         print(f"WARNING: Invalid window dimensions! Creating a default window.")
         
         # Create a new bbox with reasonable dimensions
@@ -205,15 +239,15 @@ def move_to_iphone_center(bbox: Tuple[int, int, int, int]) -> Tuple[int, int]:
     safe_x, safe_y = get_safe_coordinates(center_x, center_y)
     
     # Print debug info to console
-    logger.info(f"Moving to iPhone center at: ({safe_x}, {safe_y})")
+    logger.info("Moving to iPhone center at: (%s, %s)", safe_x, safe_y)
     
-    # Move mouse to center of the window
-    pyautogui.moveTo(safe_x, safe_y, duration=0.5)
+    # Move mouse to center of the window (no animation; it's only a focus target)
+    move_to(safe_x, safe_y)
     
     # If in debug mode, pause to allow visual verification
     if DEBUG_MODE:
         print("Mouse positioned at iPhone center. Please verify visually.")
-        # wait_for_input("Press Enter to continue...")
+        wait_for_input("Press Enter to continue...")
     
     return safe_x, safe_y
 
@@ -230,11 +264,122 @@ def perform_stepped_scroll(amount: int) -> None:
     
     # Perform multiple small scrolls
     for _ in range(STEPS_PER_SCROLL):
-        pyautogui.scroll(step_size)
+        if Quartz is not None:
+            # Same line units pyautogui uses, so the scroll amounts keep their calibration
+            event = Quartz.CGEventCreateScrollWheelEvent(None, Quartz.kCGScrollEventUnitLine, 1, step_size)
+            Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+        else:
+            pyautogui.scroll(step_size)
         time.sleep(STEP_DELAY)  # Short delay between steps
 
 
-def scroll_profile(bbox: Tuple[int, int, int, int]) -> None:
+def move_to(x: int, y: int) -> None:
+    """
+    Jump the cursor to (x, y) without pyautogui's animated move.
+    
+    Posts a mouse-moved event straight to Quartz on macOS or calls user32's
+    SetCursorPos on Windows, and falls back to an instant pyautogui.moveTo
+    elsewhere.
+    
+    Args:
+        x: X screen coordinate
+        y: Y screen coordinate
+    """
+    if Quartz is not None:
+        event = Quartz.CGEventCreateMouseEvent(None, Quartz.kCGEventMouseMoved, (x, y), Quartz.kCGMouseButtonLeft)
+        Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+    elif _user32 is not None:
+        _user32.SetCursorPos(x, y)
+    else:
+        pyautogui.moveTo(x, y)
+
+
+def click_at(x: int, y: int) -> None:
+    """
+    Jump the cursor to (x, y) and left-click there, without an animated move.
+    
+    Posts the events straight to Quartz on macOS or user32 on Windows, and
+    falls back to pyautogui.click (which also moves instantly) elsewhere.
+    
+    Args:
+        x: X screen coordinate
+        y: Y screen coordinate
+    """
+    if Quartz is not None:
+        for event_type in (Quartz.kCGEventMouseMoved, Quartz.kCGEventLeftMouseDown, Quartz.kCGEventLeftMouseUp):
+            event = Quartz.CGEventCreateMouseEvent(None, event_type, (x, y), Quartz.kCGMouseButtonLeft)
+            Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+    elif _user32 is not None:
+        _user32.SetCursorPos(x, y)
+        _user32.mouse_event(MOUSEEVENTF_LEFTDOWN, 0, 0, 0, 0)
+        _user32.mouse_event(MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
+    else:
+        pyautogui.click(x, y)
+
+
+def scroll_back_to_top(center_x: int, center_y: int, total_scroll_distance: int) -> None:
+    """
+    Scroll back up over the whole distance scrolled down, in one stepped scroll.
+    
+    The up-scroll is rounded up to whole UP_SCROLL_AMOUNT units (overshooting
+    is harmless at the top), but issued as a single summed scroll instead of
+    one click-and-scroll round per unit.
+    
+    Args:
+        center_x: X coordinate to click for window focus
+        center_y: Y coordinate to click for window focus
+        total_scroll_distance: Total pixels scrolled down
+    """
+    scrolls_needed = total_scroll_distance // abs(UP_SCROLL_AMOUNT) + 1
+    total_up = UP_SCROLL_AMOUNT * scrolls_needed
+    
+    pyautogui.click(center_x, center_y)
+    time.sleep(0.1)
+    logger.debug("Scrolling up %s pixels in %s steps", total_up, STEPS_PER_SCROLL)
+    perform_stepped_scroll(total_up)
+    time.sleep(0.5)
+
+
+def wait_until_stable(bbox: Tuple[int, int, int, int],
+                      timeout: float = SETTLE_TIMEOUT,
+                      poll: float = SETTLE_POLL) -> bool:
+    """
+    Wait until the window content stops changing after a scroll or click.
+    
+    Replaces a fixed worst-case sleep: low-resolution samples of the window
+    are compared every poll seconds, and the wait ends as soon as two
+    consecutive samples are (nearly) identical.
+    
+    Args:
+        bbox: Bounding box of iPhone window (x, y, width, height)
+        timeout: Maximum number of seconds to wait
+        poll: Seconds between samples
+        
+    Returns:
+        True if the content settled, False if the timeout was reached
+    """
+    x, y, width, height = bbox
+    step_x = max(1, width // SETTLE_SAMPLE_SIZE[0])
+    step_y = max(1, height // SETTLE_SAMPLE_SIZE[1])
+    
+    def sample() -> np.ndarray:
+        # Strided view keeps the comparison to a few thousand pixels
+        return grab_region(bbox)[::step_y, ::step_x].astype(np.int16)
+    
+    deadline = time.monotonic() + timeout
+    previous = sample()
+    while time.monotonic() < deadline:
+        time.sleep(poll)
+        current = sample()
+        if np.abs(current - previous).mean() < SETTLE_THRESHOLD:
+            return True
+        previous = current
+    
+    logger.debug("Window content did not settle within %ss", timeout)
+    return False
+
+
+def scroll_profile(bbox: Tuple[int, int, int, int], num_scrolls: Optional[int] = None) -> None:
     """
     Scroll through a Tinder profile to reveal all photos and prompts.
     
@@ -248,12 +393,16 @@ def scroll_profile(bbox: Tuple[int, int, int, int]) -> None:
     
     Args:
         bbox: Bounding box of iPhone window (x, y, width, height)
+        num_scrolls: Number of scrolls to perform; defaults to NUM_SCROLLS
     """
+    if num_scrolls is None:
+        num_scrolls = NUM_SCROLLS
+
     # Move to center and get coordinates
     center_x, center_y = move_to_iphone_center(bbox)
     
     # Click to ensure focus
-    logger.debug(f"Clicking at center point ({center_x}, {center_y}) to focus window")
+    logger.debug("Clicking at center point (%s, %s) to focus window", center_x, center_y)
     pyautogui.click()
     
     # Wait a moment before starting to scroll
@@ -263,36 +412,33 @@ def scroll_profile(bbox: Tuple[int, int, int, int]) -> None:
     if DEBUG_MODE:
         print(f"DEBUG MODE: Testing scrolling with exact values")
         print(f"First scroll: {FIRST_SCROLL_AMOUNT}, Subsequent: {SUBSEQUENT_SCROLL_AMOUNT}")
-        print(f"Taking {NUM_SCROLLS+1} screenshots (initial + {NUM_SCROLLS} scrolls)")
+        print(f"Taking {num_scrolls+1} screenshots (initial + {num_scrolls} scrolls)")
         print(f"Each scroll broken into {STEPS_PER_SCROLL} smaller steps")
     
     # First, perform the initial scroll with the specific value
-    logger.info(f"Taking initial screenshot (before scrolling)")
+    logger.info("Taking initial screenshot (before scrolling)")
     # This is where you would capture the first screenshot
     
-    logger.info(f"First scroll: {FIRST_SCROLL_AMOUNT} pixels in {STEPS_PER_SCROLL} steps")
+    logger.info("First scroll: %s pixels in %s steps", FIRST_SCROLL_AMOUNT, STEPS_PER_SCROLL)
     pyautogui.click(center_x, center_y)
     time.sleep(0.1)
     perform_stepped_scroll(FIRST_SCROLL_AMOUNT)
     time.sleep(SCROLL_DELAY)
-    logger.info(f"Taking screenshot #2 (after first scroll)")
+    logger.info("Taking screenshot #2 (after first scroll)")
     # This is where you would capture the second screenshot
     
     # Then, perform subsequent scrolls with their specific value
-    for i in range(1, NUM_SCROLLS):
-        logger.info(f"Scroll {i+1}/{NUM_SCROLLS}: {SUBSEQUENT_SCROLL_AMOUNT} pixels in {STEPS_PER_SCROLL} steps")
-        
-        # Click before each scroll to ensure window focus is maintained
-        pyautogui.click(center_x, center_y)
-        time.sleep(0.1)
+    for i in range(1, num_scrolls):
+        logger.info("Scroll %s/%s: %s pixels in %s steps", i+1, num_scrolls, SUBSEQUENT_SCROLL_AMOUNT, STEPS_PER_SCROLL)
         
+        # The window keeps the focus from the click before the first scroll
         # Use the exact scroll amount with stepped scrolling
         perform_stepped_scroll(SUBSEQUENT_SCROLL_AMOUNT)
         
         # Use the exact 2-second delay between scrolls
         time.sleep(SCROLL_DELAY)
         
-        logger.info(f"Taking screenshot #{i+3} (after scroll {i+1})")
+        logger.info("Taking screenshot #%s (after scroll %s)", i+3, i+1)
         # This is where you would capture the screenshot
     
     # Brief pause at the end to ensure everything is loaded
@@ -302,14 +448,7 @@ def scroll_profile(bbox: Tuple[int, int, int, int]) -> None:
     # Scroll back to top for next profile
     logger.info("Scrolling back to top of profile")
     # Calculate how many up-scrolls needed based on total distance scrolled
-    total_scroll_distance = abs(FIRST_SCROLL_AMOUNT) + abs(SUBSEQUENT_SCROLL_AMOUNT) * (NUM_SCROLLS - 1)
-    scrolls_needed = total_scroll_distance // abs(UP_SCROLL_AMOUNT) + 1
-    
-    for i in range(scrolls_needed):
-        pyautogui.click(center_x, center_y)
-        time.sleep(0.1)
-        logger.debug(f"Scroll up {i+1}/{scrolls_needed}: {UP_SCROLL_AMOUNT} pixels in {STEPS_PER_SCROLL} steps")
-        perform_stepped_scroll(UP_SCROLL_AMOUNT)
-        time.sleep(0.5)
+    total_scroll_distance = abs(FIRST_SCROLL_AMOUNT) + abs(SUBSEQUENT_SCROLL_AMOUNT) * (num_scrolls - 1)
+    scroll_back_to_top(center_x, center_y, total_scroll_distance)
     
     logger.info("Profile scrolling complete - 6 screenshots should have been captured")
\ No newline at end of file
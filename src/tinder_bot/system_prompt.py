@@ -75,4 +75,11 @@ Respond with only "NO" otherwise.
 
 Output format:
 - YES or NO
-"""
\ No newline at end of file
+"""
+batch_opener_prompt = opener_prompt + """
+Batch mode:
+You will receive {n} collages, each preceded by a "Profile <id>" label. Apply the instructions above to every collage independently.
+Instead of the output format above, respond with a single JSON object:
+
+{{"openers": [{{"profile_id": <id>, "name": "<Profile Name>", "opener": "<your opening messages, one per line>"}}, ...]}}
+"""
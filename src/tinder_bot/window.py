@@ -10,6 +10,8 @@ import os
 from datetime import datetime
 from pathlib import Path
 
+from tinder_bot.capture import capture_frame
+
 logger = logging.getLogger(__name__)
 
 # iPhone app visual characteristics
@@ -22,12 +24,13 @@ SCREENSHOT_DIR = os.getenv("SCREENSHOT_DIR", "./screenshots")
 # Get environment setting
 ENVIRONMENT = os.getenv("ENVIRONMENT", "MONITOR")
 
-def save_detected_window(screenshot: Image.Image, bbox: Tuple[int, int, int, int]) -> str:
+def save_detected_window(screenshot: Optional[Image.Image], bbox: Tuple[int, int, int, int]) -> str:
     """
     Save the detected iPhone window region for manual verification.
     
     Args:
-        screenshot: Full screenshot as PIL Image
+        screenshot: Full screenshot as PIL Image, if one was already taken for
+            detection. If None, only the window region is grabbed from the screen.
         bbox: Bounding box of detected iPhone window (x, y, width, height)
         
     Returns:
@@ -51,8 +54,12 @@ def save_detected_window(screenshot: Image.Image, bbox: Tuple[int, int, int, int
     new_x = max(0, x - extra_width)
     new_width = width + (x - new_x)  # Add the actual amount we expanded
     
-    # Crop the screenshot with the expanded region
-    window_crop = screenshot.crop((new_x, y, x + width, y + height))
+    if screenshot is not None:
+        # Crop the screenshot with the expanded region
+        window_crop = screenshot.crop((new_x, y, x + width, y + height))
+    else:
+        # Grab just the expanded region instead of the full screen
+        window_crop = capture_frame((new_x, y, new_width, height))
     
     # Save the cropped image
     window_crop.save(filepath)
@@ -60,6 +67,29 @@ def save_detected_window(screenshot: Image.Image, bbox: Tuple[int, int, int, int
     
     return filepath
 
+def _edge_brightness(gray: np.ndarray, x: int, y: int, w: int, h: int, strip: int = 5) -> Tuple[float, float, float, float]:
+    """
+    Return the mean brightness of the top, bottom, left and right edge strips of a box.
+    
+    Sums the uint8 strips with an integer accumulator instead of np.mean's
+    float64 upcast, which is the hot part of checking each candidate contour.
+    
+    Args:
+        gray: Grayscale screenshot
+        x, y, w, h: Candidate box
+        strip: Thickness of each edge strip in pixels
+        
+    Returns:
+        (top, bottom, left, right) mean brightness; 0.0 for an empty strip
+    """
+    edges = (
+        gray[y:y + strip, x:x + w],
+        gray[y + h - strip:y + h, x:x + w],
+        gray[y:y + h, x:x + strip],
+        gray[y:y + h, x + w - strip:x + w],
+    )
+    return tuple(float(edge.sum(dtype=np.uint64)) / edge.size if edge.size else 0.0 for edge in edges)
+
 def find_iphone_window() -> Tuple[int, int, int, int]:
     """
     Find the iPhone window on screen using visual detection or hardcoded values.
@@ -73,9 +103,8 @@ def find_iphone_window() -> Tuple[int, int, int, int]:
         from tinder_bot.scroll import get_hardcoded_window
         bbox = get_hardcoded_window()
         
-        # Take a screenshot to save the window visualization
-        screenshot = pyautogui.screenshot()
-        save_detected_window(screenshot, bbox)
+        # Save the window visualization (grabs only the window region)
+        save_detected_window(None, bbox)
         
         return bbox
     
@@ -84,14 +113,13 @@ def find_iphone_window() -> Tuple[int, int, int, int]:
     
     # Take a screenshot of the entire screen
     screenshot = pyautogui.screenshot()
-    screenshot_np = np.array(screenshot)
-    screenshot_rgb = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
+    screenshot_np = np.asarray(screenshot)
     
     # Get the screen dimensions
     screen_width, screen_height = screenshot.size
     
-    # Convert to grayscale for easier processing
-    gray = cv2.cvtColor(screenshot_rgb, cv2.COLOR_BGR2GRAY)
+    # Convert straight to grayscale for easier processing (one pass, no BGR intermediate)
+    gray = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2GRAY)
     
     # Binary threshold to isolate white borders (higher threshold to focus on the white borders)
     _, thresh = cv2.threshold(gray, 240, 255, cv2.THRESH_BINARY)
@@ -122,17 +150,8 @@ def find_iphone_window() -> Tuple[int, int, int, int]:
                     # Additional check for iPhone characteristics
                     
                     # 1. Check for white borders
-                    # Sample points along the edges to verify they're white
-                    top_edge = gray[y:y+5, x:x+w]
-                    bottom_edge = gray[y+h-5:y+h, x:x+w]
-                    left_edge = gray[y:y+h, x:x+5]
-                    right_edge = gray[y:y+h, x+w-5:x+w]
-                    
-                    # Calculate average color for each edge
-                    top_color = np.mean(top_edge)
-                    bottom_color = np.mean(bottom_edge)
-                    left_color = np.mean(left_edge)
-                    right_color = np.mean(right_edge)
+                    # Average brightness of the 5-pixel strip along each edge
+                    top_color, bottom_color, left_color, right_color = _edge_brightness(gray, x, y, w, h)
                     
                     # If most edges are predominantly white (threshold 230)
                     edge_threshold = 230